@@ -9,7 +9,6 @@ import numpy as np
 import datetime as dt
 from datetime import datetime, timedelta
 import dash_bootstrap_components as dbc
-import yfinance as yf
 import ta
 import json
 import xarray as xr
@@ -32,6 +31,7 @@ from functions.analysis_functions import (
     update_stochastic_store,
     update_rsi_store,
     update_data,
+    view_indicators,
     update_combined_chart,
     update_symbol_status,
     update_indicator_options,
@@ -43,6 +43,8 @@ from functions.scanner_functions import StockScanner, get_preset_filter, get_ava
 from functions.insights_functions import TechnicalInsights, generate_insights_summary
 from functions.irl_trading_functions import open_position, close_position, load_trading_df, save_trading_df, update_stop_price, calculate_trade_apgar
 from functions.watchlist_functions import load_watchlist, add_to_watchlist, remove_from_watchlist
+from functions.provider_functions import get_provider
+from functions.prefetch_functions import start_prefetcher, get_prefetcher
 
 # Enhanced CSS with Inter font and bold white card headers
 custom_css = """
@@ -546,7 +548,8 @@ app.layout = dbc.Container([
                                                 html.Div([
                                                     dbc.Checklist(
                                                         options=[
-                                                            {"label": "Use Impulse System", "value": 1}
+                                                            {"label": "Use Impulse System", "value": 1},
+                                                            {"label": "Triple Screen (weekly Impulse background)", "value": 2}
                                                         ],
                                                         value=[],
                                                         id="impulse-system-toggle",
@@ -1320,11 +1323,21 @@ def update_frequency_options(timeframe):
      Input('force-smoothing-store', 'data'),
      Input('adx-period-store', 'data'),
      Input('stochastic-period-store', 'data'),
-     Input('rsi-period-store', 'data')]
+     Input('rsi-period-store', 'data'),
+     Input('lower-chart-selection', 'value'),
+     Input('show-ema', 'value'),
+     Input('atr-bands', 'value'),
+     Input('impulse-system-toggle', 'value')]
 )
-def update_data_callback(n, symbol, timeframe, frequency, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period):
-    """Call update_data function from functions module"""
-    return update_data(n, symbol, timeframe, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, frequency)
+def update_data_callback(n, symbol, timeframe, frequency, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, lower_chart_type, show_ema, atr_bands, impulse_system_toggle):
+    """Call update_data function from functions module (only the indicators the current view draws)"""
+    use_impulse_system = bool(impulse_system_toggle and 1 in impulse_system_toggle)
+    indicators = view_indicators(lower_chart_type, show_ema, atr_bands, use_impulse_system)
+    return update_data(n, symbol, timeframe, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, frequency, indicators)
+
+def _macd_settings(macd_fast, macd_slow, macd_signal):
+    """MACD settings the stock data store was calculated with (update_data's defaults for missing values)"""
+    return (12 if macd_fast is None else macd_fast, 26 if macd_slow is None else macd_slow, 9 if macd_signal is None else macd_signal)
 
 # Callback for combined chart
 @callback(
@@ -1347,14 +1360,18 @@ def update_data_callback(n, symbol, timeframe, frequency, ema_periods, macd_fast
      Input('impulse-system-toggle', 'value'),
      Input('bollinger-bands-store', 'data'),
      Input('autoenvelope-store', 'data')],
-    [State('combined-chart', 'relayoutData')],
+    [State('combined-chart', 'relayoutData'),
+     State('macd-fast-store', 'data'),
+     State('macd-slow-store', 'data'),
+     State('macd-signal-store', 'data')],
     prevent_initial_call=False
 )
-def update_combined_chart_callback(data, symbol, chart_type, show_ema, ema_periods, atr_bands, lower_chart_type, adx_components, timeframe, frequency, impulse_system_toggle, bollinger_bands, autoenvelope, relayout_data):
+def update_combined_chart_callback(data, symbol, chart_type, show_ema, ema_periods, atr_bands, lower_chart_type, adx_components, timeframe, frequency, impulse_system_toggle, bollinger_bands, autoenvelope, relayout_data, macd_fast, macd_slow, macd_signal):
     """Call update_combined_chart function from functions module"""
     ctx = dash.callback_context
     volume_comparison = 'none'  # Default value
     use_impulse_system = bool(impulse_system_toggle and 1 in impulse_system_toggle)
+    triple_screen = bool(impulse_system_toggle and 2 in impulse_system_toggle)
     unreliable_warning = None
     unreliable_class = 'alert alert-warning fade show d-none'
 
@@ -1399,7 +1416,8 @@ def update_combined_chart_callback(data, symbol, chart_type, show_ema, ema_perio
         fig, style, market_closed = update_combined_chart(
             data, symbol, chart_type, show_ema, ema_periods, atr_bands, 
             lower_chart_type, adx_components, volume_comparison, relayout_data, 
-            timeframe, frequency, use_impulse_system, bollinger_bands, autoenvelope
+            timeframe, frequency, use_impulse_system, bollinger_bands, autoenvelope, triple_screen,
+            macd=_macd_settings(macd_fast, macd_slow, macd_signal)
         )
         # When not closed, hide the message
         return fig, style, market_closed, [], unreliable_warning, unreliable_class
@@ -1433,13 +1451,17 @@ def update_indicator_options_callback(timeframe):
      State('impulse-system-toggle', 'value'),
      State('bollinger-bands-store', 'data'),
      State('autoenvelope-store', 'data'),
-     State('combined-chart', 'relayoutData')],
+     State('combined-chart', 'relayoutData'),
+     State('macd-fast-store', 'data'),
+     State('macd-slow-store', 'data'),
+     State('macd-signal-store', 'data')],
     prevent_initial_call=True
 )
-def update_combined_chart_volume_comparison(volume_comparison, data, symbol, chart_type, show_ema, ema_periods, atr_bands, lower_chart_type, adx_components, timeframe, impulse_system_toggle, bollinger_bands, autoenvelope, relayout_data):
+def update_combined_chart_volume_comparison(volume_comparison, data, symbol, chart_type, show_ema, ema_periods, atr_bands, lower_chart_type, adx_components, timeframe, impulse_system_toggle, bollinger_bands, autoenvelope, relayout_data, macd_fast, macd_slow, macd_signal):
     """Update combined chart when volume comparison changes"""
     # Check if impulse system is enabled
     use_impulse_system = bool(impulse_system_toggle and 1 in impulse_system_toggle)
+    triple_screen = bool(impulse_system_toggle and 2 in impulse_system_toggle)
     # Only trigger when volume chart is selected
     if lower_chart_type == 'volume':
         volume_comparison = volume_comparison or 'none'
@@ -1453,7 +1475,7 @@ def update_combined_chart_volume_comparison(volume_comparison, data, symbol, cha
             return empty_fig, {'display': 'none'}, 'd-block'
         else:
             # Normal case - show the chart and hide the message
-            fig, style, market_closed = update_combined_chart(data, symbol, chart_type, show_ema, ema_periods, atr_bands, lower_chart_type, adx_components, volume_comparison, relayout_data, timeframe, None, use_impulse_system, bollinger_bands, autoenvelope)
+            fig, style, market_closed = update_combined_chart(data, symbol, chart_type, show_ema, ema_periods, atr_bands, lower_chart_type, adx_components, volume_comparison, relayout_data, timeframe, None, use_impulse_system, bollinger_bands, autoenvelope, triple_screen, macd=_macd_settings(macd_fast, macd_slow, macd_signal))
             return fig, {'backgroundColor': '#000000', 'height': '90vh'}, 'd-none'
     else:
         # Return no update if not volume chart
@@ -2496,6 +2518,9 @@ def add_to_watchlist_callback(n_clicks, symbol, current_watchlist):
         return dash.no_update, f"❌ {clean_symbol} is already in your watchlist.", ""
     # Add to persistent watchlist
     new_watchlist = add_to_watchlist(clean_symbol)
+    # Warm the new symbol's charts right away
+    if get_prefetcher() is not None:
+        get_prefetcher().refresh_now()
     return new_watchlist, f"✅ {clean_symbol} added to watchlist!", ""
 
 @callback(
@@ -2592,6 +2617,8 @@ def preload_open_positions_on_startup(n_intervals):
         # Merge, open positions first, then rest, no duplicates
         seen = set(open_positions)
         merged = open_positions + [s for s in watchlist if s not in seen]
+        # Keep charts of watched symbols warm in the background (symbol lists are re-read every cycle)
+        start_prefetcher(lambda: get_open_positions_from_csv() + load_watchlist())
         return merged
     raise PreventUpdate
 
@@ -3248,7 +3275,6 @@ def list_irl_open_positions(data):
     prevent_initial_call=True
 )
 def close_irl_position(close_n, data):
-    import yfinance as yf
     ctx = dash.callback_context
     if not ctx.triggered:
         raise PreventUpdate
@@ -3265,10 +3291,9 @@ def close_irl_position(close_n, data):
         return dash.no_update, "Invalid position."
     pos_idx = df[open_mask].index[idx]
     stock = df.at[pos_idx, 'stocks_in_positions']
-    # Fetch current price using yfinance
+    # Fetch current price from the market data provider
     try:
-        ticker = yf.Ticker(stock)
-        price_series = ticker.history(period='1d')['Close']
+        price_series = get_provider().history(stock, period='1d')['Close']
         price = float(price_series.iloc[-1])
         df2 = close_position(df, stock, price)
         return df2.to_dict('records'), f"Closed {stock} at {price:.2f} (current price)"
@@ -0,0 +1,91 @@
+"""
+Benchmark of the indicator backends on synthetic OHLCV data.
+
+Times the ta reference implementation against the NumPy engine, and against the
+engine with Numba-compiled recursive kernels when Numba is installed, at typical
+chart sizes. Checks that every backend produces the same columns and values.
+
+Usage: python benchmark_indicators.py
+"""
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from functions.analysis_functions import _calculate_indicators_ta
+from functions.indicator_engine_functions import calculate_indicators_numpy, use_jit_kernels
+
+BAR_COUNTS = [250, 2000, 2730, 50000]  # ~1 year daily, ~8 years daily, 7 sessions of 1m bars, long intraday history
+REPEATS = 5
+
+
+def make_bars(n, seed=42):
+    """Random-walk OHLCV bars"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    high = close * (1 + np.abs(rng.normal(0, 0.005, n)))
+    low = close * (1 - np.abs(rng.normal(0, 0.005, n)))
+    return pd.DataFrame({
+        'Date': pd.date_range('2000-01-03', periods=n, freq='D'),
+        'Open': close * (1 + rng.normal(0, 0.003, n)),
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': rng.integers(100_000, 10_000_000, n).astype(float)
+    })
+
+
+def time_backend(func, df, repeats=REPEATS):
+    """Best wall time in milliseconds over several runs"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def compare_results(expected, actual):
+    """Names of the columns whose values differ (or that are missing)"""
+    if list(expected.columns) != list(actual.columns):
+        return sorted(set(expected.columns) ^ set(actual.columns)) or ['<column order>']
+    mismatched = []
+    for col in expected.columns:
+        if col == 'Date':
+            continue
+        if not np.allclose(expected[col].to_numpy(float), actual[col].to_numpy(float),
+                           rtol=1e-8, atol=1e-8, equal_nan=True):
+            mismatched.append(col)
+    return mismatched
+
+
+def main():
+    warnings.filterwarnings('ignore')  # ta emits FutureWarnings from pandas
+    jit = use_jit_kernels(True)
+    if jit:
+        calculate_indicators_numpy(make_bars(100))  # Compile the kernels outside the timings
+    else:
+        print("Numba is not installed: the numba column is skipped")
+    use_jit_kernels(False)
+
+    print(f"{'Bars':>8} {'ta (ms)':>10} {'numpy (ms)':>11} {'numba (ms)':>11} {'Speedup':>8}  Match")
+    for n in BAR_COUNTS:
+        df = make_bars(n)
+        ta_ms, expected = time_backend(_calculate_indicators_ta, df, repeats=1 if n > 10000 else REPEATS)
+        numpy_ms, actual = time_backend(calculate_indicators_numpy, df)
+        mismatched = compare_results(expected, actual)
+        best_ms, numba_col = numpy_ms, f"{'-':>11}"
+        if jit:
+            use_jit_kernels(True)
+            numba_ms, jit_actual = time_backend(calculate_indicators_numpy, df)
+            use_jit_kernels(False)
+            mismatched += [f'{col} (numba)' for col in compare_results(expected, jit_actual)]
+            best_ms, numba_col = min(numpy_ms, numba_ms), f"{numba_ms:>11.2f}"
+        match = 'yes' if not mismatched else 'NO: ' + ', '.join(mismatched)
+        print(f"{n:>8} {ta_ms:>10.1f} {numpy_ms:>11.2f} {numba_col} {ta_ms / best_ms:>7.1f}x  {match}")
+
+
+if __name__ == '__main__':
+    main()
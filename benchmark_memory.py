@@ -0,0 +1,131 @@
+"""
+Benchmark of the memory held by a warm bar and indicator cache.
+
+Fills the caches with synthetic daily bars for a 500-symbol universe (the way
+get_stock_data and calculate_indicators do when the prefetcher warms them), once
+with the compact float32 frame layout and once with full float64 frames, and
+reports the cache sizes and how far the compact indicator values are from float64
+per column. The same comparison is made for bars with missing values, which take
+the ta fallback path of calculate_indicators.
+
+Usage: python benchmark_memory.py
+"""
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import functions.analysis_functions as analysis
+from functions.analysis_functions import (_build_history_result, calculate_indicators, set_compact_frames,
+                                          get_bar_cache_stats, get_indicator_cache_stats)
+
+SYMBOLS = 500
+BARS = 1260  # 5 years of daily bars, the longest period the chart offers
+PERIOD = '5y'
+NAN_SYMBOLS = 20  # Symbols given a few missing prices for the fallback check
+MAX_NAN_DIFFERENCE = 0.1  # Relative difference that marks a compact fallback column as wrong
+
+
+def make_bars(n, seed):
+    """Random-walk daily bars with the columns the provider returns"""
+    rng = np.random.default_rng(seed)
+    close = rng.uniform(5, 500) * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    return pd.DataFrame({
+        'Date': pd.bdate_range('2020-01-02', periods=n),
+        'Open': close * (1 + rng.normal(0, 0.003, n)),
+        'High': close * (1 + np.abs(rng.normal(0, 0.006, n))),
+        'Low': close * (1 - np.abs(rng.normal(0, 0.006, n))),
+        'Close': close,
+        'Volume': rng.integers(100_000, 50_000_000, n).astype(float),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0
+    })
+
+
+def warm_caches(universe, compact):
+    """Fill empty caches with every symbol's bars and indicators; returns (bar MB, indicator MB, seconds, indicator frames)"""
+    analysis._bar_cache.clear()
+    analysis._indicator_cache.clear()
+    set_compact_frames(compact)
+    frames = {}
+    start = time.perf_counter()
+    for symbol, data in universe.items():
+        bars = _build_history_result(symbol, PERIOD, data)[0]
+        frames[symbol] = calculate_indicators(bars)
+    seconds = time.perf_counter() - start
+    return get_bar_cache_stats()['bytes'] / 1e6, get_indicator_cache_stats()['bytes'] / 1e6, seconds, frames
+
+
+def relative_differences(expected, actual):
+    """{column: largest difference relative to the column's scale} over the float columns"""
+    differences = {}
+    for col in actual.columns:  # Compact frames leave out the provider-only columns
+        if col == 'Date' or not pd.api.types.is_float_dtype(expected[col]):
+            continue
+        x = expected[col].to_numpy(dtype=np.float64)
+        y = actual[col].to_numpy(dtype=np.float64)
+        scale = np.nanmax(np.abs(x)) if np.isfinite(x).any() else 0.0
+        if scale > 0:
+            differences[col] = float(np.nanmax(np.abs(x - y)) / scale)
+    return differences
+
+
+def with_missing_values(data, seed):
+    """Copy of bars with a few missing High/Low values (as some exchanges return them)"""
+    rng = np.random.default_rng(seed)
+    data = data.copy()
+    for col in ['High', 'Low']:
+        data.loc[rng.choice(len(data), 3, replace=False), col] = np.nan
+    return data
+
+
+def fallback_differences(universe):
+    """Largest per-column difference between compact and float64 indicators on bars with missing values"""
+    frames = {}
+    for compact in (False, True):
+        analysis._indicator_cache.clear()
+        set_compact_frames(compact)
+        frames[compact] = {symbol: calculate_indicators(_build_history_result(symbol, PERIOD, data)[0])
+                           for symbol, data in universe.items()}
+    set_compact_frames(True)
+    worst = {}
+    for symbol in universe:
+        for col, difference in relative_differences(frames[False][symbol], frames[True][symbol]).items():
+            worst[col] = max(worst.get(col, 0.0), difference)
+    return worst
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    universe = {f'SYM{i:03d}': make_bars(BARS, i) for i in range(SYMBOLS)}
+
+    full_bars, full_indicators, full_seconds, expected = warm_caches(universe, compact=False)
+    bars, indicators, seconds, actual = warm_caches(universe, compact=True)
+    set_compact_frames(True)
+
+    print(f"{SYMBOLS} symbols x {BARS} daily bars")
+    print(f"{'Layout':>8} {'Bars (MB)':>10} {'Indicators (MB)':>16} {'Total (MB)':>11} {'Warm (s)':>9}")
+    print(f"{'float64':>8} {full_bars:>10.1f} {full_indicators:>16.1f} {full_bars + full_indicators:>11.1f} {full_seconds:>9.2f}")
+    print(f"{'compact':>8} {bars:>10.1f} {indicators:>16.1f} {bars + indicators:>11.1f} {seconds:>9.2f}")
+    saved = 1 - (bars + indicators) / (full_bars + full_indicators)
+    print(f"Memory saved: {saved:.0%}")
+
+    worst = {}
+    for symbol in universe:
+        for col, difference in relative_differences(expected[symbol], actual[symbol]).items():
+            worst[col] = max(worst.get(col, 0.0), difference)
+    print("Largest difference vs float64, relative to the column's scale:")
+    for col, difference in worst.items():
+        print(f"{col:>14} {difference:.1e}")
+
+    nan_universe = {symbol: with_missing_values(universe[symbol], i) for i, symbol in enumerate(list(universe)[:NAN_SYMBOLS])}
+    worst = fallback_differences(nan_universe)
+    print(f"Bars with missing values ({NAN_SYMBOLS} symbols, ta fallback), largest difference vs float64:")
+    for col, difference in worst.items():
+        print(f"{col:>14} {difference:.1e}{'  MISMATCH' if difference > MAX_NAN_DIFFERENCE else ''}")
+
+
+if __name__ == '__main__':
+    main()
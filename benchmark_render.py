@@ -0,0 +1,104 @@
+"""
+Benchmark of the memory and time one chart render takes.
+
+A render is update_data (bars from the cache, indicators, trimming to the period,
+dcc.Store records) followed by update_combined_chart. Bars are synthetic and put
+in the bar cache first, so no data is downloaded. Indicators are timed both
+calculated (first render of a view) and from the indicator cache (interval
+ticks), and the chart separately. Peak memory is the largest amount traced by
+tracemalloc during update_data and during the whole render; the update_data peak
+is also given as a multiple of the bars frame it starts from.
+
+Usage: python benchmark_render.py
+"""
+
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import functions.analysis_functions as analysis
+from functions.analysis_functions import _build_history_result, update_data, update_combined_chart, view_indicators
+
+BAR_COUNTS = [252, 1260, 5000]  # 1 year, 5 years and ~20 years of daily bars
+PERIOD = 'max'
+REPEATS = 5
+VIEWS = ['volume', 'macd', 'adx']  # Lower chart types to render
+
+
+def make_bars(n, seed=7):
+    """Random-walk daily bars with the columns the provider returns"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    return pd.DataFrame({
+        'Date': pd.bdate_range(end='2025-06-30', periods=n),
+        'Open': close * (1 + rng.normal(0, 0.003, n)),
+        'High': close * (1 + np.abs(rng.normal(0, 0.006, n))),
+        'Low': close * (1 - np.abs(rng.normal(0, 0.006, n))),
+        'Close': close,
+        'Volume': rng.integers(100_000, 50_000_000, n).astype(float),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0
+    })
+
+
+def load_view(symbol, lower_chart_type):
+    """update_data for a view: the dcc.Store records of the chart"""
+    indicators = view_indicators(lower_chart_type, ['show'])
+    return update_data(0, symbol, PERIOD, [13, 26], 12, 26, 9, 2, 13, 5, 13, None, indicators)[0]
+
+
+def draw_view(data, symbol, lower_chart_type):
+    """update_combined_chart for a view"""
+    return update_combined_chart(data, symbol, 'candlestick', ['show'], [13, 26], [], lower_chart_type, ['adx', 'di'],
+                                 timeframe=PERIOD)
+
+
+def best_ms(func, before=None, repeats=REPEATS):
+    """Best wall time in milliseconds (before runs untimed ahead of each repeat)"""
+    best = float('inf')
+    for _ in range(repeats):
+        if before:
+            before()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def peak_mb(func):
+    """Peak memory traced while func runs, in MB (not timed: tracemalloc slows allocations down)"""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    clear_indicators = analysis._indicator_cache.clear
+    print(f"{'Bars':>6} {'View':>8} {'Data (ms)':>10} {'Cached (ms)':>12} {'Chart (ms)':>11} "
+          f"{'Data peak (MB)':>15} {'Render peak (MB)':>17} {'Data peak/bars':>15}")
+    for n in BAR_COUNTS:
+        symbol = f'BENCH{n}'
+        bars = _build_history_result(symbol, PERIOD, make_bars(n))[0]
+        bars_mb = bars.memory_usage(index=True, deep=True).sum() / 1e6
+        for view in VIEWS:
+            data = load_view(symbol, view)
+            draw_view(data, symbol, view)  # Warm up imports and the plotly templates
+            data_ms = best_ms(lambda: load_view(symbol, view), before=clear_indicators)
+            cached_ms = best_ms(lambda: load_view(symbol, view))
+            chart_ms = best_ms(lambda: draw_view(data, symbol, view))
+            clear_indicators()
+            data_mb = peak_mb(lambda: load_view(symbol, view))
+            clear_indicators()
+            render_mb = peak_mb(lambda: draw_view(load_view(symbol, view), symbol, view))
+            print(f"{n:>6} {view:>8} {data_ms:>10.1f} {cached_ms:>12.1f} {chart_ms:>11.1f} "
+                  f"{data_mb:>15.2f} {render_mb:>17.2f} {data_mb / bars_mb:>14.1f}x")
+
+
+if __name__ == '__main__':
+    main()
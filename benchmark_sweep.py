@@ -0,0 +1,80 @@
+"""
+Benchmark of the parameter sweeps against one calculate_indicators call per setting.
+
+Sweeps typical tuning grids (EMA periods 5-50, 121 MACD triplets, RSI and
+Stochastic periods 5-30, Impulse/Value Zone statistics for 21 EMA pairs x 24
+MACD settings) over synthetic daily bars, and checks that every sweep row equals
+the calculate_indicators column of its setting.
+
+Usage: python benchmark_sweep.py
+"""
+
+import time
+import warnings
+
+import numpy as np
+
+from benchmark_indicators import make_bars
+from functions.analysis_functions import _calculate_indicators_uncached
+from functions.parameter_sweep_functions import sweep_indicators, sweep_statistics
+
+BAR_COUNTS = [250, 1260, 5000]  # 1 year, 5 years and ~20 years of daily bars
+EMA_PERIODS = list(range(5, 51))
+MACD_SETTINGS = [(fast, slow, 9) for fast in range(5, 16) for slow in range(20, 31)]
+RSI_PERIODS = list(range(5, 31))
+STOCH_PERIODS = list(range(5, 31))
+EMA_PAIRS = [(fast, 2 * fast) for fast in range(5, 26)]
+STAT_MACD_SETTINGS = [(fast, slow, signal) for fast in (8, 10, 12, 14) for slow in (21, 26, 30) for signal in (7, 9)]
+
+
+def per_setting(df):
+    """The same grids as one calculate_indicators call per setting; returns {(grid, setting): frame}"""
+    frames = {}
+    for period in EMA_PERIODS:
+        frames[('ema', period)] = _calculate_indicators_uncached(df, ema_periods=[period])
+    for fast, slow, signal in MACD_SETTINGS:
+        frames[('macd', (fast, slow, signal))] = _calculate_indicators_uncached(df, macd_fast=fast, macd_slow=slow, macd_signal=signal)
+    for period in RSI_PERIODS:
+        frames[('rsi', period)] = _calculate_indicators_uncached(df, rsi_period=period)
+    for period in STOCH_PERIODS:
+        frames[('stochastic', period)] = _calculate_indicators_uncached(df, stoch_period=period)
+    return frames
+
+
+def mismatches(sweep, frames):
+    """Number of sweep rows that differ from the calculate_indicators column of their setting"""
+    columns = {'ema': lambda period: [('EMA', f'EMA_{period}')], 'macd': lambda _: [(c, c) for c in ['MACD', 'MACD_signal', 'MACD_hist']],
+               'rsi': lambda _: [('RSI', 'RSI')], 'stochastic': lambda _: [('Stoch_K', 'Stoch_K'), ('Stoch_D', 'Stoch_D')]}
+    count = 0
+    for grid, result in sweep.items():
+        for row, setting in enumerate(result['params']):
+            for sweep_col, frame_col in columns[grid](setting):
+                expected = frames[(grid, setting)][frame_col].to_numpy(dtype=np.float64)
+                if not np.allclose(result[sweep_col][row], expected, rtol=1e-9, atol=1e-9, equal_nan=True):
+                    count += 1
+    return count
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    settings = len(EMA_PERIODS) + len(MACD_SETTINGS) + len(RSI_PERIODS) + len(STOCH_PERIODS)
+    print(f"{settings} settings; statistics for {len(EMA_PAIRS) * len(STAT_MACD_SETTINGS)} combinations")
+    print(f"{'Bars':>6} {'Per setting (s)':>16} {'Sweep (s)':>10} {'Speedup':>8} {'Statistics (s)':>15}  Match")
+    for n in BAR_COUNTS:
+        df = make_bars(n)
+        start = time.perf_counter()
+        frames = per_setting(df)
+        loop_s = time.perf_counter() - start
+        start = time.perf_counter()
+        sweep = sweep_indicators(df, EMA_PERIODS, MACD_SETTINGS, RSI_PERIODS, STOCH_PERIODS)
+        sweep_s = time.perf_counter() - start
+        start = time.perf_counter()
+        sweep_statistics(df, EMA_PAIRS, STAT_MACD_SETTINGS)
+        stats_s = time.perf_counter() - start
+        bad = mismatches(sweep, frames)
+        print(f"{n:>6} {loop_s:>16.2f} {sweep_s:>10.3f} {loop_s / sweep_s:>7.0f}x {stats_s:>15.3f}  "
+              f"{'yes' if not bad else f'NO: {bad} rows'}")
+
+
+if __name__ == '__main__':
+    main()
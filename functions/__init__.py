@@ -6,11 +6,30 @@ from .impulse_functions import *
 from .scanner_functions import *
 from .insights_functions import *
 from .irl_trading_functions import *
+from .bar_store_functions import *
+from .bar_cache_functions import *
+from .provider_functions import *
+from .rate_limit_functions import *
+from .market_calendar_functions import *
+from .prefetch_functions import *
+from .indicator_engine_functions import *
+from .streaming_indicator_functions import *
+from .batch_indicator_functions import *
+from .indicator_graph_functions import *
+from .compact_frame_functions import *
+from .parameter_sweep_functions import *
+from .multi_timeframe_functions import *
 
 __all__ = [
     # Analysis functions
     'get_stock_data',
+    'get_stock_data_many',
+    'get_bar_cache_stats',
+    'get_indicator_cache_stats',
+    'warm_symbol',
     'calculate_indicators',
+    'set_indicator_backend',
+    'set_compact_frames',
     'update_lower_chart_settings',
     'update_symbol',
     'format_symbol_input',
@@ -20,6 +39,7 @@ __all__ = [
     'update_stochastic_store',
     'update_rsi_store',
     'update_data',
+    'view_indicators',
     'update_combined_chart',
     'update_symbol_status',
     'update_indicator_options',
@@ -27,6 +47,10 @@ __all__ = [
     
     # Impulse functions
     'calculate_impulse_system',
+    'calculate_impulse_codes',
+    'impulse_node',
+    'impulse_segments',
+    'segment_rows',
     'get_impulse_colors',
     
     # Scanner functions
@@ -43,5 +67,84 @@ __all__ = [
     'close_position',
     'load_trading_df',
     'save_trading_df',
-    'update_stop_price'
+    'update_stop_price',
+    'calculate_apgar_history',
+
+    # Bar store functions
+    'refresh_bars',
+    'refresh_bars_many',
+    'load_bars',
+    'save_bars',
+
+    # Bar cache
+    'BarCache',
+
+    # Market data providers
+    'MarketDataProvider',
+    'YFinanceProvider',
+    'ReplayProvider',
+    'LimitedProvider',
+    'get_provider',
+    'set_provider',
+
+    # Request limits
+    'TokenBucket',
+    'AdaptiveConcurrencyLimiter',
+    'RequestGovernor',
+    'RateLimitError',
+    'get_request_governor',
+    'get_request_limits',
+
+    # Market calendar
+    'get_exchange',
+    'is_trading_day',
+    'get_session',
+    'get_market_state',
+    'bars_may_have_changed',
+    'seconds_until_bars_change',
+
+    # Background prefetch
+    'BackgroundPrefetcher',
+    'start_prefetcher',
+    'get_prefetcher',
+    'get_prefetch_stats',
+
+    # Indicator engine
+    'calculate_indicators_numpy',
+    'indicator_group',
+    'INDICATOR_GROUPS',
+    'decay_scan',
+
+    # Streaming indicators
+    'IndicatorStream',
+
+    # Cross-sectional indicators
+    'align_bars',
+    'batch_indicators',
+    'batch_frames',
+
+    # Indicator dependency graph
+    'IndicatorFrame',
+    'register_indicator',
+    'resolve_plan',
+    'evaluate_indicators',
+
+    # Compact frames
+    'compact_bars',
+    'compact_frame',
+    'store_records',
+
+    # Parameter sweeps
+    'sweep_indicators',
+    'sweep_ema',
+    'sweep_macd',
+    'sweep_rsi',
+    'sweep_stochastic',
+    'sweep_statistics',
+
+    # Multi-timeframe frames
+    'multi_timeframe_frame',
+    'get_multi_timeframe_frame',
+    'weekly_rows',
+    'project_weekly'
 ] 
\ No newline at end of file
@@ -2,7 +2,6 @@ import pandas as pd
 import numpy as np
 import datetime as dt
 from datetime import datetime, timedelta
-import yfinance as yf
 import dash
 from dash import html, dcc, Input, Output, State, callback
 import dash_bootstrap_components as dbc
@@ -11,59 +10,297 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from plotly.subplots import make_subplots
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 import ta.trend
 import ta.volume
 import ta.volatility
 import ta.momentum
+from .bar_store_functions import refresh_bars, refresh_bars_many
+from .provider_functions import get_provider
+from .market_calendar_functions import (
+    DISPLAY_TZ, get_exchange, get_market_state, previous_trading_day,
+    seconds_until_bars_change, session_in_display_time, to_display_time
+)
+from .bar_cache_functions import BarCache, bars_fingerprint
+from .intraday_buffer_functions import IntradaySessionBuffer
+from .indicator_engine_functions import calculate_indicators_numpy, supports_numpy_engine, indicator_group, use_jit_kernels, INDICATOR_GROUPS
+from .streaming_indicator_functions import IndicatorStream
+from .indicator_graph_functions import IndicatorFrame
+from .compact_frame_functions import compact_bars, compact_frame, store_records
 
-# Simple cache for recently viewed tickers (speeds up repeated requests)
-_ticker_cache = {}
-_cache_expiry = {}
-CACHE_DURATION_SECONDS = 60  # Cache data for 1 minute
+# In-flight fetches keyed by (symbol, period, frequency) for request coalescing
+_inflight_fetches = {}
+_inflight_lock = threading.Lock()
 
-def _is_cache_valid(symbol, timeframe):
-    """Check if cached data is still valid"""
-    cache_key = f"{symbol}_{timeframe}"
-    if cache_key not in _ticker_cache or cache_key not in _cache_expiry:
-        return False
-    
-    # Check if cache has expired
-    from datetime import datetime
-    return datetime.now().timestamp() < _cache_expiry[cache_key]
+# Cached bars and indicator results use float32 values and drop unused provider columns
+# (see compact_frame_functions for the precision guarantee)
+COMPACT_FRAMES = True
+
+def set_compact_frames(enabled):
+    """Switch the compact float32 frame layout for newly cached bars and indicators on or off"""
+    global COMPACT_FRAMES
+    COMPACT_FRAMES = bool(enabled)
+
+# LRU cache for recently viewed tickers (speeds up repeated requests)
+CACHE_DURATION_SECONDS = 60  # Cache data for 1 minute while the market is open
+BAR_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Memory budget for cached bar frames
+MAX_STALE_SECONDS = 5 * 60  # Expired bars are served (and refreshed in the background) for this long
+
+def _cache_key(symbol, timeframe, frequency=None):
+    """Build the full cache key; a missing frequency means the period's default bar size"""
+    default_frequency = '1m' if timeframe in ["1d", "yesterday"] else '1d'
+    return (str(symbol).strip().upper(), timeframe, frequency or default_frequency)
+
+def _cache_ttl(key):
+    """Short TTL while the symbol's bars can change, otherwise until its next session opens"""
+    return max(CACHE_DURATION_SECONDS, seconds_until_bars_change(key[0]))
 
-def _get_cached_data(symbol, timeframe):
+_bar_cache = BarCache(max_bytes=BAR_CACHE_MAX_BYTES, ttl_func=_cache_ttl, max_stale=MAX_STALE_SECONDS)
+
+def _get_cached_data(symbol, timeframe, frequency=None):
     """Get cached data if available and valid"""
-    cache_key = f"{symbol}_{timeframe}"
-    if _is_cache_valid(symbol, timeframe):
-        return _ticker_cache[cache_key]
-    return None
+    return _bar_cache.get(_cache_key(symbol, timeframe, frequency))
+
+def _get_stale_cached_data(symbol, timeframe, frequency=None):
+    """Get cached data even if its TTL has passed (up to MAX_STALE_SECONDS), without refreshing it"""
+    return _bar_cache.get_stale(_cache_key(symbol, timeframe, frequency))[0]
 
-def _cache_data(symbol, timeframe, data, start_date, end_date, is_minute_data):
+def _cache_data(symbol, timeframe, data, start_date, end_date, is_minute_data, frequency=None):
     """Cache data for fast retrieval"""
-    cache_key = f"{symbol}_{timeframe}"
-    from datetime import datetime
-    _ticker_cache[cache_key] = (data.copy(), start_date, end_date, is_minute_data)
-    _cache_expiry[cache_key] = datetime.now().timestamp() + CACHE_DURATION_SECONDS
-
-def _clear_cache_for_symbol(symbol, timeframe):
-    """Clear cache for a specific symbol and timeframe to force fresh data fetch"""
-    cache_key = f"{symbol}_{timeframe}"
-    if cache_key in _ticker_cache:
-        del _ticker_cache[cache_key]
-    if cache_key in _cache_expiry:
-        del _cache_expiry[cache_key]
+    _bar_cache.put(_cache_key(symbol, timeframe, frequency), (data.copy(deep=False), start_date, end_date, is_minute_data))
+
+def _clear_cache_for_symbol(symbol, timeframe=None):
+    """Clear cached data for a symbol (optionally only one timeframe) to force a fresh data fetch"""
+    symbol = str(symbol).strip().upper()
+    _bar_cache.invalidate_where(lambda key: key[0] == symbol and (timeframe is None or key[1] == timeframe))
+
+# Recent intraday sessions per (symbol, interval) for the 1D view
+_intraday_buffer = IntradaySessionBuffer()
+
+# Indicator results keyed by a fingerprint of the input bars plus the exact parameters, so ticks
+# without new bars and switching back to an earlier parameter set return without recalculating
+INDICATOR_CACHE_MAX_BYTES = BAR_CACHE_MAX_BYTES // 2
+INDICATOR_CACHE_TTL_SECONDS = 60 * 60  # Results only depend on the key; the TTL just ages out unused entries
+_indicator_cache = BarCache(max_bytes=INDICATOR_CACHE_MAX_BYTES, default_ttl=INDICATOR_CACHE_TTL_SECONDS)
+
+def _memoize_indicators(df, params, compute):
+    """Return the cached indicator frame for these bars and parameters, or compute and cache it
+    (in the compact float32 layout when COMPACT_FRAMES is on)"""
+    if df.empty:
+        return compute()
+    # The layout is part of the key, so set_compact_frames(False) never returns frames cached as float32
+    key = (bars_fingerprint(df), INDICATOR_BACKEND, COMPACT_FRAMES) + params
+    cached = _indicator_cache.get(key)
+    if cached is not None:
+        return cached.copy(deep=False)
+    result = compute()
+    if COMPACT_FRAMES:
+        result = compact_frame(result)
+    _indicator_cache.put(key, result.copy(deep=False))
+    return result
+
+# Live indicator state of the 1D views (only the forming bar changes between refreshes)
+MAX_INDICATOR_STREAMS = 32
+_indicator_streams = OrderedDict()
+_indicator_streams_lock = threading.Lock()
+
+def _get_indicator_stream(key, params):
+    """Get (or create) the indicator stream of a view and parameter set, evicting the least recently used"""
+    with _indicator_streams_lock:
+        stream = _indicator_streams.get(key)
+        if stream is None:
+            stream = IndicatorStream(*params)
+            _indicator_streams[key] = stream
+            while len(_indicator_streams) > MAX_INDICATOR_STREAMS:
+                _indicator_streams.popitem(last=False)
+        _indicator_streams.move_to_end(key)
+        return stream
+
+def _calculate_chart_indicators(symbol, timeframe, frequency, full_data, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, fast_mode, indicators=None):
+    """calculate_indicators for a chart view. The live 1D view advances an indicator stream
+    instead of recalculating the whole history when new bars arrive (the stream keeps
+    every indicator, a new bar costs the same either way)."""
+    params = (tuple(ema_periods), macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, fast_mode)
+    if full_data.empty or timeframe != '1d' or INDICATOR_BACKEND == 'ta':
+        return calculate_indicators(full_data, *params, indicators=indicators)
+
+    def stream_or_calculate():
+        df = _get_indicator_stream(_cache_key(symbol, timeframe, frequency) + params, params).update(full_data)
+        return df if df is not None else _calculate_indicators_uncached(full_data, *params)
+
+    return _memoize_indicators(full_data, params, stream_or_calculate)
+
+# Indicator groups drawn by each lower chart; the price chart adds EMAs, ATR bands and the Impulse System
+LOWER_CHART_INDICATORS = {
+    'volume': [],
+    'macd': ['macd'],
+    'force': ['force'],
+    'ad': ['ad'],
+    'adx': ['adx'],
+    'stochastic': ['stochastic'],
+    'rsi': ['rsi'],
+    'obv': ['obv']
+}
+
+# Parameters each indicator group depends on, as positions in the calculate_indicators parameter tuple
+# (ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, fast_mode)
+INDICATOR_GROUP_PARAMS = {
+    'ema': (0, 8),
+    'macd': (1, 2, 3),
+    'force': (4,),
+    'adx': (5,),
+    'stochastic': (6,),
+    'rsi': (7,)
+}
+
+def view_indicators(lower_chart_type=None, show_ema=None, atr_bands=None, use_impulse_system=False):
+    """Indicator groups a chart view needs: the selected lower chart plus the price chart overlays"""
+    needed = set(LOWER_CHART_INDICATORS.get(lower_chart_type or 'volume', INDICATOR_GROUPS))
+    if show_ema and 'show' in show_ema:
+        needed.add('ema')
+    if atr_bands:
+        needed.add('atr')
+    if use_impulse_system:
+        needed.update(['ema', 'macd'])
+    return tuple(group for group in INDICATOR_GROUPS if group in needed)
+
+# Indicators of the default chart view (volume panel with EMAs), used when warming views
+DEFAULT_VIEW_INDICATORS = view_indicators('volume', ['show'])
+
+def _calculate_indicator_group(df, params, group):
+    """Columns (plus the unreliable flag) of one indicator group"""
+    result = _calculate_indicators_uncached(df, *params, indicators=[group])
+    columns = [col for col in result.columns if indicator_group(col) == group]
+    return result[columns + ['unreliable_indicators']]
+
+def _calculate_indicator_groups(df, params, indicators):
+    """Assemble the requested indicator groups. Each group is memoized on its own, so switching
+    panels only calculates the group that is not cached yet."""
+    result = df.copy(deep=False)
+    unreliable = np.zeros(len(df), dtype=bool)
+    for group in INDICATOR_GROUPS:
+        if group not in indicators:
+            continue
+        key = (group,) + tuple(params[i] for i in INDICATOR_GROUP_PARAMS.get(group, ()))
+        columns = _memoize_indicators(df, key, lambda group=group: _calculate_indicator_group(df, params, group))
+        for col in columns.columns:
+            if col != 'unreliable_indicators':
+                result[col] = columns[col].to_numpy()
+        unreliable |= columns['unreliable_indicators'].to_numpy(dtype=bool)
+    result['unreliable_indicators'] = unreliable
+    return result
+
+def get_bar_cache_stats():
+    """Get hit, miss and eviction counters plus memory usage of the bar cache"""
+    return _bar_cache.stats()
+
+def get_indicator_cache_stats():
+    """Get hit, miss and eviction counters plus memory usage of the indicator result cache"""
+    return _indicator_cache.stats()
+
+def _get_market_clock(exchange='NYSE'):
+    """Get the current time in CET/CEST (user's timezone) and exchange time, plus the session flags
+    (holidays, early closes and DST come from the market calendar)"""
+    state = get_market_state(exchange)
+    now_exchange = state['now']
+    return {
+        'now_cest': now_exchange.astimezone(DISPLAY_TZ).replace(tzinfo=None),
+        'now_et': now_exchange.replace(tzinfo=None),
+        'is_market_open': state['is_open'],
+        'is_pre_market': state['is_pre_market'],
+        'is_after_market': state['is_after_market'],
+        'is_weekend': now_exchange.weekday() >= 5,  # Saturday=5, Sunday=6
+        'is_trading_day': state['is_trading_day']
+    }
+
+def _get_extended_period(period):
+    """Get the period to download so indicators have enough warmup before the displayed range"""
+    # Calculate optimized period for faster loading while maintaining indicator accuracy
+    # Reduced extended periods for faster ticker switching
+    extended_period = period
+    if period == "6mo":
+        extended_period = "1y"   # Keep as is (reasonable)
+    elif period == "ytd":
+        extended_period = "1y"   # Reduced from 2y for faster loading
+    elif period == "1y":
+        extended_period = "2y"   # Reduced from 3y for faster loading
+    elif period == "5y":
+        extended_period = "7y"   # Reduced from 10y for faster loading
+    return extended_period
+
+def _claim_flight(key):
+    """Register interest in an in-flight fetch. Returns (future, is_leader); only the leader fetches."""
+    with _inflight_lock:
+        future = _inflight_fetches.get(key)
+        if future is not None:
+            return future, False
+        future = Future()
+        _inflight_fetches[key] = future
+        return future, True
+
+def _finish_flight(key, future, result=None, error=None):
+    """Publish the leader's result (or error) to every waiting caller and clear the in-flight entry"""
+    with _inflight_lock:
+        _inflight_fetches.pop(key, None)
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+def _single_flight(key, fetch):
+    """Run fetch() once per key at a time; concurrent callers for the same key wait for and share its result"""
+    future, is_leader = _claim_flight(key)
+    if not is_leader:
+        return future.result()
+    try:
+        result = fetch()
+    except Exception as e:
+        _finish_flight(key, future, error=e)
+        raise
+    _finish_flight(key, future, result)
+    return result
 
 # Function to fetch stock data with lookback for indicators
 def get_stock_data(symbol="SPY", period="1y", frequency=None, ema_periods=[13, 26]):
-    """Fetch stock data from yfinance with caching for faster ticker switching, with extended lookback for intraday EMA warmup."""
+    """Fetch stock data from yfinance with caching for faster ticker switching, with extended lookback for intraday EMA warmup.
+    Concurrent calls for the same (symbol, period, frequency) share a single in-flight fetch.
+    Expired cache entries are returned immediately while a background refresh runs (up to MAX_STALE_SECONDS)."""
     # Note: YTD is treated as a non-intraday period, so indicators are reliable from the first bar (unlike '1d' or 'yesterday').
     # Check if 1mo period is requested (no longer supported)
     if period == "1mo":
         raise Exception("1-month period is no longer supported. Please use 6-month or longer timeframes.")
+    flight_key = _cache_key(symbol, period, frequency)
+    fetch = lambda: _fetch_stock_data(symbol, period, frequency)
+    # Check cache first for non-intraday data (intraday needs real-time updates)
+    if period != "1d":
+        cached_result, is_fresh = _bar_cache.get_stale(flight_key)
+        if cached_result is not None:
+            if not is_fresh:
+                # Serve the last known bars now; the next interval tick picks up the refreshed ones
+                _revalidate_in_background(flight_key, fetch)
+            return cached_result
+    return _single_flight(flight_key, fetch)
+
+def _revalidate_in_background(key, fetch):
+    """Refresh an expired cache entry in a background thread (unless a fetch is already running)"""
+    with _inflight_lock:
+        if key in _inflight_fetches:
+            return
+    def _refresh():
+        try:
+            _single_flight(key, fetch)
+        except Exception as e:
+            print(f"Error refreshing {key[0]} in background: {e}")
+    threading.Thread(target=_refresh, daemon=True).start()
+
+def _fetch_stock_data(symbol, period, frequency):
+    """Fetch stock data for get_stock_data (runs once per in-flight key)"""
     try:
-        # Check cache first for non-intraday data (intraday needs real-time updates)
+        # Re-check the cache: another caller may have finished the same fetch meanwhile
         if period != "1d":
-            cached_result = _get_cached_data(symbol, period)
+            cached_result = _get_cached_data(symbol, period, frequency)
             if cached_result is not None:
                 return cached_result
         
@@ -75,47 +312,26 @@ def get_stock_data(symbol="SPY", period="1y", frequency=None, ema_periods=[13, 2
         # Check if intraday (1d) data is requested
         is_intraday = period == "1d"
         
-        # Improved US stock detection: only restrict for true US stocks (all uppercase/numbers, no special chars, or ends with .US)
-        def _is_us_stock(symbol):
-            if symbol.endswith('.US'):
-                return True
-            # Exclude anything with special chars (except .US)
-            if re.match(r'^[A-Z0-9]+$', symbol):
-                return True
-            return False
-        is_us_stock = _is_us_stock(symbol)
-        
-        # Get current time in CEST (user's timezone)
-        now_cest = datetime.now()
+        # Exchange calendar for the symbol (None for FX, futures, crypto and unknown exchanges)
+        exchange = get_exchange(symbol)
+        is_us_stock = exchange == 'NYSE'
         
-        # Convert CEST to UTC first
-        # CEST is UTC+2, so subtract 2 hours to get UTC
-        now_utc = now_cest - timedelta(hours=2)
-        
-        # Convert UTC to Eastern Time (EDT is UTC-4 in summer, EST is UTC-5 in winter)
-        # For July 2025, we're in EDT (summer time), so UTC-4
-        now_et = now_utc - timedelta(hours=4)
-        
-        # Check if we are in market hours (9:30AM - 4:00PM ET)
-        is_market_open = (now_et.hour > 9 or (now_et.hour == 9 and now_et.minute >= 30)) and now_et.hour < 16
-        is_pre_market = now_et.hour < 9 or (now_et.hour == 9 and now_et.minute < 30)
-        is_after_market = now_et.hour >= 16
-        is_weekend = now_et.weekday() >= 5  # Saturday=5, Sunday=6
+        clock = _get_market_clock(exchange or 'NYSE')
+        now_cest = clock['now_cest']
+        is_pre_market = clock['is_pre_market']
+        is_after_market = clock['is_after_market']
+        is_closed_day = exchange is not None and not clock['is_trading_day']  # Weekend or exchange holiday
         
         # Handle "yesterday" period first - always fetch previous trading day data
         if period == "yesterday":
             
-            # Calculate the previous trading day (skip weekends and go back to last business day)
+            # Calculate the previous trading day (skip weekends and exchange holidays)
             current_date = now_cest.date()
-            
-            # Go back one day and find the previous business day
-            prev_day = current_date - timedelta(days=1)
-            while prev_day.weekday() > 4:  # 5=Saturday, 6=Sunday
-                prev_day = prev_day - timedelta(days=1)
+            prev_day = previous_trading_day(exchange or 'NYSE', current_date)
                 
             # Fetch minute data for a period that includes multiple previous trading days for indicator calculation
             # Use "7d" period to ensure we get enough data for accurate indicator calculations
-            ticker = yf.Ticker(symbol)
+            provider = get_provider()
             try:
                 # Check if we need custom resampling (8m, 39m, etc.)
                 custom_intervals = ['8m', '25m', '39m']
@@ -127,7 +343,7 @@ def get_stock_data(symbol="SPY", period="1y", frequency=None, ema_periods=[13, 2
                 else:
                     interval_arg = frequency if frequency else "1m"
                 
-                data = ticker.history(period="7d", interval=interval_arg, timeout=3)  # Reduced timeout for faster loading
+                data = provider.history(symbol, period="7d", interval=interval_arg, timeout=3)  # Reduced timeout for faster loading
                 
                 if data.empty:
                     # Return empty dataset if no data for yesterday
@@ -146,21 +362,17 @@ def get_stock_data(symbol="SPY", period="1y", frequency=None, ema_periods=[13, 2
                 
                 data.reset_index(inplace=True)
         
-                # Handle the Date/Datetime column and convert to CEST
+                # Handle the Date/Datetime column and convert to CET/CEST
                 if 'Datetime' in data.columns:
                     data = data.rename(columns={'Datetime': 'Date'})
                 
-                # Convert from ET to CEST (add 6 hours for summer time)
-                data['Date'] = pd.to_datetime(data['Date']).dt.tz_localize(None)
-                data['Date'] = data['Date'] + timedelta(hours=6)  # Convert EDT to CEST
+                # Convert from exchange time to CET/CEST (DST-aware)
+                data['Date'] = to_display_time(data['Date'])
                 
                 # Apply custom resampling if needed
                 if needs_resampling:
                     data = resample_to_custom_interval(data, frequency)
                 
-                # Keep the full dataset for indicator calculation
-                full_data_for_indicators = data.copy()
-                
                 # Filter to only show data from the previous trading day in CEST for display
                 display_data = data[data['Date'].dt.date == prev_day]
                 
@@ -182,11 +394,11 @@ def get_stock_data(symbol="SPY", period="1y", frequency=None, ema_periods=[13, 2
                     is_minute_data = True
                     return empty_df, start_date, end_date, is_minute_data
                 
-                # Filter to market hours (15:30 to 22:00 CEST, which is 9:30 AM to 4:00 PM ET)
-                market_start = pd.Timestamp('15:30:00').time()
-                market_end = pd.Timestamp('22:00:00').time()
+                # Filter to the exchange session in CET/CEST (e.g. 15:30 to 22:00 for US stocks)
+                session = session_in_display_time(exchange, prev_day) if exchange else None
                 if (
-                    isinstance(data, pd.DataFrame)
+                    session is not None
+                    and isinstance(data, pd.DataFrame)
                     and 'Date' in data.columns
                     and pd.api.types.is_datetime64_any_dtype(data['Date'])
                 ):
@@ -205,7 +417,7 @@ def get_stock_data(symbol="SPY", period="1y", frequency=None, ema_periods=[13, 2
                         date_col = data['Date']
                         # Only use .dt if still a Series (not ndarray)
                         if isinstance(date_col, pd.Series):
-                            data = data[(date_col.dt.time >= market_start) & (date_col.dt.time <= market_end)]
+                            data = data[(date_col >= session[0]) & (date_col <= session[1])]
                 
                 if isinstance(data, (pd.DataFrame, pd.Series)) and getattr(data, 'empty', False):
                     empty_df = pd.DataFrame({
@@ -246,40 +458,36 @@ def get_stock_data(symbol="SPY", period="1y", frequency=None, ema_periods=[13, 2
         # Handle intraday data differently - get minute data for 1-day period
         if is_intraday:
             # For 1D view: Show empty chart when market is closed, real-time data when open
-            if is_us_stock:
-                if is_weekend:
-                    # Return empty dataset when it's weekend
-                    empty_df = pd.DataFrame({
-                        'Date': [],
-                        'Open': [],
-                        'High': [],
-                        'Low': [],
-                        'Close': [],
-                        'Volume': []
-                    })
-                    start_date = now_cest
-                    end_date = now_cest
-                    is_minute_data = True
-                    return empty_df, start_date, end_date, is_minute_data
-                elif is_pre_market or is_after_market:
-                    # During trading days but outside market hours, return empty dataset
-                    # This ensures we only show data during active market hours
-                    empty_df = pd.DataFrame({
-                        'Date': [],
-                        'Open': [],
-                        'High': [],
-                        'Low': [],
-                        'Close': [],
-                        'Volume': []
-                    })
-                    start_date = now_cest
-                    end_date = now_cest
-                    is_minute_data = True
-                    return empty_df, start_date, end_date, is_minute_data
+            if is_closed_day:
+                # Weekend or exchange holiday: nothing to fetch
+                empty_df = pd.DataFrame({
+                    'Date': [],
+                    'Open': [],
+                    'High': [],
+                    'Low': [],
+                    'Close': [],
+                    'Volume': []
+                })
+                return empty_df, now_cest, now_cest, True
+            if is_us_stock and (is_pre_market or is_after_market):
+                # During trading days but outside market hours, return empty dataset
+                # This ensures we only show data during active market hours
+                empty_df = pd.DataFrame({
+                    'Date': [],
+                    'Open': [],
+                    'High': [],
+                    'Low': [],
+                    'Close': [],
+                    'Volume': []
+                })
+                start_date = now_cest
+                end_date = now_cest
+                is_minute_data = True
+                return empty_df, start_date, end_date, is_minute_data
             # For non-US stocks, do NOT restrict by US market hours; just fetch whatever yfinance returns
             # Market is open - fetch real-time minute data for today only
             # Fetch minute data using yfinance - Include PREVIOUS DAYS' data for proper indicator calculation
-            ticker = yf.Ticker(symbol)
+            provider = get_provider()
             try:
                 # Check if we need custom resampling (8m, 39m, etc.)
                 custom_intervals = ['8m', '25m', '39m']
@@ -289,22 +497,15 @@ def get_stock_data(symbol="SPY", period="1y", frequency=None, ema_periods=[13, 2
                     interval_arg = "1m"
                 else:
                     interval_arg = frequency if frequency else "1m"
-                # For intraday, fetch 5 days of minute data to include previous market periods
-                # This ensures indicators have enough historical data to calculate properly from market open
-                data = ticker.history(period="5d", interval=interval_arg, timeout=3)  # Reduced timeout for faster loading
-                # Convert timestamps to CEST timezone for display
-                data.reset_index(inplace=True)
-                # Handle the Date/Datetime column and convert to CEST
-                if 'Datetime' in data.columns:
-                    data = data.rename(columns={'Datetime': 'Date'})
-                # Convert from ET to CEST
-                data['Date'] = pd.to_datetime(data['Date']).dt.tz_localize(None)
-                data['Date'] = data['Date'] + timedelta(hours=6)  # Convert EDT to CEST
-                # Apply custom resampling if needed
-                if needs_resampling:
-                    data = resample_to_custom_interval(data, frequency)
-                # Store the full dataset for indicator calculation
-                full_data_for_indicators = data.copy()
+                # The session buffer fetches 5 days of minute data once (previous market periods for
+                # indicator warmup) and afterwards only the bars since the last one it holds.
+                # Timestamps are converted to CET/CEST and custom intervals re-aggregated there.
+                data = _intraday_buffer.get_bars(
+                    symbol, interval_arg,
+                    lambda **kwargs: provider.history(symbol, interval=interval_arg, timeout=3, **kwargs),  # Reduced timeout for faster loading
+                    resample_to=frequency if needs_resampling else None,
+                    display_tz=DISPLAY_TZ
+                )
                 # Filter to only show data from today in CEST for display
                 today_cest = now_cest.date()
                 if (
@@ -363,135 +564,207 @@ def get_stock_data(symbol="SPY", period="1y", frequency=None, ema_periods=[13, 2
                 is_minute_data = True
                 return empty_df, start_date, end_date, is_minute_data
         else:
-            # Calculate optimized period for faster loading while maintaining indicator accuracy
-            # Reduced extended periods for faster ticker switching
-            extended_period = period
-            if period == "6mo":
-                extended_period = "1y"   # Keep as is (reasonable)
-            elif period == "ytd":
-                extended_period = "1y"   # Reduced from 2y for faster loading
-            elif period == "1y":
-                extended_period = "2y"   # Reduced from 3y for faster loading
-            elif period == "5y":
-                extended_period = "7y"   # Reduced from 10y for faster loading
-            
-            # Try to fetch real stock data with reduced timeout for faster response
-            ticker = yf.Ticker(symbol)
-            interval_arg = frequency if frequency else None
-            if interval_arg:
-                data = ticker.history(period=extended_period, interval=interval_arg, timeout=2)  # Further reduced timeout for faster switching
-            else:
-                data = ticker.history(period=extended_period, timeout=2)  # Further reduced timeout for faster switching
-        
-        if data.empty or len(data) < 5:  # Consider requiring minimum number of data points
-            # Return empty DataFrame instead of falling back to SPY
-            return pd.DataFrame(), pd.Timestamp.now(), pd.Timestamp.now(), False
-        data.reset_index(inplace=True)
-        
-        # Handle the Date/Datetime column
-        # YFinance may return 'Date' for daily data or 'Datetime' for intraday data
-        if 'Date' in data.columns:
-            data['Date'] = pd.to_datetime(data['Date']).dt.tz_localize(None)  # Remove timezone info
-        elif 'Datetime' in data.columns:
-            # For intraday data, rename Datetime to Date for consistency
-            data = data.rename(columns={'Datetime': 'Date'})
-            data['Date'] = pd.to_datetime(data['Date']).dt.tz_localize(None)  # Remove timezone info
-        
-        # Exclude weekends
-        # Only keep business days (Monday=0 to Friday=4)
-        data = data[data['Date'].dt.weekday < 5]
-        
-        # Calculate the target end date and start date for the requested period
-        end_date = data['Date'].max()
-        
-        # Calculate start date based on requested period
-        if period == "1d":
-            # For intraday data, calculate precise 1 day window
-            if is_intraday:
-                # For 1d intraday view, show just one full trading day (9:30AM - 4:00PM)
-                # Get today's market date
-                if isinstance(end_date, pd.Timestamp):
-                    trading_day = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                    # Calculate market opening and closing times
-                    market_open = trading_day.replace(hour=9, minute=30)
-                    market_close = trading_day.replace(hour=16, minute=0)
-                    # For intraday data, we'll restrict to market hours on the display date
-                    start_date = market_open
-                    # If we're showing yesterday's data (pre-market), ensure we get correct market hours
-                    if is_pre_market:
-                        # We're viewing previous day's data, so use that date's market session
-                        start_date = trading_day.replace(hour=9, minute=30)
-                        end_date = trading_day.replace(hour=16, minute=0)
-                    else:
-                        start_date = trading_day
-                else:
-                    start_date = end_date
-            else:
-                start_date = end_date - timedelta(days=1)
-        # Removed 1mo period - no longer supported
-        elif period == "6mo":
-            start_date = end_date - pd.DateOffset(months=6)
-        elif period == "ytd":
-            # For YTD, exclude today from the data if we're in pre-market hours
-            # Using ET (market time) for the determination
-            if is_pre_market and isinstance(end_date, pd.Timestamp):
-                # Adjust end_date to previous day's end
-                end_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
-                end_date = end_date.replace(hour=23, minute=59, second=59)
-            # Create a naive datetime object for January 1st of the current year
-            start_date = pd.Timestamp(end_date.year, 1, 1) if isinstance(end_date, pd.Timestamp) else end_date
-        elif period == "1y":
-            start_date = end_date - pd.DateOffset(years=1)
-        elif period == "5y":
-            start_date = end_date - pd.DateOffset(years=5)
-        else:  # max
-            if (
-                isinstance(data, pd.DataFrame)
-                and 'Date' in data.columns
-                and pd.api.types.is_datetime64_any_dtype(data['Date'])
-            ):
-                start_date = data['Date'].min()
-            else:
-                start_date = end_date
-        
-        # Store the full data for indicator calculation
-        full_data = data.copy()
-        
-        # For intraday data, add a marker to identify this as minute-level data
-        is_minute_data = False
-        if period in ["1d", "yesterday"] and is_intraday and len(data) > 0:
-            # Check if the data has minute granularity (check time differences)
-            date_col = data['Date']
-            if (
-                isinstance(date_col, pd.Series)
-                and pd.api.types.is_datetime64_any_dtype(date_col)
-                and date_col.notnull().all()
-                and not date_col.isin([pd.NaT]).any()
-            ):
-                time_diffs = date_col.diff().dropna()
-                if len(time_diffs) > 0:
-                    median_diff = time_diffs.median()
-                    # Only call .total_seconds() if median_diff is a Timedelta
-                    if isinstance(median_diff, pd.Timedelta):
-                        median_diff_seconds = median_diff.total_seconds()
-                        is_minute_data = median_diff_seconds < 600  # 10 minutes in seconds
-        
-        # Cache non-intraday data for faster ticker switching (don't cache intraday as it needs real-time updates)
-        if period != "1d":
-            _cache_data(symbol, period, full_data, start_date, end_date, is_minute_data)
+            # Read from the on-disk bar store first; only bars newer than the last
+            # stored timestamp are requested from yfinance (full download on first use)
+            interval_arg = frequency if frequency else '1d'
+            data = refresh_bars(symbol, interval_arg, _get_extended_period(period), timeout=2)  # Reduced timeout for faster switching
         
-        # After indicator calculation, we'll trim to the requested period
-        return full_data, start_date, end_date, is_minute_data
+        return _build_history_result(symbol, period, data, is_pre_market, is_intraday, frequency)
         
     except Exception as e:
         # Return empty DataFrame instead of trying SPY fallback
         return pd.DataFrame(), pd.Timestamp.now(), pd.Timestamp.now(), False
 
-def calculate_indicators(df, ema_periods=[13, 26], macd_fast=12, macd_slow=26, macd_signal=9, force_smoothing=2, adx_period=13, stoch_period=5, rsi_period=13, fast_mode=False):
+def get_stock_data_many(symbols, period="6mo", frequency=None):
+    """Fetch stock data for many symbols with batched multi-ticker requests (used by the scanner).
+    Returns a dict mapping each symbol to the same (data, start_date, end_date, is_minute_data)
+    tuple that get_stock_data returns."""
+    # Intraday views need per-symbol real-time handling
+    if period in ["1d", "yesterday"]:
+        return {symbol: get_stock_data(symbol, period, frequency) for symbol in symbols}
+    
+    results = {}
+    to_fetch = {}
+    waiting = {}
+    for symbol in symbols:
+        cached_result = _get_cached_data(symbol, period, frequency)
+        if cached_result is not None:
+            results[symbol] = cached_result
+            continue
+        # Join fetches already in flight for this symbol; claim the rest for the batch
+        future, is_leader = _claim_flight(_cache_key(symbol, period, frequency))
+        if is_leader:
+            to_fetch[symbol] = future
+        else:
+            waiting[symbol] = future
+    
+    if to_fetch:
+        try:
+            interval_arg = frequency if frequency else '1d'
+            frames = refresh_bars_many(list(to_fetch), interval_arg, _get_extended_period(period))
+            is_pre_market = _get_market_clock()['is_pre_market']
+        except Exception as e:
+            print(f"Error in batched download: {e}")
+            frames, is_pre_market = {}, False
+        for symbol, future in to_fetch.items():
+            try:
+                results[symbol] = _build_history_result(symbol, period, frames.get(symbol, pd.DataFrame()), is_pre_market, frequency=frequency)
+            except Exception as e:
+                results[symbol] = (pd.DataFrame(), pd.Timestamp.now(), pd.Timestamp.now(), False)
+            _finish_flight(_cache_key(symbol, period, frequency), future, results[symbol])
+    
+    for symbol, future in waiting.items():
+        try:
+            results[symbol] = future.result()
+        except Exception as e:
+            results[symbol] = (pd.DataFrame(), pd.Timestamp.now(), pd.Timestamp.now(), False)
+    
+    return results
+
+def _build_history_result(symbol, period, data, is_pre_market=False, is_intraday=False, frequency=None):
+    """Trim bars to business days, work out the display window for the period and cache the result.
+    Returns the same (data, start_date, end_date, is_minute_data) tuple as get_stock_data."""
+    if data.empty or len(data) < 5:  # Consider requiring minimum number of data points
+        # Return empty DataFrame instead of falling back to SPY
+        return pd.DataFrame(), pd.Timestamp.now(), pd.Timestamp.now(), False
+    
+    # Keep Date/OHLCV only, as float32/int32 (Dividends and Stock Splits are not used past the bar store)
+    if COMPACT_FRAMES:
+        data = compact_bars(data)
+    
+    # Exclude weekends
+    # Only keep business days (Monday=0 to Friday=4); daily bars rarely have any, so skip the row copy then
+    weekdays = data['Date'].dt.weekday < 5
+    if not weekdays.all():
+        data = data[weekdays]
+    
+    # Calculate the target end date and start date for the requested period
+    end_date = data['Date'].max()
+    
+    # Calculate start date based on requested period
+    if period == "1d":
+        # For intraday data, calculate precise 1 day window
+        if is_intraday:
+            # For 1d intraday view, show just one full trading day (9:30AM - 4:00PM)
+            # Get today's market date
+            if isinstance(end_date, pd.Timestamp):
+                trading_day = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+                # Calculate market opening and closing times
+                market_open = trading_day.replace(hour=9, minute=30)
+                market_close = trading_day.replace(hour=16, minute=0)
+                # For intraday data, we'll restrict to market hours on the display date
+                start_date = market_open
+                # If we're showing yesterday's data (pre-market), ensure we get correct market hours
+                if is_pre_market:
+                    # We're viewing previous day's data, so use that date's market session
+                    start_date = trading_day.replace(hour=9, minute=30)
+                    end_date = trading_day.replace(hour=16, minute=0)
+                else:
+                    start_date = trading_day
+            else:
+                start_date = end_date
+        else:
+            start_date = end_date - timedelta(days=1)
+    # Removed 1mo period - no longer supported
+    elif period == "6mo":
+        start_date = end_date - pd.DateOffset(months=6)
+    elif period == "ytd":
+        # For YTD, exclude today from the data if we're in pre-market hours
+        # Using ET (market time) for the determination
+        if is_pre_market and isinstance(end_date, pd.Timestamp):
+            # Adjust end_date to previous day's end
+            end_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+            end_date = end_date.replace(hour=23, minute=59, second=59)
+        # Create a naive datetime object for January 1st of the current year
+        start_date = pd.Timestamp(end_date.year, 1, 1) if isinstance(end_date, pd.Timestamp) else end_date
+    elif period == "1y":
+        start_date = end_date - pd.DateOffset(years=1)
+    elif period == "5y":
+        start_date = end_date - pd.DateOffset(years=5)
+    else:  # max
+        if (
+            isinstance(data, pd.DataFrame)
+            and 'Date' in data.columns
+            and pd.api.types.is_datetime64_any_dtype(data['Date'])
+        ):
+            start_date = data['Date'].min()
+        else:
+            start_date = end_date
+    
+    # Store the full data for indicator calculation (a shallow copy: the stages after this one only
+    # add or replace whole columns, so the cached bars stay unchanged)
+    full_data = data.copy(deep=False)
+    
+    # For intraday data, add a marker to identify this as minute-level data
+    is_minute_data = False
+    if period in ["1d", "yesterday"] and is_intraday and len(data) > 0:
+        # Check if the data has minute granularity (check time differences)
+        date_col = data['Date']
+        if (
+            isinstance(date_col, pd.Series)
+            and pd.api.types.is_datetime64_any_dtype(date_col)
+            and date_col.notnull().all()
+            and not date_col.isin([pd.NaT]).any()
+        ):
+            time_diffs = date_col.diff().dropna()
+            if len(time_diffs) > 0:
+                median_diff = time_diffs.median()
+                # Only call .total_seconds() if median_diff is a Timedelta
+                if isinstance(median_diff, pd.Timedelta):
+                    median_diff_seconds = median_diff.total_seconds()
+                    is_minute_data = median_diff_seconds < 600  # 10 minutes in seconds
+    
+    # Cache non-intraday data for faster ticker switching (don't cache intraday as it needs real-time updates)
+    if period != "1d":
+        _cache_data(symbol, period, full_data, start_date, end_date, is_minute_data, frequency)
+    
+    # After indicator calculation, we'll trim to the requested period
+    return full_data, start_date, end_date, is_minute_data
+
+# Indicator backend: 'numba' (NumPy engine with compiled recursive kernels, used when Numba is installed),
+# 'numpy' (vectorized engine) or 'ta' (reference implementation)
+INDICATOR_BACKEND = 'numba' if use_jit_kernels() else 'numpy'
+
+def set_indicator_backend(backend):
+    """Select the calculate_indicators backend ('numba', 'numpy' or 'ta').
+    'numba' falls back to 'numpy' when Numba is not installed."""
+    global INDICATOR_BACKEND
+    if backend not in ['numba', 'numpy', 'ta']:
+        raise ValueError(f"Unknown indicator backend: {backend}")
+    if use_jit_kernels(backend == 'numba') != (backend == 'numba'):
+        print("Numba is not installed, using the NumPy indicator engine")
+        backend = 'numpy'
+    INDICATOR_BACKEND = backend
+
+def calculate_indicators(df, ema_periods=[13, 26], macd_fast=12, macd_slow=26, macd_signal=9, force_smoothing=2, adx_period=13, stoch_period=5, rsi_period=13, fast_mode=False, indicators=None):
     """Calculate technical indicators for the stock data with custom parameters
-    fast_mode: If True, calculates only essential indicators for faster ticker switching"""
+    fast_mode: If True, calculates only essential indicators for faster ticker switching
+    indicators: Indicator groups to calculate (e.g. view_indicators(...)), default all.
+        Only the NumPy engine backends calculate subsets; the ta backend always returns every indicator.
+    Results are memoized by bars fingerprint and parameters (see get_indicator_cache_stats)"""
+    params = (tuple(ema_periods), macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, fast_mode)
+    if indicators is not None and not df.empty and INDICATOR_BACKEND != 'ta' and supports_numpy_engine(df, adx_period):
+        return _calculate_indicator_groups(df, params, indicators)
+    return _memoize_indicators(df, params, lambda: _calculate_indicators_uncached(df, *params))
+
+def _calculate_indicators_uncached(df, ema_periods=[13, 26], macd_fast=12, macd_slow=26, macd_signal=9, force_smoothing=2, adx_period=13, stoch_period=5, rsi_period=13, fast_mode=False, indicators=None):
+    """calculate_indicators on the selected backend, without the result cache"""
+    ema_periods = list(ema_periods)
+    if INDICATOR_BACKEND != 'ta' and supports_numpy_engine(df, adx_period):
+        try:
+            return calculate_indicators_numpy(df, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing,
+                                              adx_period, stoch_period, rsi_period, fast_mode, indicators)
+        except Exception as e:
+            print(f"NumPy indicator engine failed, using ta: {e}")
+    return _calculate_indicators_ta(df, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing,
+                                    adx_period, stoch_period, rsi_period, fast_mode)
+
+def _calculate_indicators_ta(df, ema_periods=[13, 26], macd_fast=12, macd_slow=26, macd_signal=9, force_smoothing=2, adx_period=13, stoch_period=5, rsi_period=13, fast_mode=False):
+    """Reference implementation of calculate_indicators built on the ta library"""
     try:
-        df = df.copy()
+        df = df.copy(deep=False)
+        # ta negates and differences volumes, so integer Volume columns (compact frames) are read as float64
+        volume = df['Volume'].astype(np.float64) if 'Volume' in df.columns else None
         
         # Handle empty dataframes (e.g., when market is closed for 1D view)
         if df.empty:
@@ -554,7 +827,7 @@ def calculate_indicators(df, ema_periods=[13, 26], macd_fast=12, macd_slow=26, m
 
         # Force Index with smoothing
         if min_length >= 2:
-            force_raw = ta.volume.ForceIndexIndicator(df['Close'], df['Volume']).force_index()
+            force_raw = ta.volume.ForceIndexIndicator(df['Close'], volume).force_index()
             if force_smoothing > 1 and min_length >= force_smoothing:
                 df['Force_Index'] = force_raw.rolling(window=force_smoothing).mean()
             else:
@@ -564,7 +837,7 @@ def calculate_indicators(df, ema_periods=[13, 26], macd_fast=12, macd_slow=26, m
 
         # A/D Line (Accumulation/Distribution)
         if min_length >= 1:
-            ad_line = ta.volume.AccDistIndexIndicator(df['High'], df['Low'], df['Close'], df['Volume']).acc_dist_index()
+            ad_line = ta.volume.AccDistIndexIndicator(df['High'], df['Low'], df['Close'], volume).acc_dist_index()
             df['AD'] = ad_line
             df['AD_Line'] = ad_line
         else:
@@ -620,7 +893,7 @@ def calculate_indicators(df, ema_periods=[13, 26], macd_fast=12, macd_slow=26, m
 
         # On Balance Volume (OBV)
         if min_length >= 1:
-            obv_indicator = ta.volume.OnBalanceVolumeIndicator(df['Close'], df['Volume'])
+            obv_indicator = ta.volume.OnBalanceVolumeIndicator(df['Close'], volume)
             df['OBV'] = obv_indicator.on_balance_volume()
         else:
             df['OBV'] = 0
@@ -792,8 +1065,6 @@ def get_comparison_volume(comparison_symbol, timeframe, start_date, end_date):
         return None
         
     try:
-        ticker = yf.Ticker(comparison_symbol)
-        
         # Use a slightly extended period to ensure we get enough data
         if isinstance(start_date, pd.Timestamp):
             start_str = (start_date - pd.Timedelta(days=5)).strftime('%Y-%m-%d')
@@ -806,7 +1077,7 @@ def get_comparison_volume(comparison_symbol, timeframe, start_date, end_date):
             end_str = (pd.Timestamp(end_date) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
             
         # Fetch the data
-        comp_data = ticker.history(start=start_str, end=end_str, interval='1d')
+        comp_data = get_provider().history(comparison_symbol, start=start_str, end=end_str, interval='1d')
         
         if comp_data.empty:
             return None
@@ -825,8 +1096,17 @@ def get_comparison_volume(comparison_symbol, timeframe, start_date, end_date):
     except Exception as e:
         return None
 
-def update_data(n, symbol, timeframe, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, frequency=None):
-    """Update stock data periodically or when symbol/timeframe/parameters change"""
+def _rows_from(df, start_date):
+    """Rows dated start_date or later. Sorted dates (the usual case) give a positional slice, which
+    shares the column buffers with df instead of copying the rows."""
+    dates = df['Date']
+    if dates.is_monotonic_increasing:
+        return df.iloc[dates.searchsorted(start_date):]
+    return df[dates >= start_date]
+
+def update_data(n, symbol, timeframe, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, frequency=None, indicators=None):
+    """Update stock data periodically or when symbol/timeframe/parameters change
+    indicators: Indicator groups the chart view draws (see view_indicators), default all"""
     # Note: YTD is treated as a non-intraday period, so indicators are reliable from the first bar (unlike '1d' or 'yesterday').
     error_msg = []
     error_class = "alert alert-warning fade show d-none"  # Hidden by default
@@ -847,21 +1127,10 @@ def update_data(n, symbol, timeframe, ema_periods, macd_fast, macd_slow, macd_si
         # Track if we're using sample data
         using_sample_data = False
         
-        # Clear cache when frequency changes to ensure fresh data
-        if frequency:
-            _clear_cache_for_symbol(symbol, timeframe)
-        
         # Get extended data for proper indicator calculation
+        # (get_stock_data serves from the cache, keyed on symbol, timeframe and frequency)
         try:
-            # Check cache first (but we just cleared it if frequency changed)
-            cached_result = _get_cached_data(symbol, timeframe)
-            if cached_result is not None:
-                full_data, start_date, end_date, is_minute_data = cached_result
-            else:
-                full_data, start_date, end_date, is_minute_data = get_stock_data(symbol, timeframe, frequency)
-                # Cache the result for faster subsequent access
-                if timeframe not in ["1d", "yesterday"]:  # Don't cache intraday data
-                    _cache_data(symbol, timeframe, full_data, start_date, end_date, is_minute_data)
+            full_data, start_date, end_date, is_minute_data = get_stock_data(symbol, timeframe, frequency)
         except Exception as data_error:
             full_data, start_date, end_date, is_minute_data = get_stock_data("SPY", timeframe, frequency)  # Fall back to SPY
             error_msg = [
@@ -881,25 +1150,9 @@ def update_data(n, symbol, timeframe, ema_periods, macd_fast, macd_slow, macd_si
         is_high_frequency = frequency in ['1m', '2m', '5m', '15m', '30m']
         fast_mode = len(full_data) > 1000 or is_high_frequency  # Use fast mode for large datasets or high-frequency data
         
-        # For intraday data (1d and yesterday), we need to separate display data from indicator calculation data
-        # This ensures all indicators have sufficient historical data to calculate properly from market open
-        if timeframe in ["1d", "yesterday"]:
-            # Calculate indicators using the extended historical dataset (multiple days)
-            df_with_indicators = calculate_indicators(full_data, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, fast_mode)
-            # After calculation, filter to just today or yesterday for display
-            display_date = None
-            now_cest = datetime.now()
-            if timeframe == "1d":
-                display_date = now_cest.date()
-            else:
-                display_date = now_cest.date() - pd.Timedelta(days=1)
-                while pd.Timestamp(display_date).weekday() > 4:
-                    display_date = (pd.Timestamp(display_date) - pd.Timedelta(days=1)).date()
-            df_final = df_with_indicators[pd.to_datetime(df_with_indicators['Date']).dt.date == display_date].copy()
-        else:
-            # For non-intraday views, just calculate normally
-            df_with_indicators = calculate_indicators(full_data, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, fast_mode)
-            df_final = df_with_indicators[df_with_indicators['Date'] >= start_date].copy()
+        # Indicators are calculated on the full dataset and trimmed to the display window afterwards. For intraday
+        # data (1d and yesterday) this is the extended multi-day history, so all indicators have sufficient data from market open
+        df_with_indicators = _calculate_chart_indicators(symbol, timeframe, frequency, full_data, ema_periods, macd_fast, macd_slow, macd_signal, force_smoothing, adx_period, stoch_period, rsi_period, fast_mode, indicators)
         
         # Ensure both the Date column and start_date have the same timezone status (both naive)
         # Make sure the Date column is timezone-naive for comparison
@@ -911,7 +1164,7 @@ def update_data(n, symbol, timeframe, ema_periods, macd_fast, macd_slow, macd_si
         
         # Now trim to the requested period - for intraday, this will show only today's data
         # but the indicators will be calculated using the extended historical data
-        df_final = df_with_indicators[df_with_indicators['Date'] >= start_date].copy()
+        df_final = _rows_from(df_with_indicators, start_date)
         
         if not using_sample_data and (len(df_final) < 5):
             # For 1D or yesterday view, if we have no data it's likely because market is closed - don't show error
@@ -926,7 +1179,7 @@ def update_data(n, symbol, timeframe, ema_periods, macd_fast, macd_slow, macd_si
             if hasattr(start_date, 'tz') and start_date.tz is not None:
                 start_date = start_date.tz_localize(None)
                 
-            df_final = df_with_indicators[df_with_indicators['Date'] >= start_date].copy()
+            df_final = _rows_from(df_with_indicators, start_date)
             error_msg = [
                 html.I(className="fas fa-exclamation-triangle me-2"),
                 f"Insufficient data available for symbol '{symbol}'. Using sample data instead. ",
@@ -934,7 +1187,7 @@ def update_data(n, symbol, timeframe, ema_periods, macd_fast, macd_slow, macd_si
             ]
             error_class = "alert alert-warning fade show"
             
-        return df_final.to_dict('records'), error_msg, error_class
+        return store_records(df_final), error_msg, error_class
         
     except Exception as e:
         # Return error state instead of sample data
@@ -945,7 +1198,67 @@ def update_data(n, symbol, timeframe, ema_periods, macd_fast, macd_slow, macd_si
         error_class = "alert alert-danger fade show"
         return [], error_msg, error_class
 
-def update_main_chart(data, symbol, chart_type, show_ema, ema_periods, atr_bands, timeframe=None, use_impulse_system=False):
+def warm_symbol(symbol, timeframe, frequency=None):
+    """Fetch bars and calculate the default chart indicators for a view, so opening it later hits the caches"""
+    update_data(0, symbol, timeframe, None, None, None, None, None, None, None, None, frequency, DEFAULT_VIEW_INDICATORS)
+
+def _impulse_candlesticks(df, impulse_codes, symbol):
+    """One candlestick trace per Impulse colour. Each trace takes its rows from the colour's
+    run-length segments, so the frame is not filtered once per colour."""
+    from .impulse_functions import get_impulse_colors, impulse_segments, segment_rows, IMPULSE_COLORS
+    segments = impulse_segments(impulse_codes)
+    columns = {col: df[col].to_numpy() for col in ['Date', 'Open', 'High', 'Low', 'Close']}
+    traces = []
+    for code in [1, -1, 0]:  # green, red, blue
+        rows = segment_rows(segments, code)
+        
+        # Skip if no data for this color
+        if len(rows) == 0:
+            continue
+        
+        # Get appropriate colors for this impulse color
+        color = IMPULSE_COLORS[code]
+        colors = get_impulse_colors(color)
+        traces.append(
+            go.Candlestick(
+                x=columns['Date'][rows],
+                open=columns['Open'][rows],
+                high=columns['High'][rows],
+                low=columns['Low'][rows],
+                close=columns['Close'][rows],
+                name=f"{symbol} ({color})",
+                increasing_line_color=colors['increasing_line_color'],
+                decreasing_line_color=colors['decreasing_line_color'],
+                increasing_fillcolor=colors['increasing_fillcolor'],
+                decreasing_fillcolor=colors['decreasing_fillcolor'],
+                line=dict(width=1),
+                opacity=0.9
+            )
+        )
+    return traces
+
+# Background of the Triple Screen overlay per weekly Impulse code
+TRIPLE_SCREEN_FILLS = {1: 'rgba(0, 255, 136, 0.08)', -1: 'rgba(255, 68, 68, 0.08)', 0: 'rgba(0, 212, 255, 0.05)'}
+
+def _triple_screen_bands(df, symbol, timeframe):
+    """Weekly Impulse bands behind daily bars (Elder's first screen): one (start date, end date, code)
+    per run of the weekly Impulse, taken from the symbol's cached multi-timeframe frame"""
+    from .multi_timeframe_functions import get_multi_timeframe_frame, multi_timeframe_period
+    from .impulse_functions import impulse_segments
+    mtf = get_multi_timeframe_frame(symbol, period=multi_timeframe_period(timeframe))
+    if mtf.empty or df.empty:
+        return []
+    # Chart rows -> multi-timeframe rows by session date (rows it does not cover stay blue)
+    dates = df['Date'].dt.normalize()
+    positions = pd.Index(mtf['Date'].dt.normalize()).get_indexer(dates)
+    codes = np.where(positions >= 0, mtf['impulse_weekly'].to_numpy()[positions], 0)
+    segments = impulse_segments(codes)
+    dates = df['Date'].to_numpy()
+    # Each band ends where the next one starts (the last one at the last bar)
+    return [(dates[start], dates[min(end, len(dates) - 1)], int(code))
+            for code, start, end in zip(segments['code'], segments['start'], segments['end'])]
+
+def update_main_chart(data, symbol, chart_type, show_ema, ema_periods, atr_bands, timeframe=None, use_impulse_system=False, macd=None):
     """Update the main chart with different visualization types and indicators
     Returns: (figure, is_in_value_zone)"""
     try:
@@ -976,11 +1289,11 @@ def update_main_chart(data, symbol, chart_type, show_ema, ema_periods, atr_bands
             df = mask_unreliable_indicators(df, ema_periods)
         
         # Process Impulse System if enabled (for candlestick charts only)
-        impulse_df = None
+        impulse_codes = None
         if use_impulse_system and chart_type == 'candlestick' and len(df) > 1:
             # Import here to avoid circular imports
-            from .impulse_functions import calculate_impulse_system
-            impulse_df = calculate_impulse_system(df, ema_period=ema_periods[0] if ema_periods else 13)
+            from .impulse_functions import calculate_impulse_codes
+            impulse_codes = calculate_impulse_codes(df, ema_period=ema_periods[0] if ema_periods else 13, macd=macd)
         
         # Create figure with dark theme
         fig = go.Figure()
@@ -988,39 +1301,10 @@ def update_main_chart(data, symbol, chart_type, show_ema, ema_periods, atr_bands
         # Add different chart types based on selection
         if chart_type == 'candlestick':
             # Standard candlestick (with or without Impulse System)
-            if use_impulse_system and impulse_df is not None:
-                # Use impulse system coloring (groupby date and create separate traces)
-                from .impulse_functions import get_impulse_colors
-                
-                # Create a separate trace for each impulse color
-                for color in ['green', 'red', 'blue']:
-                    # Filter data for this color
-                    color_data = impulse_df[impulse_df['impulse_color'] == color]
-                    
-                    # Skip if no data for this color
-                    if len(color_data) == 0:
-                        continue
-                    
-                    # Get appropriate colors for this impulse color
-                    colors = get_impulse_colors(color)
-                    
-                    # Add trace for this color group
-                    fig.add_trace(
-                        go.Candlestick(
-                            x=color_data['Date'],
-                            open=color_data['Open'],
-                            high=color_data['High'],
-                            low=color_data['Low'],
-                            close=color_data['Close'],
-                            name=f"{symbol} ({color})",
-                            increasing_line_color=colors['increasing_line_color'],
-                            decreasing_line_color=colors['decreasing_line_color'],
-                            increasing_fillcolor=colors['increasing_fillcolor'],
-                            decreasing_fillcolor=colors['decreasing_fillcolor'],
-                            line=dict(width=1),
-                            opacity=0.9
-                        )
-                    )
+            if use_impulse_system and impulse_codes is not None:
+                # Use impulse system coloring (one trace per impulse color)
+                for trace in _impulse_candlesticks(df, impulse_codes, symbol):
+                    fig.add_trace(trace)
             else:
                 # Standard candlestick without impulse system
                 fig.add_trace(
@@ -1591,7 +1875,7 @@ def update_consolidated_chart(data, symbol, chart_type, adx_components, volume_c
     
     return fig
 
-def update_combined_chart(data, symbol, chart_type, show_ema, ema_periods, atr_bands, lower_chart_type, adx_components, volume_comparison=None, relayout_data=None, timeframe=None, frequency=None, use_impulse_system=False, bollinger_bands=None, autoenvelope=None):
+def update_combined_chart(data, symbol, chart_type, show_ema, ema_periods, atr_bands, lower_chart_type, adx_components, volume_comparison=None, relayout_data=None, timeframe=None, frequency=None, use_impulse_system=False, bollinger_bands=None, autoenvelope=None, triple_screen=False, macd=None):
     """Update a combined chart with main price chart on top and indicator chart below"""
     try:
         if not data:
@@ -1663,6 +1947,11 @@ def update_combined_chart(data, symbol, chart_type, show_ema, ema_periods, atr_b
             
             return fig, {'display': 'none'}, 'd-block'
         
+        # Impulse colours, Bollinger Bands and Autoenvelope are evaluated on one indicator graph frame,
+        # so they reuse the EMA/MACD columns (macd: the settings update_data calculated them with)
+        # and share the SMA when their periods match
+        indicator_frame = IndicatorFrame(df, macd)
+        
         # Create subplots with shared x-axis
         fig = make_subplots(
             rows=2, cols=1,
@@ -1677,42 +1966,11 @@ def update_combined_chart(data, symbol, chart_type, show_ema, ema_periods, atr_b
         if chart_type in ['candlestick', 'japanese']:
             # Candlestick chart
             if use_impulse_system and chart_type == 'candlestick':
-                # Use Impulse System for coloring (imported at function level to avoid circular imports)
-                from .impulse_functions import calculate_impulse_system, get_impulse_colors
-                
-                # Add Impulse System coloring to the dataframe
-                impulse_df = calculate_impulse_system(df, ema_period=ema_periods[0] if ema_periods else 13)
-                
-                # Create a separate trace for each impulse color
-                for color in ['green', 'red', 'blue']:
-                    # Filter data for this color
-                    color_data = impulse_df[impulse_df['impulse_color'] == color]
-                    
-                    # Skip if no data for this color
-                    if len(color_data) == 0:
-                        continue
-                        
-                    # Get appropriate colors for this impulse color
-                    colors = get_impulse_colors(color)
-                    
-                    # Add trace for this color group
-                    fig.add_trace(
-                        go.Candlestick(
-                            x=color_data['Date'],
-                            open=color_data['Open'],
-                            high=color_data['High'],
-                            low=color_data['Low'],
-                            close=color_data['Close'],
-                            name=f"{symbol} ({color})",
-                            increasing_line_color=colors['increasing_line_color'],
-                            decreasing_line_color=colors['decreasing_line_color'],
-                            increasing_fillcolor=colors['increasing_fillcolor'],
-                            decreasing_fillcolor=colors['decreasing_fillcolor'],
-                            line=dict(width=1),
-                            opacity=0.9
-                        ),
-                        row=1, col=1
-                    )
+                # Use Impulse System for coloring (one trace per impulse color)
+                from .impulse_functions import impulse_node
+                impulse_codes = indicator_frame.get(impulse_node(ema_periods[0] if ema_periods else 13, macd))
+                for trace in _impulse_candlesticks(df, impulse_codes, symbol):
+                    fig.add_trace(trace, row=1, col=1)
             else:
                 # Standard candlestick without impulse system
                 fig.add_trace(
@@ -1915,12 +2173,10 @@ def update_combined_chart(data, symbol, chart_type, show_ema, ema_periods, atr_b
                 # Calculate Bollinger Bands - requires at least 'period' number of data points
                 if len(df) > period:
                     # Calculate the middle band (Simple Moving Average)
-                    df['BB_middle'] = df['Close'].rolling(window=period).mean()
-                    # Calculate standard deviation
-                    rolling_std = df['Close'].rolling(window=period).std()
-                    # Calculate upper and lower bands
-                    df['BB_upper'] = df['BB_middle'] + (rolling_std * stddev)
-                    df['BB_lower'] = df['BB_middle'] - (rolling_std * stddev)
+                    df['BB_middle'] = indicator_frame.get(f'SMA_{period}')
+                    # Upper and lower bands (SMA +/- stddev * rolling standard deviation)
+                    df['BB_upper'] = indicator_frame.get(f'BB_upper_{period}_{stddev}')
+                    df['BB_lower'] = indicator_frame.get(f'BB_lower_{period}_{stddev}')
                     # Upper band
                     fig.add_trace(
                         go.Scatter(
@@ -1972,11 +2228,10 @@ def update_combined_chart(data, symbol, chart_type, show_ema, ema_periods, atr_b
                 # Calculate Autoenvelope - requires at least 'period' number of data points
                 if len(df) > period:
                     # Calculate the middle line (Simple Moving Average)
-                    df['AE_middle'] = df['Close'].rolling(window=period).mean()
+                    df['AE_middle'] = indicator_frame.get(f'SMA_{period}')
                     # Calculate upper and lower bands (percentage based)
-                    multiplier = percent / 100
-                    df['AE_upper'] = df['AE_middle'] * (1 + multiplier)
-                    df['AE_lower'] = df['AE_middle'] * (1 - multiplier)
+                    df['AE_upper'] = indicator_frame.get(f'AE_upper_{period}_{percent}')
+                    df['AE_lower'] = indicator_frame.get(f'AE_lower_{period}_{percent}')
                     # Upper band
                     fig.add_trace(
                         go.Scatter(
@@ -2016,13 +2271,24 @@ def update_combined_chart(data, symbol, chart_type, show_ema, ema_periods, atr_b
             except Exception as e:
                 print(f"Error calculating Autoenvelope: {e}")
         
+        # Triple Screen: shade daily charts by the weekly Impulse (red: no longs, green: no shorts)
+        if triple_screen and not is_intraday and (frequency or '1d') == '1d':
+            try:
+                # Shapes are added in one layout update (add_vrect per band is slow on long histories)
+                bands = [dict(type='rect', xref='x', yref='y domain', x0=start, x1=end, y0=0, y1=1,
+                              fillcolor=TRIPLE_SCREEN_FILLS[code], line_width=0, layer='below')
+                         for start, end, code in _triple_screen_bands(df, symbol, timeframe)]
+                fig.update_layout(shapes=list(fig.layout.shapes) + bands)
+            except Exception as e:
+                print(f"Error drawing Triple Screen overlay: {e}")
+        
         # Add previous day's close line for intraday charts (Today or Previous Market Period)
         prev_close = None
         if is_intraday and len(df) > 0:
             # Get the official previous close from a 6-month timeframe (like shown in 6M+ views)
             try:
                 # Get 6-month daily data to ensure we get the official previous close price
-                monthly_data = yf.download(symbol, period="6mo", interval="1d", progress=False)
+                monthly_data = get_provider().history(symbol, period="6mo", interval="1d")
                 if not monthly_data.empty:
                     # Get yesterday's close or the last available close price
                     if len(monthly_data) >= 2:
@@ -2113,8 +2379,7 @@ def update_combined_chart(data, symbol, chart_type, show_ema, ema_periods, atr_b
             except Exception as e:
                 print(f"Error fetching previous close for {symbol}: {e}")
                 try:
-                    ticker = yf.Ticker(symbol)
-                    prev_close = ticker.info.get('previousClose')
+                    prev_close = get_provider().info(symbol).get('previousClose')
                     if prev_close and isinstance(prev_close, (int, float)):
                         prev_close = float(prev_close)
                         fig.add_trace(
@@ -3033,29 +3298,35 @@ def calculate_appropriate_period(base_period, timeframe, frequency=None):
     bars_needed = max(5, min(bars_needed, max_bars))
     return bars_needed
 
+def _mask_leading(df, col, period):
+    """Set the rows up to label period-1 of a column to NaN. The column is replaced rather than
+    written in place, since chart frames share their column buffers with the cached indicator frames."""
+    values = df[col].to_numpy(dtype=np.float64, copy=True)
+    values[:len(df.loc[:period-1])] = np.nan
+    df[col] = values
+
 def mask_unreliable_indicators(df, ema_periods, macd_slow=26, rsi_period=13, stoch_period=5, adx_period=13):
     """
     For intraday charts, mask the first N bars of each indicator (set to np.nan) where N is the lookback period.
     """
-    import numpy as np
     # EMA
     for period in ema_periods:
         col = f'EMA_{period}'
         if col in df.columns:
-            df.loc[:period-1, col] = np.nan
+            _mask_leading(df, col, period)
     # MACD (slow period is the main lookback)
     for col in ['MACD', 'MACD_signal', 'MACD_hist']:
         if col in df.columns:
-            df.loc[:macd_slow-1, col] = np.nan
+            _mask_leading(df, col, macd_slow)
     # RSI
     if 'RSI' in df.columns:
-        df.loc[:rsi_period-1, 'RSI'] = np.nan
+        _mask_leading(df, 'RSI', rsi_period)
     # Stochastic
     for col in ['Stoch_K', 'Stoch_D']:
         if col in df.columns:
-            df.loc[:stoch_period-1, col] = np.nan
+            _mask_leading(df, col, stoch_period)
     # ADX, DI+, DI-
     for col in ['ADX', 'DI_plus', 'DI_minus']:
         if col in df.columns:
-            df.loc[:adx_period-1, col] = np.nan
+            _mask_leading(df, col, adx_period)
     return df
\ No newline at end of file
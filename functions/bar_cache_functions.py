@@ -0,0 +1,185 @@
+"""
+In-Memory Bar Cache for the Stock Market Dashboard
+
+A thread-safe LRU cache for fetched bar frames. Entries are keyed on the full
+(symbol, period, frequency) tuple, expire after a per-entry TTL and are evicted
+least-recently-used first once the configured memory budget is exceeded.
+Expired entries are kept for up to max_stale seconds so callers can serve
+them while a refresh runs (stale-while-revalidate).
+Memory is measured from the DataFrames held in each entry.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+FINGERPRINT_TAIL_ROWS = 8  # Trailing rows hashed into a bar frame's fingerprint
+
+
+def estimate_nbytes(value):
+    """Estimate the memory held by a cached value (DataFrames inside tuples/lists/dicts are counted)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values())
+    return 64  # Small scalar/metadata objects
+
+
+def bars_fingerprint(df, tail_rows=FINGERPRINT_TAIL_ROWS):
+    """
+    Cheap identity of a bar frame for content-keyed caches.
+
+    Returns:
+        Tuple (row count, last Date, hash of the columns, the first row and the last tail_rows rows)
+    """
+    n = len(df)
+    positions = np.r_[0, max(1, n - tail_rows):n] if n else np.array([], dtype=np.int64)
+    digest = hashlib.sha1()
+    for col in df.columns:
+        values = df[col].to_numpy()[positions]
+        digest.update(str(col).encode())
+        digest.update(repr(values.tolist()).encode() if values.dtype == object else values.tobytes())
+    last_date = df['Date'].iloc[-1] if n and 'Date' in df.columns else None
+    return (n, last_date, digest.hexdigest())
+
+
+class BarCache:
+    """Memory-bounded LRU cache with per-entry TTL and hit/miss/eviction counters"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, default_ttl=60, ttl_func=None, max_stale=0):
+        """
+        Args:
+            max_bytes: Memory budget in bytes for all cached values
+            default_ttl: TTL in seconds used when neither put() nor ttl_func give one
+            ttl_func: Optional callable(key) -> TTL seconds, evaluated when an entry is stored
+            max_stale: Seconds an expired entry can still be served by get_stale()
+        """
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self.default_ttl = default_ttl
+        self.ttl_func = ttl_func
+        self._entries = OrderedDict()  # key -> (value, expires_at, nbytes)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    def get(self, key):
+        """Get a cached value, or None if missing or expired"""
+        return self._lookup(key, allow_stale=False)[0]
+
+    def get_stale(self, key):
+        """
+        Get a cached value even if it has expired less than max_stale seconds ago.
+
+        Returns:
+            Tuple (value, is_fresh); value is None if missing or too stale
+        """
+        return self._lookup(key, allow_stale=True)
+
+    def _lookup(self, key, allow_stale):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            value, expires_at, nbytes = entry
+            now = time.time()
+            if now >= expires_at + self.max_stale:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None, False
+            if now >= expires_at:
+                if not allow_stale:
+                    self.misses += 1
+                    return None, False
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                return value, False
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value, True
+
+    def put(self, key, value, ttl=None):
+        """Store a value, evicting least-recently-used entries to stay within the memory budget"""
+        if ttl is None:
+            ttl = self.ttl_func(key) if self.ttl_func else self.default_ttl
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if nbytes > self.max_bytes:
+                return  # Larger than the whole budget, never cache
+            self._entries[key] = (value, time.time() + ttl, nbytes)
+            self._bytes += nbytes
+            self._evict_to_budget()
+
+    def invalidate(self, key):
+        """Remove a single entry"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_where(self, predicate):
+        """Remove every entry whose key matches predicate(key)"""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._remove(key)
+
+    def clear(self):
+        """Remove all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def set_max_bytes(self, max_bytes):
+        """Change the memory budget, evicting entries if needed"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict_to_budget()
+
+    def stats(self):
+        """Get cache counters and current memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'stale_hits': self.stale_hits,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def _remove(self, key):
+        value, expires_at, nbytes = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    def _evict_to_budget(self):
+        while self._bytes > self.max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
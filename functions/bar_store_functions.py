@@ -0,0 +1,453 @@
+"""
+Persistent OHLCV Bar Store for the Stock Market Dashboard
+
+Keeps one Parquet file per symbol and interval on disk so that a restart or a
+new ticker view does not have to download years of history again. On refresh
+only the bars newer than the last stored timestamp are requested from the
+provider and appended to the stored frame.
+
+Weekly and monthly bars are not downloaded at all: they are resampled from the
+stored daily bars, so every multi-timeframe view shares one daily download.
+
+Layout:
+- bar_store/<interval>/<SYMBOL>.parquet  -> normalized bars (Date column, tz-naive)
+- bar_store/index.json                   -> per-file coverage and refresh metadata
+"""
+
+import os
+import re
+import json
+import tempfile
+import threading
+from datetime import datetime
+from urllib.parse import quote
+
+import pandas as pd
+
+from .provider_functions import get_provider
+from .market_calendar_functions import bars_may_have_changed
+
+try:
+    import pyarrow  # noqa: F401  (required by pandas for Parquet I/O)
+    STORE_AVAILABLE = True
+except ImportError:
+    STORE_AVAILABLE = False
+
+BAR_STORE_DIR = 'bar_store'
+INDEX_FILE = os.path.join(BAR_STORE_DIR, 'index.json')
+BATCH_SIZE = 50  # Symbols per multi-ticker download request
+
+# Intervals derived locally from daily bars -> pandas resample rule
+# (weeks start on Monday and months on the 1st, matching the labels yfinance uses)
+RESAMPLED_INTERVALS = {
+    '1wk': 'W-MON',
+    '1mo': 'MS'
+}
+
+_index_lock = threading.Lock()
+_file_locks = {}  # (symbol, interval) -> lock serializing the writers of one Parquet file
+_file_locks_lock = threading.Lock()
+
+
+def _store_path(symbol, interval):
+    """Get the Parquet file path for a symbol/interval pair"""
+    return os.path.join(BAR_STORE_DIR, interval, f"{quote(symbol, safe='')}.parquet")
+
+
+def _file_lock(symbol, interval):
+    """Lock of one symbol/interval file (created on first use)"""
+    with _file_locks_lock:
+        return _file_locks.setdefault((symbol, interval), threading.Lock())
+
+
+def _index_key(symbol, interval):
+    return f"{symbol}|{interval}"
+
+
+def _load_index():
+    """Load the store index (coverage metadata) from disk"""
+    if not os.path.exists(INDEX_FILE):
+        return {}
+    try:
+        with open(INDEX_FILE, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _update_index(symbol, interval, **fields):
+    """Update the index entry for a symbol/interval pair (atomic write)"""
+    with _index_lock:
+        index = _load_index()
+        entry = index.get(_index_key(symbol, interval), {})
+        entry.update(fields)
+        index[_index_key(symbol, interval)] = entry
+        os.makedirs(BAR_STORE_DIR, exist_ok=True)
+        tmp_file = f"{INDEX_FILE}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_file, INDEX_FILE)
+
+
+def period_start(period, now=None):
+    """
+    Calculate the first date covered by a yfinance period string.
+
+    Args:
+        period: yfinance period like '6mo', '2y', '30d', 'ytd' or 'max'
+        now: Reference timestamp (defaults to now)
+
+    Returns:
+        Naive pd.Timestamp at midnight, or None for 'max'
+    """
+    now = pd.Timestamp(now or datetime.now()).normalize()
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(now.year, 1, 1)
+    match = re.match(r'^(\d+)(d|wk|mo|y)$', period or '')
+    if not match:
+        return None
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == 'd':
+        return now - pd.DateOffset(days=amount)
+    if unit == 'wk':
+        return now - pd.DateOffset(weeks=amount)
+    if unit == 'mo':
+        return now - pd.DateOffset(months=amount)
+    return now - pd.DateOffset(years=amount)
+
+
+def normalize_history(data, tz=None):
+    """
+    Convert a raw yfinance history frame into the stored shape:
+    a 'Date' column (tz-naive, exchange local time unless tz is given) followed by the OHLCV columns.
+    """
+    if data is None or data.empty:
+        return pd.DataFrame()
+    data = data.reset_index()
+    if 'Datetime' in data.columns:
+        data = data.rename(columns={'Datetime': 'Date'})
+    if 'Date' not in data.columns:
+        data = data.rename(columns={data.columns[0]: 'Date'})
+    dates = pd.to_datetime(data['Date'])
+    if tz is not None and dates.dt.tz is not None:
+        dates = dates.dt.tz_convert(tz)
+    data['Date'] = dates.dt.tz_localize(None)
+    return data
+
+
+def load_bars(symbol, interval):
+    """Load stored bars for a symbol/interval (empty DataFrame if none)"""
+    path = _store_path(symbol, interval)
+    if not STORE_AVAILABLE or not os.path.exists(path):
+        return pd.DataFrame()
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        print(f"Error reading bar store for {symbol} ({interval}): {e}")
+        return pd.DataFrame()
+
+
+def save_bars(symbol, interval, data, covered_from=None):
+    """Write the full bar frame for a symbol/interval and update the index"""
+    if not STORE_AVAILABLE or data is None or data.empty:
+        return
+    path = _store_path(symbol, interval)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One writer per file at a time, each with its own temp file, so a refresh of the same
+        # symbol from another view can neither fail the rename nor publish a half-written file
+        # (the index entry is updated under the same lock, so it describes the file on disk)
+        with _file_lock(symbol, interval):
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            os.close(fd)
+            try:
+                data.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            fields = {
+                'last_refresh': datetime.now().astimezone().isoformat(),
+                'last_bar': data['Date'].max().isoformat(),
+                'rows': int(len(data))
+            }
+            if covered_from is not None:
+                fields['covered_from'] = covered_from
+            _update_index(symbol, interval, **fields)
+    except Exception as e:
+        print(f"Error writing bar store for {symbol} ({interval}): {e}")
+
+
+def append_bars(stored, new_bars):
+    """
+    Append freshly fetched bars to the stored frame.
+
+    Stored bars at or after the first new timestamp are replaced, so the last
+    (possibly still forming) bar is always revised with the provider's latest values.
+    """
+    if new_bars is None or new_bars.empty:
+        return stored
+    if stored is None or stored.empty:
+        return new_bars.reset_index(drop=True)
+    first_new = new_bars['Date'].min()
+    kept = stored[stored['Date'] < first_new]
+    return pd.concat([kept, new_bars], ignore_index=True)
+
+
+def _combine_splits(splits):
+    """Combine split ratios within one bar (0 means no split)"""
+    ratios = splits[splits != 0]
+    return ratios.prod() if not ratios.empty else 0.0
+
+
+def resample_bars(daily, interval):
+    """
+    Build weekly ('1wk') or monthly ('1mo') OHLCV bars from daily bars.
+
+    Weekly bars are labeled with the Monday of their week and monthly bars with
+    the 1st of the month, even when that day was a holiday. The current week or
+    month is returned as a partial bar covering the sessions traded so far.
+
+    Args:
+        daily: DataFrame with a 'Date' column and daily OHLCV columns
+        interval: '1wk' or '1mo'
+
+    Returns:
+        DataFrame with a 'Date' column, one row per week/month with at least one session
+    """
+    if daily is None or daily.empty:
+        return pd.DataFrame()
+    rule = RESAMPLED_INTERVALS[interval]
+    agg = {}
+    for col in daily.columns:
+        if col == 'Date':
+            continue
+        if col == 'Open':
+            agg[col] = 'first'
+        elif col == 'High':
+            agg[col] = 'max'
+        elif col == 'Low':
+            agg[col] = 'min'
+        elif col == 'Close':
+            agg[col] = 'last'
+        elif col == 'Stock Splits':
+            agg[col] = _combine_splits
+        elif pd.api.types.is_numeric_dtype(daily[col]):
+            agg[col] = 'sum'  # Volume, Dividends, Capital Gains
+    bars = daily.set_index('Date').sort_index()
+    if rule == 'MS':
+        resampled = bars.resample(rule).agg(agg)
+    else:
+        resampled = bars.resample(rule, label='left', closed='left').agg(agg)
+    resampled = resampled.dropna(subset=['Open'])  # Weeks/months without sessions
+    return resampled.reset_index()
+
+
+def _drop_partial_first_bar(bars, period):
+    """Drop the first resampled bar when the period start cuts it in half"""
+    start = period_start(period)
+    if bars.empty or start is None or len(bars) < 2:
+        return bars
+    if bars['Date'].iloc[0] < start:
+        return bars.iloc[1:].reset_index(drop=True)
+    return bars
+
+
+def _is_covered(entry, period):
+    """Check whether the stored history reaches back far enough for a period"""
+    covered_from = entry.get('covered_from')
+    if covered_from is None:
+        return False
+    if covered_from == 'max':
+        return True
+    start = period_start(period)
+    return start is not None and pd.Timestamp(covered_from) <= start
+
+
+def _has_corporate_actions(bars):
+    """Check for dividend or split rows in a bar frame"""
+    for col in ['Dividends', 'Stock Splits']:
+        if col in bars.columns and (bars[col].fillna(0) != 0).any():
+            return True
+    return False
+
+
+def _needs_readjustment(stored, new_bars, last_bar):
+    """
+    Dividends and splits re-adjust the whole history, so a delta containing a
+    corporate action we have not stored yet cannot simply be appended.
+    """
+    if new_bars.empty:
+        return False
+    fresh = new_bars[new_bars['Date'] >= last_bar]
+    known = stored[stored['Date'] >= last_bar]
+    return _has_corporate_actions(fresh) and not _has_corporate_actions(known)
+
+
+def _store_full(symbol, interval, period, data):
+    """Persist a full-period download as the new stored frame"""
+    if not data.empty:
+        start = period_start(period)
+        save_bars(symbol, interval, data, covered_from='max' if start is None else start.isoformat())
+    return data
+
+
+def _fetch_full(symbol, interval, period, timeout):
+    """Download the full period and replace the stored frame"""
+    data = normalize_history(get_provider().history(symbol, period=period, interval=interval, timeout=timeout))
+    return _store_full(symbol, interval, period, data)
+
+
+def _merge_delta(symbol, interval, period, stored, new_bars, timeout):
+    """Append a delta download to the stored frame (or re-download if history was re-adjusted)"""
+    if _needs_readjustment(stored, new_bars, stored['Date'].max()):
+        return _fetch_full(symbol, interval, period, timeout)
+    data = append_bars(stored, new_bars)
+    if not new_bars.empty:
+        save_bars(symbol, interval, data)
+    return data
+
+
+def _trim_to_period(data, period):
+    """Trim a stored frame to the bars covered by the requested period"""
+    start = period_start(period)
+    if start is not None and not data.empty:
+        data = data[data['Date'] >= start].reset_index(drop=True)
+    return data
+
+
+def _load_covered(symbol, interval, period, index=None):
+    """Load the stored frame if it covers the requested period (empty DataFrame otherwise)"""
+    index = _load_index() if index is None else index
+    entry = index.get(_index_key(symbol, interval), {})
+    return load_bars(symbol, interval) if _is_covered(entry, period) else pd.DataFrame()
+
+
+def _is_current(symbol, interval, index):
+    """Check whether stored bars are final: refreshed after the last session settled, market closed since"""
+    entry = index.get(_index_key(symbol, interval), {})
+    return not bars_may_have_changed(symbol, entry.get('last_refresh'))
+
+
+def refresh_bars(symbol, interval='1d', period='1y', timeout=2):
+    """
+    Get bars for a symbol/interval covering the requested period, refreshing the store.
+
+    If the store already covers the period only the bars since the last stored
+    timestamp are requested (one small delta request), and no request is made at
+    all while the exchange has been closed since the last refresh. Otherwise the
+    full period is downloaded once and persisted.
+
+    Weekly and monthly intervals are resampled from the daily bars.
+
+    Returns:
+        DataFrame with a 'Date' column, trimmed to the requested period
+    """
+    if interval in RESAMPLED_INTERVALS:
+        daily = refresh_bars(symbol, '1d', period, timeout=timeout)
+        return _drop_partial_first_bar(resample_bars(daily, interval), period)
+
+    if not STORE_AVAILABLE:
+        return normalize_history(get_provider().history(symbol, period=period, interval=interval, timeout=timeout))
+
+    index = _load_index()
+    stored = _load_covered(symbol, interval, period, index)
+    if stored.empty:
+        data = _fetch_full(symbol, interval, period, timeout)
+    elif _is_current(symbol, interval, index):
+        data = stored  # No session since the last refresh, nothing can have changed
+    else:
+        last_bar = stored['Date'].max()
+        new_bars = normalize_history(
+            get_provider().history(symbol, start=last_bar.strftime('%Y-%m-%d'), interval=interval, timeout=timeout)
+        )
+        data = _merge_delta(symbol, interval, period, stored, new_bars, timeout)
+    return _trim_to_period(data, period)
+
+
+def _split_download(raw, symbols):
+    """Split a provider download (one column group per ticker) into per-symbol normalized frames"""
+    frames = {}
+    if raw is None or raw.empty:
+        return frames
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # Single ticker downloads may come back without the ticker column level
+        if len(symbols) == 1:
+            frames[symbols[0]] = normalize_history(raw.dropna(how='all'))
+        return frames
+    available = set(raw.columns.get_level_values(0))
+    for symbol in symbols:
+        if symbol in available:
+            frames[symbol] = normalize_history(raw[symbol].dropna(how='all'))
+    return frames
+
+
+def _download_many(symbols, interval, timeout, **kwargs):
+    """Download several tickers in multi-ticker requests of BATCH_SIZE symbols"""
+    frames = {}
+    for i in range(0, len(symbols), BATCH_SIZE):
+        chunk = symbols[i:i + BATCH_SIZE]
+        try:
+            raw = get_provider().download(chunk, interval=interval, timeout=timeout, **kwargs)
+            frames.update(_split_download(raw, chunk))
+        except Exception as e:
+            print(f"Error downloading batch of {len(chunk)} symbols: {e}")
+    return frames
+
+
+def refresh_bars_many(symbols, interval='1d', period='1y', timeout=10):
+    """
+    Batched version of refresh_bars for a list of symbols.
+
+    Symbols without stored coverage are downloaded with multi-ticker full-period
+    requests; stored symbols are grouped by their last stored date and refreshed
+    with one multi-ticker delta request per group.
+
+    Returns:
+        Dictionary symbol -> DataFrame (empty DataFrame if no data was returned)
+    """
+    symbols = list(dict.fromkeys(symbols))
+    results = {}
+    if interval in RESAMPLED_INTERVALS:
+        daily_frames = refresh_bars_many(symbols, '1d', period, timeout=timeout)
+        return {
+            symbol: _drop_partial_first_bar(resample_bars(daily, interval), period)
+            for symbol, daily in daily_frames.items()
+        }
+
+    if not STORE_AVAILABLE:
+        frames = _download_many(symbols, interval, timeout, period=period)
+        return {symbol: frames.get(symbol, pd.DataFrame()) for symbol in symbols}
+
+    index = _load_index()
+    stored_frames = {}
+    delta_groups = {}
+    missing = []
+    for symbol in symbols:
+        stored = _load_covered(symbol, interval, period, index)
+        if stored.empty:
+            missing.append(symbol)
+        elif _is_current(symbol, interval, index):
+            results[symbol] = stored
+        else:
+            stored_frames[symbol] = stored
+            delta_groups.setdefault(stored['Date'].max().strftime('%Y-%m-%d'), []).append(symbol)
+
+    if missing:
+        frames = _download_many(missing, interval, timeout, period=period)
+        for symbol in missing:
+            results[symbol] = _store_full(symbol, interval, period, frames.get(symbol, pd.DataFrame()))
+
+    for start, group in delta_groups.items():
+        frames = _download_many(group, interval, timeout, start=start)
+        for symbol in group:
+            try:
+                new_bars = frames.get(symbol, pd.DataFrame())
+                results[symbol] = _merge_delta(symbol, interval, period, stored_frames[symbol], new_bars, timeout)
+            except Exception as e:
+                print(f"Error refreshing stored bars for {symbol}: {e}")
+                results[symbol] = stored_frames[symbol]
+
+    return {symbol: _trim_to_period(results.get(symbol, pd.DataFrame()), period) for symbol in symbols}
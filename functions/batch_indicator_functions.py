@@ -0,0 +1,164 @@
+"""
+Cross-Sectional Indicators for the Stock Market Dashboard
+
+The scanner needs the same handful of indicators (EMAs, MACD, RSI, ATR and the
+Impulse colour) for hundreds of symbols. Instead of one calculate_indicators call
+per symbol, the universe is stacked into symbols x bars matrices and every
+indicator is computed for all symbols at once along the time axis.
+
+Rows are aligned on each symbol's latest bar (shorter histories are NaN-padded
+on the left), so symbols from exchanges with different holidays never get gaps
+inside their series. Values match calculate_indicators for the same bars.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .indicator_engine_functions import decay_scan
+
+BATCH_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+BATCH_MIN_BARS = 26  # Shorter series use calculate_indicators' fallback values for EMA_26/MACD
+IMPULSE_COLORS = {1: 'green', -1: 'red', 0: 'blue'}
+
+
+def align_bars(frames, min_bars=BATCH_MIN_BARS):
+    """
+    Stack per-symbol bar frames into right-aligned matrices.
+
+    Args:
+        frames: {symbol: DataFrame with Date and OHLCV columns}
+        min_bars: Frames with fewer bars are not stacked
+
+    Returns:
+        Dictionary with 'symbols', 'frames', 'start' (first valid column per row),
+        'skipped' (symbols left out: too short, empty or non-finite values) and
+        one (symbols x bars) float matrix per OHLCV column
+    """
+    symbols, skipped, values = [], [], []
+    for symbol, frame in frames.items():
+        if not isinstance(frame, pd.DataFrame) or len(frame) < min_bars or \
+                not all(col in frame.columns for col in BATCH_COLUMNS):
+            skipped.append(symbol)
+            continue
+        bars = frame[BATCH_COLUMNS].to_numpy(dtype=np.float64)
+        if not np.isfinite(bars).all():
+            skipped.append(symbol)
+            continue
+        symbols.append(symbol)
+        values.append(bars)
+
+    width = max((len(bars) for bars in values), default=0)
+    stacked = np.full((len(BATCH_COLUMNS), len(symbols), width), np.nan)
+    for row, bars in enumerate(values):
+        stacked[:, row, width - len(bars):] = bars.T
+    aligned = {
+        'symbols': symbols,
+        'frames': {symbol: frames[symbol] for symbol in symbols},
+        'start': np.array([width - len(bars) for bars in values], dtype=np.int64),
+        'skipped': skipped
+    }
+    for i, col in enumerate(BATCH_COLUMNS):
+        aligned[col] = stacked[i]
+    return aligned
+
+
+def _ewm_rows(x, alpha, min_periods, start):
+    """ewm(alpha, adjust=False, min_periods).mean() of every row, each starting at its own column"""
+    rows = np.arange(x.shape[0])
+    cols = np.arange(x.shape[1])
+    seq = np.where(cols >= start[:, None], alpha * x, 0.0)
+    seq[rows, start] = x[rows, start]
+    out = decay_scan(seq, 1.0 - alpha)
+    out[cols < (start + min_periods - 1)[:, None]] = np.nan
+    return out
+
+
+def _shift_rows(x):
+    out = np.empty_like(x)
+    out[:, 0] = np.nan
+    out[:, 1:] = x[:, :-1]
+    return out
+
+
+def _bfill_rows(x):
+    """Backward fill NaNs along each row"""
+    width = x.shape[1]
+    idx = np.where(~np.isnan(x), np.arange(width), width)
+    idx = np.minimum.accumulate(idx[:, ::-1], axis=1)[:, ::-1]
+    filled = np.take_along_axis(x, np.minimum(idx, width - 1), axis=1)
+    return np.where(idx < width, filled, x)
+
+
+def batch_indicators(aligned, ema_periods=[13, 26], macd_fast=12, macd_slow=26, macd_signal=9, rsi_period=13, impulse_ema=13):
+    """
+    Calculate the scanner indicators for every row of aligned matrices.
+
+    Returns:
+        Dictionary of (symbols x bars) matrices: EMA_<p>, MACD, MACD_signal,
+        MACD_hist, RSI, ATR and 'impulse' (int8 codes: 1 green, -1 red, 0 blue)
+    """
+    close, high, low = aligned['Close'], aligned['High'], aligned['Low']
+    start = aligned['start']
+    cols = np.arange(close.shape[1])
+    before = lambda offset: cols < (start + offset)[:, None]
+    result = {}
+    if close.size == 0:
+        return result
+
+    # EMAs (leading values are 0 after calculate_indicators' ffill/fillna)
+    for period in ema_periods:
+        ema = _ewm_rows(close, 2.0 / (period + 1), period, start)
+        ema[before(period - 1)] = 0.0
+        result[f'EMA_{period}'] = ema
+
+    # MACD, signal and histogram (leading values back-filled as in ta)
+    macd = _ewm_rows(close, 2.0 / (macd_fast + 1), macd_fast, start) - \
+        _ewm_rows(close, 2.0 / (macd_slow + 1), macd_slow, start)
+    signal = _ewm_rows(macd, 2.0 / (macd_signal + 1), macd_signal, start + max(macd_fast, macd_slow) - 1)
+    for col, values in [('MACD', macd), ('MACD_signal', signal), ('MACD_hist', macd - signal)]:
+        values = _bfill_rows(values)
+        result[col] = np.where(np.isnan(values), 0.0, values)  # Signal never valid on short rows
+
+    # RSI (Wilder smoothing)
+    rsi_period = max(1, min(rsi_period, 50))
+    diff = close - _shift_rows(close)
+    ema_up = _ewm_rows(np.where(diff > 0, diff, 0.0), 1.0 / rsi_period, rsi_period, start)
+    ema_down = _ewm_rows(np.where(diff < 0, -diff, 0.0), 1.0 / rsi_period, rsi_period, start)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(ema_down == 0, 100.0, 100 - (100 / (1 + ema_up / ema_down)))
+    rsi[np.isnan(ema_up) | np.isnan(ema_down)] = np.nan
+    result['RSI'] = _bfill_rows(rsi)
+
+    # ATR (14-bar Wilder average of the true range, zeros during warmup)
+    close_shift = _shift_rows(close)
+    true_range = np.fmax(np.fmax(high - low, np.abs(high - close_shift)), np.abs(low - close_shift))
+    true_range = np.where(before(0), 0.0, true_range)
+    rows = np.arange(close.shape[0])
+    seq = np.where(before(14), 0.0, true_range / 14)
+    seq[rows, start + 13] = np.cumsum(true_range, axis=1)[rows, start + 13] / 14
+    atr = decay_scan(seq, 13 / 14)
+    atr[before(13)] = 0.0
+    result['ATR'] = atr
+
+    # Impulse System: EMA slope and MACD-Histogram change agree
+    impulse_col = f'EMA_{impulse_ema}'
+    if impulse_col in result:
+        slope = np.diff(result[impulse_col], axis=1, prepend=np.nan)
+        hist_change = np.diff(result['MACD_hist'], axis=1, prepend=np.nan)
+        slope[before(1)] = np.nan
+        impulse = np.where((slope > 0) & (hist_change > 0), 1, np.where((slope < 0) & (hist_change < 0), -1, 0))
+        result['impulse'] = impulse.astype(np.int8)
+    return result
+
+
+def batch_frames(aligned, indicators):
+    """Per-symbol frames (original bars plus the batch indicator columns, with 'impulse' as int8 codes)"""
+    frames = {}
+    for row, symbol in enumerate(aligned['symbols']):
+        start = aligned['start'][row]
+        bars = aligned['frames'][symbol]
+        data = {col: bars[col].to_numpy() for col in bars.columns}
+        for col, matrix in indicators.items():
+            data[col] = matrix[row, start:]
+        frames[symbol] = pd.DataFrame(data, index=bars.index)
+    return frames
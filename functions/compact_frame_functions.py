@@ -0,0 +1,82 @@
+"""
+Compact Frames for the Stock Market Dashboard
+
+Bar and indicator frames held in the in-memory caches use a compact layout:
+- only Date and OHLCV are kept from the provider columns (Dividends and Stock
+  Splits are only needed inside the bar store and are dropped at ingest)
+- prices and indicator values are float32, Volume int32 (kept as int64 when a
+  value does not fit)
+- enum columns such as impulse_color are categoricals with 1-byte codes
+
+Precision: float32 keeps 24 significant bits, so a stored value is within
+2^-24 (6e-8) relative of its float64 value, well below a hundredth of a cent for
+prices under $10,000. Indicators are still calculated in float64 (from the
+float32 bars) and agree with the full float64 pipeline to ~1e-5 of their scale.
+The cumulative A/D Line and OBV are the exception: a bar whose close-location
+(or close-to-close change) is within float32 resolution of zero can count with
+a different sign, and the cumulative sum keeps the offset (up to a few percent
+of the OBV scale on synthetic data, where such near-ties are far more common
+than in cent-quoted prices). set_compact_frames(False) restores float64 frames;
+benchmark_memory.py measures the differences and the memory saved.
+"""
+
+import numpy as np
+import pandas as pd
+
+BAR_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+ENUM_COLUMNS = {'impulse_color': ['red', 'blue', 'green']}
+STORE_SIGNIFICANT_DIGITS = 7  # float32 resolution; more digits in dcc.Store JSON would only be noise
+
+
+def compact_bars(df):
+    """Date and OHLCV columns of a bars frame in the compact layout (see compact_frame)"""
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return df
+    return compact_frame(df[[col for col in BAR_COLUMNS if col in df.columns]])
+
+
+def compact_frame(df):
+    """
+    Copy of a frame with float64 columns as float32, Volume as int32 and enum columns as categoricals.
+
+    Args:
+        df: Bars or indicator DataFrame
+
+    Returns:
+        DataFrame with the same columns and index
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col == 'Volume' and pd.api.types.is_numeric_dtype(series) and len(series) and \
+                series.min() >= 0 and series.max() < 2 ** 31 and (series % 1 == 0).all():
+            # Signed, so volume differences and negated volumes (OBV, Force Index) cannot wrap around
+            columns[col] = series.to_numpy(dtype=np.int32)
+        elif series.dtype == np.float64:
+            columns[col] = series.to_numpy(dtype=np.float32)
+        elif col in ENUM_COLUMNS and series.dtype == object:
+            columns[col] = pd.Categorical(series, categories=ENUM_COLUMNS[col])
+        else:
+            columns[col] = series.to_numpy(copy=True)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def expand_frame(df):
+    """Copy of a compact frame with float32 columns as float64 (the dtypes calculate_indicators returns)"""
+    return df.astype({col: np.float64 for col in df.columns if df[col].dtype == np.float32})
+
+
+def store_records(df):
+    """
+    df.to_dict('records') for a dcc.Store. float32 columns are rounded to
+    STORE_SIGNIFICANT_DIGITS so the JSON carries e.g. 187.42 instead of 187.4199981689453.
+    """
+    rounded = {}
+    for col in df.columns:
+        if df[col].dtype != np.float32:
+            continue
+        values = df[col].to_numpy(dtype=np.float64)
+        finite = np.abs(values[np.isfinite(values)])
+        scale = int(np.ceil(np.log10(finite.max()))) if len(finite) and finite.max() > 0 else 0
+        rounded[col] = np.round(values, max(0, STORE_SIGNIFICANT_DIGITS - scale))
+    return (df.assign(**rounded) if rounded else df).to_dict('records')
@@ -10,57 +10,87 @@ Color signals:
 - Green: EMA rising + MACD-Histogram rising (especially below zero)
 - Red: EMA falling + MACD-Histogram falling (especially below zero)
 - Blue: All other conditions
+
+Colours are int8 codes (1 green, 0 blue, -1 red, see IMPULSE_COLORS). Consumers
+read the code array, or its run-length encoded colour segments, instead of
+comparing colour strings per bar.
 """
 
 import pandas as pd
 import numpy as np
 
-def calculate_impulse_system(df, ema_period=13):
+from .indicator_graph_functions import IndicatorFrame, indicator_name, MACD_DEFAULTS
+from .batch_indicator_functions import IMPULSE_COLORS
+
+def impulse_node(ema_period=13, macd=None):
+    """Indicator graph node of the Impulse codes for an EMA period and (fast, slow, signal) MACD settings"""
+    return indicator_name('impulse', (ema_period,) + tuple(macd or MACD_DEFAULTS))
+
+def calculate_impulse_codes(df, ema_period=13, macd=None):
+    """
+    Impulse System codes of every bar.
+
+    Parameters:
+    - df: DataFrame with OHLC data and indicators (must have EMA_{ema_period} and MACD_hist columns)
+    - ema_period: The EMA period to use for trend direction (default: 13)
+    - macd: (fast, slow, signal) the MACD columns were calculated with. The codes are the Impulse
+      node of these settings, which reuses the frame's MACD_hist (and its 'impulse' codes for
+      EMA 13); without it the MACD columns are not trusted and the 12/26/9 codes are computed
+      from the bars
+
+    Returns:
+    - int8 array: 1 green, -1 red, 0 blue (all blue if the indicators are missing)
+    """
+    if f'EMA_{ema_period}' not in df.columns or 'MACD_hist' not in df.columns:
+        return np.zeros(len(df), dtype=np.int8)
+    return IndicatorFrame(df, macd).get(impulse_node(ema_period, macd)).astype(np.int8)
+
+def impulse_segments(codes):
+    """
+    Run-length encode Impulse codes into colour segments.
+
+    Returns:
+    - Dictionary of equal-length arrays: 'code' (int8), 'start' and 'end' (row positions, end exclusive)
+    """
+    codes = np.asarray(codes, dtype=np.int8)
+    changes = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    starts = np.concatenate(([0], changes)) if len(codes) else np.zeros(0, dtype=np.int64)
+    ends = np.concatenate((changes, [len(codes)])) if len(codes) else np.zeros(0, dtype=np.int64)
+    return {'code': codes[starts], 'start': starts, 'end': ends}
+
+def segment_rows(segments, code):
+    """Row positions covered by the segments of one Impulse code (in row order)"""
+    mask = segments['code'] == code
+    starts, lengths = segments['start'][mask], segments['end'][mask] - segments['start'][mask]
+    if len(lengths) == 0:
+        return np.zeros(0, dtype=np.int64)
+    # Each row is its segment's start plus its offset within the segment
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets
+
+def impulse_color_names(codes):
+    """Colour names ('green', 'red', 'blue') of Impulse codes as a categorical"""
+    names = [IMPULSE_COLORS[-1], IMPULSE_COLORS[0], IMPULSE_COLORS[1]]
+    return pd.Categorical.from_codes(np.asarray(codes, dtype=np.int8) + 1, categories=names)
+
+def calculate_impulse_system(df, ema_period=13, macd=None):
     """
     Calculate Impulse System signals based on EMA trend and MACD Histogram momentum
     
     Parameters:
     - df: DataFrame with OHLC data and indicators (must have EMA_{ema_period} and MACD_hist columns)
     - ema_period: The EMA period to use for trend direction (default: 13)
+    - macd: (fast, slow, signal) the MACD columns were calculated with (see calculate_impulse_codes)
     
     Returns:
     - DataFrame with added 'impulse_color' column containing 'green', 'red', or 'blue'
     """
     try:
-        df = df.copy()
-        
-        # Check if we have the required indicators
-        ema_col = f'EMA_{ema_period}'
-        if ema_col not in df.columns or 'MACD_hist' not in df.columns:
-            # Default to 'blue' if indicators are missing
-            df['impulse_color'] = 'blue'
-            return df
-        
-        # Calculate EMA slope (trend direction)
-        df['ema_slope'] = df[ema_col].diff()
-        
-        # Calculate MACD Histogram change (momentum)
-        df['macd_hist_change'] = df['MACD_hist'].diff()
-        
-        # Initialize the impulse color column with default 'blue'
-        df['impulse_color'] = 'blue'
-        
-        # Green: EMA rising + MACD-Histogram rising (especially below zero)
-        green_condition = (df['ema_slope'] > 0) & (df['macd_hist_change'] > 0)
-        # Additional emphasis if MACD-Histogram is below zero (stronger signal)
-        strong_green_condition = green_condition & (df['MACD_hist'] < 0)
-        
-        # Red: EMA falling + MACD-Histogram falling (especially below zero)
-        red_condition = (df['ema_slope'] < 0) & (df['macd_hist_change'] < 0)
-        # Additional emphasis if MACD-Histogram is below zero (stronger signal)
-        strong_red_condition = red_condition & (df['MACD_hist'] < 0)
-        
-        # Apply the conditions to set the colors
-        df.loc[green_condition | strong_green_condition, 'impulse_color'] = 'green'
-        df.loc[red_condition | strong_red_condition, 'impulse_color'] = 'red'
+        df = df.copy(deep=False)
         
-        # Clean up temporary columns
-        df = df.drop(['ema_slope', 'macd_hist_change'], axis=1)
+        # EMA slope (trend) and MACD-Histogram change (momentum): green when both rise, red when
+        # both fall, blue otherwise (and blue if the indicators are missing)
+        df['impulse_color'] = impulse_color_names(calculate_impulse_codes(df, ema_period, macd))
         
         return df
     
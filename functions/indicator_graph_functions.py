@@ -0,0 +1,297 @@
+"""
+Indicator Dependency Graph for the Stock Market Dashboard
+
+Derived series (Impulse colours, Bollinger Bands, Autoenvelope, EMA slopes, the
+Apgar value line) are registered as nodes of a dependency graph: each node names
+the nodes it is computed from, e.g. impulse_color <- impulse <- EMA_slope_13 +
+MACD_hist_change, and BB_upper_26_2 <- SMA_26 + STD_26.
+
+Node names follow the column names of calculate_indicators, with parameters as
+underscore-separated suffixes ('EMA_13', 'MACD_hist_5_35_5', 'BB_upper_20_2').
+Trailing parameters can be left out when they equal the defaults, so 'MACD_hist'
+is MACD_hist_12_26_9 and 'impulse_color' is impulse_color_13_12_26_9.
+
+An IndicatorFrame evaluates requested nodes over one bars frame. Every node is
+computed at most once per frame, and indicator columns that are already in the
+frame (e.g. EMA_13 and MACD_hist from calculate_indicators) are used as they are,
+so the chart, scanner and Apgar paths share intermediates instead of rebuilding them.
+Columns such as 'MACD_hist' do not name their MACD settings, so they are only
+reused when the frame is told which settings calculate_indicators was given.
+"""
+
+import inspect
+
+import numpy as np
+import pandas as pd
+
+from .indicator_engine_functions import _ewm, _bfill, _ffill_zero
+from .batch_indicator_functions import IMPULSE_COLORS
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# kind -> {'inputs': params -> node names, 'compute': (*input values, *params) -> array,
+#          'arity': number of parameters, 'defaults': all parameters or (),
+#          'macd': position of the MACD parameters or None}
+INDICATOR_GRAPH = {}
+
+
+def register_indicator(kind, inputs, compute, defaults=(), macd=None):
+    """
+    Add a node kind to the indicator graph.
+
+    Args:
+        kind: Node name without parameters (e.g. 'SMA')
+        inputs: Function of the parameters returning the names of the input nodes
+        compute: Function of the input values followed by the parameters returning the node values
+        defaults: Default values of all parameters (trailing ones may then be omitted from node names)
+        macd: Position of the first MACD parameter (fast, slow[, signal]) for nodes built on the MACD
+    """
+    INDICATOR_GRAPH[kind] = {'inputs': inputs, 'compute': compute, 'defaults': tuple(defaults),
+                             'arity': len(inspect.signature(inputs).parameters), 'macd': macd}
+
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def parse_indicator(name):
+    """
+    Split a node name into its kind and full parameter tuple.
+
+    Returns:
+        (kind, params), e.g. ('MACD_hist', (12, 26, 9)) for 'MACD_hist'
+
+    Raises:
+        ValueError: Unknown node or missing parameters
+    """
+    if name in BAR_COLUMNS:
+        return name, ()
+    for kind in sorted(INDICATOR_GRAPH, key=len, reverse=True):
+        if name != kind and not name.startswith(kind + '_'):
+            continue
+        try:
+            params = tuple(_number(p) for p in name[len(kind) + 1:].split('_')) if name != kind else ()
+        except ValueError:
+            continue  # e.g. 'EMA_slope_13' is not an 'EMA' node
+        spec = INDICATOR_GRAPH[kind]
+        if len(params) > spec['arity']:
+            continue
+        if len(params) < spec['arity']:
+            if not spec['defaults']:
+                raise ValueError(f"Indicator {name} needs {spec['arity']} parameter(s)")
+            params = params + spec['defaults'][len(params):]
+        return kind, params
+    raise ValueError(f"Unknown indicator: {name}")
+
+
+def indicator_name(kind, params=()):
+    """Canonical node name (trailing default parameters dropped)"""
+    params = list(params)
+    defaults = INDICATOR_GRAPH.get(kind, {}).get('defaults', ())
+    while params and len(params) <= len(defaults) and params[-1] == defaults[len(params) - 1]:
+        params.pop()
+    return '_'.join([kind] + [str(_number(p)) for p in params])
+
+
+def canonical_indicator(name):
+    """Canonical form of a node name ('MACD_hist_12_26_9' -> 'MACD_hist')"""
+    return indicator_name(*parse_indicator(name))
+
+
+def column_indicator(column, macd=None):
+    """
+    Canonical node of an indicator column. Columns that leave out MACD parameters
+    ('MACD_hist', 'impulse') hold calculate_indicators' MACD settings, not the defaults.
+
+    Args:
+        column: Column name
+        macd: (fast, slow, signal) the frame's MACD columns were calculated with
+
+    Returns:
+        Canonical node name, or None if the column is no node or its MACD settings are unknown
+    """
+    try:
+        kind, params = parse_indicator(column)
+    except ValueError:
+        return None
+    spec = INDICATOR_GRAPH.get(kind)
+    given = len(column.split('_')) - len(kind.split('_'))
+    if spec is None or spec['macd'] is None or given >= spec['arity']:
+        return indicator_name(kind, params)
+    if macd is None:
+        return None
+    start = spec['macd']
+    params = params[:max(given, start)] + tuple(macd)[max(given - start, 0):spec['arity'] - start]
+    return indicator_name(kind, params)
+
+
+def resolve_plan(outputs, available=()):
+    """
+    Minimal evaluation plan for a set of outputs.
+
+    Args:
+        outputs: Node names to produce
+        available: Canonical names of nodes that need no computing (e.g. existing columns)
+
+    Returns:
+        Canonical node names in evaluation order (inputs before the nodes using them),
+        each node listed once
+    """
+    available = set(available) | set(BAR_COLUMNS)
+    plan, visiting = [], set()
+
+    def visit(name):
+        if name in available:
+            return
+        if name in visiting:
+            raise ValueError(f"Indicator graph cycle at {name}")
+        visiting.add(name)
+        kind, params = parse_indicator(name)
+        for dep in INDICATOR_GRAPH[kind]['inputs'](*params):
+            visit(canonical_indicator(dep))
+        visiting.discard(name)
+        available.add(name)
+        plan.append(name)
+
+    for name in outputs:
+        visit(canonical_indicator(name))
+    return plan
+
+
+class IndicatorFrame:
+    """Evaluates indicator graph nodes over one bars frame, computing each node at most once"""
+
+    def __init__(self, df, macd=None):
+        """
+        Args:
+            df: DataFrame with OHLCV columns; indicator columns it already holds are reused
+            macd: (fast, slow, signal) of its MACD columns (without it, columns such as
+                  'MACD_hist' are not reused and the nodes are computed from the bars)
+        """
+        self.df = df
+        self.values = {}
+        self.computed = []  # Nodes computed by this frame, in evaluation order
+        self.columns = {}
+        for col in df.columns:
+            if isinstance(col, str) and col not in BAR_COLUMNS:
+                node = column_indicator(col, macd)
+                if node is not None:
+                    self.columns[node] = col
+
+    def _value(self, name):
+        if name in self.values:
+            return self.values[name]
+        series = self.df[name if name in BAR_COLUMNS else self.columns[name]]
+        if pd.api.types.is_numeric_dtype(series):
+            self.values[name] = series.to_numpy(dtype=np.float64)
+        else:
+            self.values[name] = series.to_numpy()  # e.g. an existing impulse_color column
+        return self.values[name]
+
+    def plan(self, outputs):
+        """Nodes that evaluating these outputs would compute"""
+        return resolve_plan(outputs, available=set(self.values) | set(self.columns))
+
+    def get(self, name):
+        """Values of one node as an array aligned with the frame's rows"""
+        for node in self.plan([name]):
+            kind, params = parse_indicator(node)
+            spec = INDICATOR_GRAPH[kind]
+            inputs = [self._value(canonical_indicator(dep)) for dep in spec['inputs'](*params)]
+            self.values[node] = spec['compute'](*inputs, *params)
+            self.computed.append(node)
+        return self._value(canonical_indicator(name))
+
+    def frame(self, outputs):
+        """
+        Copy of the bars frame with the requested nodes added as columns.
+
+        Args:
+            outputs: List of node names (used as column names) or {column: node name}
+        """
+        if not isinstance(outputs, dict):
+            outputs = {name: name for name in outputs}
+        df = self.df.copy(deep=False)
+        for column, name in outputs.items():
+            df[column] = self.get(name)
+        return df
+
+
+def evaluate_indicators(df, outputs, macd=None):
+    """Add the requested indicator graph nodes to a copy of df (see IndicatorFrame.frame)"""
+    return IndicatorFrame(df, macd).frame(outputs)
+
+
+def _diff(x):
+    out = np.full(len(x), np.nan)
+    out[1:] = x[1:] - x[:-1]
+    return out
+
+
+def _macd_line(fast_ewm, slow_ewm, fast, slow):
+    return fast_ewm - slow_ewm
+
+
+def _macd_output(values, fast, slow):
+    """Leading values back-filled, then calculate_indicators' ffill/0 (zeros if the series is too short)"""
+    if len(values) < max(fast, slow):
+        return np.zeros(len(values))
+    return _ffill_zero(_bfill(values))
+
+
+def _impulse(slope, hist_change, *params):
+    """Impulse codes: 1 green (both rising), -1 red (both falling), 0 blue"""
+    codes = np.where((slope > 0) & (hist_change > 0), 1, np.where((slope < 0) & (hist_change < 0), -1, 0))
+    return codes.astype(np.int8)
+
+
+def _impulse_colors(codes, *params):
+    names = np.array([IMPULSE_COLORS[-1], IMPULSE_COLORS[0], IMPULSE_COLORS[1]], dtype=object)
+    return names[codes.astype(np.int64) + 1]
+
+
+def _rolling_mean(x, window):
+    return pd.Series(x).rolling(window=window).mean().to_numpy()
+
+
+def _rolling_std(x, window):
+    return pd.Series(x).rolling(window=window).std().to_numpy()
+
+
+MACD_DEFAULTS = (12, 26, 9)
+
+# Exponential averages (same values as calculate_indicators' EMA and MACD columns)
+register_indicator('EWM', lambda p: ['Close'], lambda close, p: _ewm(close, 2.0 / (p + 1), p))
+register_indicator('EMA', lambda p: ['Close', f'EWM_{p}'],
+                   lambda close, ewm, p: close.copy() if len(close) < max(p, 10) else _ffill_zero(ewm))
+register_indicator('MACD_line', lambda f, s: [f'EWM_{f}', f'EWM_{s}'], _macd_line, defaults=MACD_DEFAULTS[:2], macd=0)
+register_indicator('MACD_signal_line', lambda f, s, g: [f'MACD_line_{f}_{s}'],
+                   lambda line, f, s, g: _ewm(line, 2.0 / (g + 1), g, start=max(f, s) - 1), defaults=MACD_DEFAULTS, macd=0)
+register_indicator('MACD', lambda f, s, g: [f'MACD_line_{f}_{s}'],
+                   lambda line, f, s, g: _macd_output(line, f, s), defaults=MACD_DEFAULTS, macd=0)
+register_indicator('MACD_signal', lambda f, s, g: [f'MACD_signal_line_{f}_{s}_{g}'],
+                   lambda signal, f, s, g: _macd_output(signal, f, s), defaults=MACD_DEFAULTS, macd=0)
+register_indicator('MACD_hist', lambda f, s, g: [f'MACD_line_{f}_{s}', f'MACD_signal_line_{f}_{s}_{g}'],
+                   lambda line, signal, f, s, g: _macd_output(line - signal, f, s), defaults=MACD_DEFAULTS, macd=0)
+
+# Bar-to-bar price change (the Apgar perfection check)
+register_indicator('Close_change', lambda: ['Close'], _diff)
+
+# Impulse System: EMA slope and MACD-Histogram change
+register_indicator('EMA_slope', lambda p: [f'EMA_{p}'], lambda ema, p: _diff(ema))
+register_indicator('MACD_hist_change', lambda f, s, g: [f'MACD_hist_{f}_{s}_{g}'],
+                   lambda hist, f, s, g: _diff(hist), defaults=MACD_DEFAULTS, macd=0)
+register_indicator('impulse', lambda p, f, s, g: [f'EMA_slope_{p}', f'MACD_hist_change_{f}_{s}_{g}'],
+                   _impulse, defaults=(13,) + MACD_DEFAULTS, macd=1)
+register_indicator('impulse_color', lambda p, f, s, g: [f'impulse_{p}_{f}_{s}_{g}'],
+                   _impulse_colors, defaults=(13,) + MACD_DEFAULTS, macd=1)
+
+# Simple moving averages and price channels
+register_indicator('SMA', lambda n: ['Close'], lambda close, n: _rolling_mean(close, n))
+register_indicator('STD', lambda n: ['Close'], lambda close, n: _rolling_std(close, n))
+register_indicator('Volume_SMA', lambda n: ['Volume'], lambda volume, n: _rolling_mean(volume, n))
+register_indicator('BB_upper', lambda n, k: [f'SMA_{n}', f'STD_{n}'], lambda sma, std, n, k: sma + std * k)
+register_indicator('BB_lower', lambda n, k: [f'SMA_{n}', f'STD_{n}'], lambda sma, std, n, k: sma - std * k)
+register_indicator('AE_upper', lambda n, pct: [f'SMA_{n}'], lambda sma, n, pct: sma * (1 + pct / 100))
+register_indicator('AE_lower', lambda n, pct: [f'SMA_{n}'], lambda sma, n, pct: sma * (1 - pct / 100))
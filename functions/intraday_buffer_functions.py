@@ -0,0 +1,120 @@
+"""
+Intraday Session Buffer for the Stock Market Dashboard
+
+The 1D view refreshes every 30 seconds. Instead of downloading five days of
+minute bars on every tick, the buffer keeps the recent sessions per symbol and
+interval in memory and only requests the bars since the last one it holds.
+Custom intervals (8m, 25m, 39m) are re-aggregated from the first changed bin
+onwards instead of resampling all sessions again.
+"""
+
+import threading
+
+import pandas as pd
+
+from .bar_store_functions import normalize_history, append_bars
+
+MAX_SESSIONS = 5  # Today plus the previous four sessions for indicator warmup
+INITIAL_PERIOD = '5d'
+
+
+def resample_minutes(data, minutes, origin='start_day'):
+    """Resample minute bars to N-minute OHLCV bars (bins anchored at origin)"""
+    if data.empty:
+        return data
+    bars = data.set_index('Date')
+    resampled = bars.resample(f'{minutes}min', origin=origin).agg({
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum'
+    }).dropna()
+    return resampled.reset_index()
+
+
+class IntradaySessionBuffer:
+    """Per (symbol, interval) buffer of recent intraday bars with delta refresh"""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._entries = {}  # key -> {'bars', 'resampled', 'origin', 'last_ts'}
+        self._key_locks = {}  # key -> lock held across that key's fetch and merge
+        self._lock = threading.Lock()  # Guards the two dicts only, never held during a fetch
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get_bars(self, symbol, interval, fetch_history, resample_to=None, display_tz=None):
+        """
+        Get the buffered intraday bars for a symbol, fetching only what is new.
+
+        Args:
+            symbol: Ticker symbol
+            interval: Provider interval that is fetched ('1m', '5m', ...)
+            fetch_history: Callable(**kwargs) -> raw history frame; called with
+                period=INITIAL_PERIOD on first use and start=<last bar> afterwards
+            resample_to: Optional custom interval like '39m' built from the fetched bars
+            display_tz: Timezone the timestamps are converted to (exchange local time if None)
+
+        Returns:
+            DataFrame with a 'Date' column (a copy, safe to modify)
+        """
+        key = (symbol, interval, resample_to)
+        # Only requests for the same key wait for each other; other symbols and intervals fetch in parallel
+        with self._key_lock(key):
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                raw = fetch_history(period=INITIAL_PERIOD)
+                new_bars = normalize_history(raw, display_tz)
+                if new_bars.empty:
+                    return new_bars
+                entry = {'bars': pd.DataFrame(), 'resampled': None, 'origin': None, 'last_ts': None}
+            else:
+                try:
+                    raw = fetch_history(start=entry['last_ts'])
+                    new_bars = normalize_history(raw, display_tz)
+                except Exception as e:
+                    print(f"Error refreshing intraday bars for {symbol} ({interval}): {e}")
+                    new_bars = pd.DataFrame()
+
+            if not new_bars.empty:
+                entry['last_ts'] = raw.index.max()
+                entry['bars'] = self._trim_sessions(append_bars(entry['bars'], new_bars))
+                if resample_to:
+                    self._update_resampled(entry, new_bars['Date'].min(), int(resample_to[:-1]))
+                with self._lock:
+                    self._entries[key] = entry
+
+            result = entry['resampled'] if resample_to else entry['bars']
+            return result.copy(deep=False)
+
+    def clear(self, symbol=None):
+        """Drop buffered sessions (for one symbol or all)"""
+        with self._lock:
+            for key in [k for k in self._entries if symbol is None or k[0] == symbol]:
+                del self._entries[key]
+
+    def _trim_sessions(self, bars):
+        """Keep only the most recent max_sessions trading days"""
+        sessions = bars['Date'].dt.normalize()
+        keep = sessions.drop_duplicates().nlargest(self.max_sessions)
+        if len(keep) < sessions.nunique():
+            bars = bars[sessions >= keep.min()].reset_index(drop=True)
+        return bars
+
+    def _update_resampled(self, entry, first_new, minutes):
+        """Re-aggregate only the bins at or after the first new bar"""
+        bars = entry['bars']
+        origin = bars['Date'].min().normalize()
+        if entry['resampled'] is None or entry['origin'] != origin:
+            # First use or the oldest session was trimmed: bins move, resample everything
+            entry['origin'] = origin
+            entry['resampled'] = resample_minutes(bars, minutes, origin)
+            return
+        bin_start = origin + ((first_new - origin) // pd.Timedelta(minutes=minutes)) * pd.Timedelta(minutes=minutes)
+        kept = entry['resampled'][entry['resampled']['Date'] < bin_start]
+        tail = resample_minutes(bars[bars['Date'] >= bin_start], minutes, origin)
+        entry['resampled'] = pd.concat([kept, tail], ignore_index=True)
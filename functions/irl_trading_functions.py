@@ -1,9 +1,10 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
-import ta
 import numbers
 
+from .provider_functions import get_provider
+from .indicator_graph_functions import evaluate_indicators, IndicatorFrame, MACD_DEFAULTS
+
 CSV_FILE = 'equity_data.csv'
 
 FIELDS = [
@@ -40,7 +41,23 @@ def to_native(obj):
     else:
         return obj
 
-def calculate_trade_apgar(stock_symbol, side='buy'):
+def load_apgar_data(stock_symbol):
+    """
+    Fetch weekly and daily bars for Apgar scoring and calculate the required indicators.
+    Bars come from get_stock_data so they share the bar store and in-memory cache.
+    Returns (weekly_data, daily_data); either frame may be empty.
+    """
+    from functions.analysis_functions import get_stock_data
+    # Use 3 years of weekly data for consistency with scanner/chart
+    weekly_data = get_stock_data(stock_symbol, period='3y', frequency='1wk')[0]
+    daily_data = get_stock_data(stock_symbol, period='6mo', frequency='1d')[0]
+    if not weekly_data.empty:
+        weekly_data = calculate_indicators_for_apgar(weekly_data)
+    if not daily_data.empty:
+        daily_data = calculate_indicators_for_apgar(daily_data)
+    return weekly_data, daily_data
+
+def calculate_trade_apgar(stock_symbol, side='buy', weekly_data=None, daily_data=None):
     """
     Calculate Trade Apgar score based on Elder's methodology.
     The Trade Apgar evaluates 5 components on a scale of 0-2.
@@ -59,15 +76,16 @@ def calculate_trade_apgar(stock_symbol, side='buy'):
     Args:
         stock_symbol: Stock symbol to analyze
         side: 'buy' for long positions, 'sell' for short positions
+        weekly_data, daily_data: Optional frames with EMA_13 and MACD_hist already
+            calculated with the default 12/26/9 MACD (e.g. from the scanner's per-symbol
+            context). When omitted they are loaded with load_apgar_data.
     Returns:
         Dictionary with detailed scores and total
         Total score must be 7+ with no zeros to pass
     """
     try:
-        ticker = yf.Ticker(stock_symbol)
-        # Use 3 years of weekly data for consistency with scanner/chart
-        weekly_data = ticker.history(period='3y', interval='1wk')
-        daily_data = ticker.history(period='6mo', interval='1d')
+        if weekly_data is None or daily_data is None:
+            weekly_data, daily_data = load_apgar_data(stock_symbol)
         if weekly_data.empty or daily_data.empty:
             return {
                 'total_score': 0,
@@ -81,8 +99,6 @@ def calculate_trade_apgar(stock_symbol, side='buy'):
                     'perfection': {'score': 0, 'timeframes': 0, 'reason': 'No data'}
                 }
             }
-        weekly_data = calculate_indicators_for_apgar(weekly_data)
-        daily_data = calculate_indicators_for_apgar(daily_data)
         weekly_impulse = calculate_impulse_score(weekly_data, side)
         daily_impulse = calculate_impulse_score(daily_data, side)
         daily_price_score = calculate_price_vs_value_score(daily_data, side)
@@ -128,60 +144,40 @@ def calculate_trade_apgar(stock_symbol, side='buy'):
         }
         return to_native(result)
 
+# Indicator graph nodes behind the Apgar components (column -> node); the impulse codes
+# share the EMA and MACD_hist intermediates instead of recomputing them
+APGAR_INDICATORS = {
+    'EMA_13': 'EMA_13',
+    'EMA_26': 'EMA_26',
+    'MACD': 'MACD',
+    'MACD_signal': 'MACD_signal',
+    'MACD_hist': 'MACD_hist',
+    'ema_slope': 'EMA_slope_13',
+    'macd_hist_change': 'MACD_hist_change',
+    'impulse': 'impulse_13',
+    'SMA_20': 'SMA_20'
+}
+
 def calculate_indicators_for_apgar(df):
     """Calculate required indicators for Apgar scoring."""
-    df = df.copy()
-    from ta.trend import EMAIndicator, MACD
-    df['EMA_13'] = EMAIndicator(df['Close'], window=13).ema_indicator()
-    df['EMA_26'] = EMAIndicator(df['Close'], window=26).ema_indicator()
-    macd = MACD(df['Close'])
-    df['MACD'] = macd.macd()
-    df['MACD_signal'] = macd.macd_signal()
-    df['MACD_hist'] = macd.macd_diff()
-    df['ema_slope'] = df['EMA_13'].diff()
-    df['macd_hist_change'] = df['MACD_hist'].diff()
-    return df
+    return evaluate_indicators(df, APGAR_INDICATORS)
+
+# Impulse score per side and Impulse code (1 green, 0 blue, -1 red)
+IMPULSE_SCORES = {
+    'buy': {-1: 0, 1: 1, 0: 2},
+    'sell': {1: 0, -1: 1, 0: 2}
+}
 
 def calculate_impulse_score(df, side='buy'):
     """Calculate impulse score (0-2) based on EMA trend and MACD momentum."""
-    from functions.impulse_functions import calculate_impulse_system
+    from functions.impulse_functions import calculate_impulse_codes, IMPULSE_COLORS
     if len(df) < 2:
         return {'score': 0, 'color': 'unknown', 'reason': 'Insufficient data'}
-    impulse_df = calculate_impulse_system(df, ema_period=13)
-    color = impulse_df['impulse_color'].iloc[-1] if len(impulse_df) > 0 else 'unknown'
-    score = 0
-    if side == 'buy':
-        if color == 'red':
-            score = 0
-        elif color == 'green':
-            score = 1
-        elif color == 'blue':
-            score = 2
-            # Only apply bonus if previous was green and two ago was red
-            if len(impulse_df) > 2:
-                prev_color = impulse_df['impulse_color'].iloc[-2]
-                prev_prev_color = impulse_df['impulse_color'].iloc[-3]
-                if prev_color == 'green' and prev_prev_color == 'red':
-                    score = 2  # This is the same as default, but logic is explicit
-        else:
-            score = 0
-    else:  # side == 'sell'
-        if color == 'red':
-            score = 1
-        elif color == 'green':
-            score = 0
-        elif color == 'blue':
-            score = 2
-            # Only apply bonus if previous was red and two ago was green
-            if len(impulse_df) > 2:
-                prev_color = impulse_df['impulse_color'].iloc[-2]
-                prev_prev_color = impulse_df['impulse_color'].iloc[-3]
-                if prev_color == 'red' and prev_prev_color == 'green':
-                    score = 2  # This is the same as default, but logic is explicit
-        else:
-            score = 0
+    # Apgar frames hold the 12/26/9 MACD, so the 'impulse' codes they already have are reused
+    code = int(calculate_impulse_codes(df, ema_period=13, macd=MACD_DEFAULTS)[-1])
+    color = IMPULSE_COLORS[code]
     return {
-        'score': score,
+        'score': IMPULSE_SCORES['sell' if side == 'sell' else 'buy'][code],
         'color': color,
         'reason': f'Impulse color: {color}'
     }
@@ -191,7 +187,8 @@ def calculate_price_vs_value_score(df, side='buy'):
     if len(df) < 20:
         return {'score': 0, 'position': 'unknown', 'reason': 'Insufficient data'}
     latest_price = df['Close'].iloc[-1]
-    sma_20 = df['Close'].rolling(20).mean().iloc[-1]
+    # SMA_20 comes precomputed from calculate_indicators_for_apgar or the scanner context
+    sma_20 = df['SMA_20'].iloc[-1] if 'SMA_20' in df.columns else df['Close'].rolling(20).mean().iloc[-1]
     value_upper = sma_20 * 1.05
     value_lower = sma_20 * 0.95
     if side == 'buy':
@@ -294,6 +291,65 @@ def is_timeframe_perfect(df, side='buy'):
         macd_negative = latest['MACD_hist'] < 0
         return price_falling and ema_falling and macd_negative
 
+def calculate_apgar_history(frame, side='buy'):
+    """
+    Trade Apgar components for every day of a multi_timeframe_frame (ema_period 13), vectorized.
+    Each row scores what calculate_trade_apgar gives at that day's close, with the weekly
+    impulse and perfection taken from the weekly bar known then (see multi_timeframe_functions).
+    Returns:
+        DataFrame with Date, the five component scores, total_score and passed
+    """
+    side = 'sell' if side == 'sell' else 'buy'
+    n = len(frame)
+    bars = np.arange(1, n + 1)  # Daily bars known at each row
+    weekly_bars = frame['weekly_bars'].to_numpy()
+    close = frame['Close'].to_numpy(dtype=np.float64)
+    high = frame['High'].astype(np.float64)
+    low = frame['Low'].astype(np.float64)
+    scores = np.array([IMPULSE_SCORES[side][code] for code in (-1, 0, 1)])
+    weekly_impulse = np.where(weekly_bars >= 2, scores[frame['impulse_weekly'].to_numpy(dtype=np.int64) + 1], 0)
+    daily_impulse = np.where(bars >= 2, scores[frame['impulse'].to_numpy(dtype=np.int64) + 1], 0)
+    # Price vs value: above / in / below the SMA_20 +-5% zone
+    sma_20 = IndicatorFrame(frame).get('SMA_20')
+    above = close > sma_20 * 1.05
+    in_zone = ~above & (close >= sma_20 * 0.95) & (close <= sma_20 * 1.05)
+    daily_price = np.where(in_zone, 1, np.where(above, 2 if side == 'sell' else 0, 0 if side == 'sell' else 2))
+    daily_price = np.where(bars >= 20, daily_price, 0)
+    # False breakout against the 10-bar range, with the last 5 bars for failed breakouts
+    recent_high = high.rolling(10).max().to_numpy()
+    recent_low = low.rolling(10).min().to_numpy()
+    on_verge = (close >= recent_high * 0.98) | (close <= recent_low * 1.02)
+    if side == 'buy':
+        happened = (((high.rolling(5).max().to_numpy() > recent_high * 1.01) & (close < recent_high)) |
+                    ((low.rolling(5).min().to_numpy() < recent_low * 0.99) & (close > recent_low)))
+    else:
+        happened = (((high.rolling(5).min().to_numpy() < recent_high * 0.99) & (close > recent_high)) |
+                    ((low.rolling(5).max().to_numpy() > recent_low * 1.01) & (close < recent_low)))
+    false_breakout = np.where(bars >= 20, np.where(on_verge, 2, np.where(happened, 1, 0)), 0)
+    # Perfection: price, EMA_13 and MACD-Histogram all pointing the trade's way, per timeframe
+    direction = -1 if side == 'sell' else 1
+    daily_perfect = ((bars >= 5) & (np.r_[np.nan, np.diff(close)] * direction > 0) &
+                     (np.r_[np.nan, np.diff(frame['EMA_13'].to_numpy(dtype=np.float64))] * direction > 0) &
+                     (frame['MACD_hist'].to_numpy(dtype=np.float64) * direction > 0))
+    weekly_perfect = ((weekly_bars >= 5) & (frame['Close_change_weekly'].to_numpy() * direction > 0) &
+                      (frame['EMA_slope_13_weekly'].to_numpy() * direction > 0) &
+                      (frame['MACD_hist_weekly'].to_numpy() * direction > 0))
+    perfection = daily_perfect.astype(np.int64) + weekly_perfect.astype(np.int64)
+    history = pd.DataFrame({
+        'Date': frame['Date'].to_numpy(),
+        'weekly_impulse': weekly_impulse,
+        'daily_impulse': daily_impulse,
+        'daily_price': daily_price,
+        'false_breakout': false_breakout,
+        'perfection': perfection
+    })
+    components = ['weekly_impulse', 'daily_impulse', 'daily_price', 'false_breakout', 'perfection']
+    # Like calculate_trade_apgar, no score at all without weekly data
+    history.loc[weekly_bars == 0, components] = 0
+    history['total_score'] = history[components].sum(axis=1)
+    history['passed'] = (history['total_score'] >= 7) & (history[components] > 0).all(axis=1)
+    return history
+
 def open_position(df, stock, amount, price_at_entry, stop_price, target_price, side, require_apgar=False):
     """Open a new position (buy or sell) - now with optional Apgar validation."""
     apgar_result = calculate_trade_apgar(stock, side)
@@ -345,8 +401,7 @@ def check_stop_hit(df, stock):
     amount_invested = df.at[idx, 'amount_invested']
     is_long = amount_invested > 0
     try:
-        ticker = yf.Ticker(stock)
-        hist_data = ticker.history(period='30d')
+        hist_data = get_provider().history(stock, period='30d')
         if hist_data.empty:
             return False, 0.0
         if is_long:
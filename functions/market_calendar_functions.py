@@ -0,0 +1,284 @@
+"""
+Market Calendar for the Stock Market Dashboard
+
+Trading sessions, holidays and early closes for the exchanges the dashboard
+covers (NYSE/Nasdaq for US symbols, BME for '.MC' symbols), with DST-correct
+timezone handling via zoneinfo.
+
+The data layer uses it to:
+- skip network fetches when no bar can have changed since the last refresh
+- size cache TTLs to the next session boundary
+- convert exchange timestamps to the dashboard's display timezone
+"""
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+DISPLAY_TZ = ZoneInfo('Europe/Madrid')  # Timezone the dashboard shows times in (CET/CEST)
+SETTLE_MINUTES = 30  # Bars may still be revised this long after the close
+
+EXCHANGES = {
+    'NYSE': {
+        'tz': ZoneInfo('America/New_York'),
+        'open': time(9, 30),
+        'close': time(16, 0),
+        'early_close': time(13, 0)
+    },
+    'BME': {
+        'tz': ZoneInfo('Europe/Madrid'),
+        'open': time(9, 0),
+        'close': time(17, 30),
+        'early_close': time(14, 0)
+    }
+}
+
+# Symbols that trade around the clock or on exchanges without a calendar here
+_UNSCHEDULED_MARKERS = ['=X', '=F', '-USD', '-EUR']
+
+# Spanish indices and ETFs quoted without the .MC suffix
+_BME_SYMBOLS = ['^IBEX']
+
+
+def get_exchange(symbol):
+    """
+    Get the calendar exchange for a symbol.
+
+    Returns:
+        'NYSE', 'BME' or None (no session calendar, e.g. FX, futures, crypto or other exchanges)
+    """
+    symbol = str(symbol).strip().upper()
+    if symbol.endswith('.MC') or symbol in _BME_SYMBOLS:
+        return 'BME'
+    if any(marker in symbol for marker in _UNSCHEDULED_MARKERS):
+        return None
+    if '.' in symbol and not symbol.endswith('.US'):
+        return None  # Other exchange suffixes (.L, .PA, ...)
+    return 'NYSE'
+
+
+def _easter_sunday(year):
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year, month, weekday, n):
+    """n-th weekday (0=Monday) of a month; n=-1 for the last one"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year, 12, 31)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day):
+    """US observance rule: Saturday holidays move to Friday, Sunday holidays to Monday"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def _holidays(exchange, year):
+    """Full-day closures for an exchange and year"""
+    easter = _easter_sunday(year)
+    if exchange == 'BME':
+        days = {date(year, 1, 1), easter - timedelta(days=2), easter + timedelta(days=1),
+                date(year, 5, 1), date(year, 12, 25), date(year, 12, 26)}
+        return frozenset(d for d in days if d.weekday() < 5)
+
+    days = {
+        _nth_weekday(year, 1, 0, 3),         # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),         # Presidents' Day
+        easter - timedelta(days=2),          # Good Friday
+        _nth_weekday(year, 5, 0, -1),        # Memorial Day
+        _observed(date(year, 7, 4)),         # Independence Day
+        _nth_weekday(year, 9, 0, 1),         # Labor Day
+        _nth_weekday(year, 11, 3, 4),        # Thanksgiving
+        _observed(date(year, 12, 25))        # Christmas
+    }
+    if year >= 2022:
+        days.add(_observed(date(year, 6, 19)))  # Juneteenth
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:  # No Friday closure when New Year's Day is a Saturday
+        days.add(_observed(new_year))
+    return frozenset(days)
+
+
+@lru_cache(maxsize=None)
+def _early_closes(exchange, year):
+    """Shortened sessions for an exchange and year"""
+    holidays = _holidays(exchange, year)
+    if exchange == 'BME':
+        days = {date(year, 12, 24), date(year, 12, 31)}
+    else:
+        days = {
+            date(year, 7, 3),                                   # Day before Independence Day
+            _nth_weekday(year, 11, 3, 4) + timedelta(days=1),   # Day after Thanksgiving
+            date(year, 12, 24)                                  # Christmas Eve
+        }
+        if date(year, 7, 4).weekday() in [0, 5, 6]:
+            days.discard(date(year, 7, 3))  # July 3rd is a full day or a holiday then
+    return frozenset(d for d in days if d.weekday() < 5 and d not in holidays)
+
+
+def is_trading_day(exchange, day):
+    """Check whether an exchange holds a session on a date"""
+    day = pd.Timestamp(day).date()
+    return day.weekday() < 5 and day not in _holidays(exchange, day.year)
+
+
+def get_session(exchange, day):
+    """
+    Get the session for a date.
+
+    Returns:
+        (open, close) tz-aware datetimes in the exchange timezone, or None on closed days
+    """
+    day = pd.Timestamp(day).date()
+    if not is_trading_day(exchange, day):
+        return None
+    spec = EXCHANGES[exchange]
+    close = spec['early_close'] if day in _early_closes(exchange, day.year) else spec['close']
+    return (datetime.combine(day, spec['open'], tzinfo=spec['tz']),
+            datetime.combine(day, close, tzinfo=spec['tz']))
+
+
+def previous_trading_day(exchange, day):
+    """Get the last trading date strictly before a date"""
+    day = pd.Timestamp(day).date() - timedelta(days=1)
+    while not is_trading_day(exchange, day):
+        day -= timedelta(days=1)
+    return day
+
+
+def next_trading_day(exchange, day):
+    """Get the first trading date strictly after a date"""
+    day = pd.Timestamp(day).date() + timedelta(days=1)
+    while not is_trading_day(exchange, day):
+        day += timedelta(days=1)
+    return day
+
+
+def _exchange_now(exchange, now=None):
+    tz = EXCHANGES[exchange]['tz']
+    if now is None:
+        return datetime.now(tz)
+    now = pd.Timestamp(now)
+    now = now.tz_localize(DISPLAY_TZ) if now.tzinfo is None else now
+    return now.tz_convert(tz).to_pydatetime()
+
+
+def get_market_state(exchange, now=None):
+    """
+    Get the session state of an exchange.
+
+    Args:
+        exchange: 'NYSE' or 'BME'
+        now: Optional reference time (naive values are read as display time)
+
+    Returns:
+        Dictionary with the exchange-local time, session bounds and open/closed flags
+    """
+    now = _exchange_now(exchange, now)
+    session = get_session(exchange, now.date())
+    is_open = session is not None and session[0] <= now < session[1]
+    if session is not None and now < session[0]:
+        next_open = session[0]
+    else:
+        next_open = get_session(exchange, next_trading_day(exchange, now.date()))[0]
+    return {
+        'exchange': exchange,
+        'now': now,
+        'is_trading_day': session is not None,
+        'is_open': is_open,
+        'is_pre_market': session is not None and now < session[0],
+        'is_after_market': session is not None and now >= session[1],
+        'session_open': session[0] if session else None,
+        'session_close': session[1] if session else None,
+        'next_open': next_open
+    }
+
+
+def last_bar_change(exchange, now=None):
+    """
+    Get the time after which no bar can change until the next session opens.
+
+    Returns:
+        Tuple (change_time, still_changing): change_time is the settle time of the
+        latest session that has started; still_changing is True while it has not passed
+    """
+    now = _exchange_now(exchange, now)
+    session = get_session(exchange, now.date())
+    if session is None or now < session[0]:
+        session = get_session(exchange, previous_trading_day(exchange, now.date()))
+    settle = session[1] + timedelta(minutes=SETTLE_MINUTES)
+    return settle, now < settle
+
+
+def bars_may_have_changed(symbol, last_refresh, now=None):
+    """
+    Check whether a symbol's bars may have changed since a refresh time.
+
+    Symbols without a calendar always return True. Otherwise bars change only
+    during a session (plus the settle window after the close).
+    """
+    exchange = get_exchange(symbol)
+    if exchange is None or last_refresh is None:
+        return True
+    change_time, still_changing = last_bar_change(exchange, now)
+    if still_changing:
+        return True
+    last_refresh = pd.Timestamp(last_refresh)
+    last_refresh = last_refresh.tz_localize(DISPLAY_TZ) if last_refresh.tzinfo is None else last_refresh
+    return last_refresh < pd.Timestamp(change_time)
+
+
+def seconds_until_bars_change(symbol, now=None):
+    """Seconds until the symbol's bars can next change (0 while they can change now)"""
+    exchange = get_exchange(symbol)
+    if exchange is None:
+        return 0
+    change_time, still_changing = last_bar_change(exchange, now)
+    if still_changing:
+        return 0
+    state = get_market_state(exchange, now)
+    return max(0, int((state['next_open'] - state['now']).total_seconds()))
+
+
+def display_now():
+    """Current naive time in the display timezone"""
+    return datetime.now(DISPLAY_TZ).replace(tzinfo=None)
+
+
+def to_display_time(dates):
+    """Convert tz-aware timestamps (Series or scalar) to naive display-timezone time"""
+    if isinstance(dates, pd.Series):
+        dates = pd.to_datetime(dates)
+        if dates.dt.tz is None:
+            return dates
+        return dates.dt.tz_convert(DISPLAY_TZ).dt.tz_localize(None)
+    dates = pd.Timestamp(dates)
+    return dates if dates.tzinfo is None else dates.tz_convert(DISPLAY_TZ).tz_localize(None)
+
+
+def session_in_display_time(exchange, day):
+    """Get a date's (open, close) session as naive display-timezone timestamps, or None"""
+    session = get_session(exchange, day)
+    if session is None:
+        return None
+    return to_display_time(session[0]), to_display_time(session[1])
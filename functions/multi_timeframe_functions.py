@@ -0,0 +1,128 @@
+"""
+Multi-Timeframe Frames for the Stock Market Dashboard
+
+Elder's Triple Screen reads the weekly chart for the tide and the daily chart
+for the wave. multi_timeframe_frame puts both on one daily-indexed frame: the
+weekly EMA, MACD-Histogram and Impulse values are projected onto the daily rows,
+so historical multi-timeframe signals (the Triple Screen chart overlay, the Trade
+Apgar series) are column operations instead of a weekly and a daily pipeline per date.
+
+No lookahead: a weekly bar is known at the close of its last session. Each daily
+row carries the last weekly bar that had ended by its close, so the days inside a
+week see the previous week until the week's last session. The most recent week
+counts as ended at its last session so far, which gives the latest row the
+forming weekly bar that the scanner and the live Apgar score read.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .bar_store_functions import resample_bars, period_start
+from .indicator_graph_functions import IndicatorFrame, evaluate_indicators, canonical_indicator
+
+WEEKLY_INTERVAL = '1wk'
+MULTI_TIMEFRAME_PERIOD = '3y'  # Daily history per symbol (the weekly MACD needs ~35 weeks to settle)
+
+
+def _daily_nodes(ema_period):
+    """Indicator graph nodes of the daily columns"""
+    return [canonical_indicator(node) for node in [f'EMA_{ema_period}', 'MACD_hist', f'impulse_{ema_period}']]
+
+
+def _weekly_nodes(ema_period):
+    """Indicator graph nodes projected from the weekly bars (as '<node>_weekly' columns)"""
+    return ['Close', 'Close_change'] + [canonical_indicator(node) for node in
+                                        [f'EMA_{ema_period}', f'EMA_slope_{ema_period}', 'MACD_hist', f'impulse_{ema_period}']]
+
+
+def _week_starts(dates):
+    """Monday of each date's week (the label resample_bars gives a weekly bar)"""
+    dates = pd.DatetimeIndex(dates).normalize()
+    return (dates - pd.to_timedelta(dates.dayofweek, unit='D')).to_numpy()
+
+
+def weekly_rows(daily_dates, weekly_dates):
+    """
+    Row of the weekly bars known at each daily close.
+
+    Args:
+        daily_dates: Dates of the daily bars (sorted)
+        weekly_dates: Dates of the weekly bars (sorted, labeled with any day of their week)
+
+    Returns:
+        int array aligned with daily_dates (-1 before the first known weekly bar)
+    """
+    days = _week_starts(daily_dates)
+    weeks = _week_starts(weekly_dates)
+    # A week's bar is complete at its last session; earlier days still see the week before
+    last_session = np.ones(len(days), dtype=bool)
+    last_session[:-1] = days[1:] != days[:-1]
+    current = np.searchsorted(weeks, days, side='right') - 1
+    previous = np.searchsorted(weeks, days, side='left') - 1
+    return np.where(last_session, current, previous)
+
+
+def project_weekly(rows, values):
+    """Weekly values on the daily rows of weekly_rows (NaN before the first weekly bar, 0 for codes)"""
+    values = np.asarray(values)
+    if values.dtype.kind in 'iub':
+        out = np.zeros(len(rows), dtype=values.dtype)
+    else:
+        out = np.full(len(rows), np.nan)
+    known = rows >= 0
+    out[known] = values[rows[known]]
+    return out
+
+
+def multi_timeframe_frame(daily, weekly=None, ema_period=13):
+    """
+    Daily bars with the daily and the weekly Impulse System columns on the daily index.
+
+    Parameters:
+    - daily: Daily bars with a 'Date' column, sorted by date
+    - weekly: Weekly bars of the same symbol (default: resampled from daily)
+    - ema_period: EMA period of the Impulse System (default: 13)
+
+    Returns:
+    - Copy of daily with EMA_{p}, MACD_hist and impulse (int8 codes, impulse_{p} when p is not 13),
+      the same plus Close, Close_change and EMA_slope_{p} of the weekly bar known at each
+      close as '<column>_weekly' columns, and 'weekly_bars' (number of weekly bars known)
+    """
+    if daily.empty:
+        return daily.copy(deep=False)
+    if weekly is None:
+        weekly = resample_bars(daily, WEEKLY_INTERVAL)
+    frame = evaluate_indicators(daily, _daily_nodes(ema_period))
+    rows = weekly_rows(daily['Date'], weekly['Date']) if not weekly.empty else np.full(len(daily), -1)
+    weekly_frame = IndicatorFrame(weekly)
+    for node in _weekly_nodes(ema_period):
+        values = weekly_frame.get(node) if not weekly.empty else np.zeros(0)
+        frame[f'{node}_weekly'] = project_weekly(rows, values)
+    frame['weekly_bars'] = rows + 1
+    return frame
+
+
+def multi_timeframe_period(timeframe):
+    """Daily history to load for a chart timeframe (the timeframe's warmup, at least MULTI_TIMEFRAME_PERIOD)"""
+    from functions.analysis_functions import _get_extended_period
+    period = _get_extended_period(timeframe or MULTI_TIMEFRAME_PERIOD)
+    if period != 'max' and (period_start(period) is None or period_start(period) > period_start(MULTI_TIMEFRAME_PERIOD)):
+        return MULTI_TIMEFRAME_PERIOD
+    return period
+
+
+def get_multi_timeframe_frame(symbol, period=MULTI_TIMEFRAME_PERIOD, ema_period=13):
+    """
+    multi_timeframe_frame of a symbol's daily bars, with the weekly bars resampled from them.
+    Cached with the indicator frames (keyed by the bars), so it is computed once per new bar.
+    """
+    from functions.analysis_functions import get_stock_data, _memoize_indicators
+    try:
+        daily = get_stock_data(symbol, period=period, frequency='1d')[0]
+        if daily.empty:
+            return daily
+        return _memoize_indicators(daily, ('multi_timeframe', ema_period),
+                                   lambda: multi_timeframe_frame(daily, ema_period=ema_period))
+    except Exception as e:
+        print(f"Error building multi-timeframe frame for {symbol}: {e}")
+        return pd.DataFrame()
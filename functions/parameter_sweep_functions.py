@@ -0,0 +1,302 @@
+"""
+Parameter Sweeps for the Stock Market Dashboard
+
+Evaluates a grid of indicator settings over one symbol's bars in one vectorized
+pass instead of one calculate_indicators call per setting. Each setting is a
+row of a (settings x bars) matrix: EMA periods and the MACD, RSI and Wilder
+smoothings run as a single row-wise decay_scan with one decay factor per row,
+and the Stochastic's rolling extremes for every period come from one
+cumulative min/max over the longest window.
+
+Rows match the calculate_indicators column of the same setting (same warmup
+and fill handling). sweep_statistics summarizes Impulse System and Value Zone
+behaviour per (EMA pair, MACD setting) combination for tuning the chart inputs.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .indicator_engine_functions import decay_scan, _shift
+from .batch_indicator_functions import _bfill_rows
+
+SWEEP_CHUNK_CELLS = 200_000  # Settings x bars per pass; larger grids are split so the temporaries stay in cache
+
+
+def _ffill_zero_rows(x):
+    """ffill() then fillna(0) along each row"""
+    if not np.isnan(x).any():
+        return x
+    idx = np.where(~np.isnan(x), np.arange(x.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    out = np.take_along_axis(x, idx, axis=1)
+    out[np.isnan(out)] = 0.0
+    return out
+
+
+def _ewm_grid(x, alpha, min_periods, start=None):
+    """
+    ewm(alpha, adjust=False, min_periods).mean() with one setting per row.
+
+    Args:
+        x: Values as a 1-D array (shared by all rows) or a (settings x bars) matrix
+        alpha, min_periods: One value per row
+        start: First valid column per row (default 0); rows starting past the end are all NaN
+    """
+    alpha = np.asarray(alpha, dtype=np.float64)
+    rows = len(alpha)
+    x = np.broadcast_to(x, (rows, np.shape(x)[-1]))
+    n = x.shape[1]
+    start = np.zeros(rows, dtype=np.int64) if start is None else np.asarray(start, dtype=np.int64)
+    cols = np.arange(n)
+    valid = start < n
+    seq = np.where(cols >= start[:, None], alpha[:, None] * x, 0.0)
+    seq[np.flatnonzero(valid), start[valid]] = x[np.flatnonzero(valid), start[valid]]
+    out = decay_scan(seq, 1.0 - alpha)
+    out[cols < (start + np.asarray(min_periods) - 1)[:, None]] = np.nan
+    out[~valid] = np.nan
+    return out
+
+
+def _rolling_extremes(values, periods, func):
+    """Rolling min or max (func np.minimum/np.maximum) of values for every period, as (periods x bars)
+    with NaN before each period's first full window"""
+    periods = np.asarray(periods, dtype=np.int64)
+    longest = int(periods.max())
+    pad = np.inf if func is np.minimum else -np.inf
+    padded = np.concatenate((np.full(longest - 1, pad), values))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, longest)
+    # Column w - 1 holds the extreme of the last w values ending at each bar
+    extremes = func.accumulate(windows[:, ::-1], axis=1)[:, periods - 1].T
+    extremes[np.arange(len(values)) < (periods - 1)[:, None]] = np.nan
+    return extremes
+
+
+def _in_chunks(sweep, df, params):
+    """Run a sweep over slices of the grid of at most SWEEP_CHUNK_CELLS values and stack the rows"""
+    params = list(params)
+    rows = max(1, SWEEP_CHUNK_CELLS // max(len(df), 1))
+    if len(params) <= rows:
+        return sweep(df, params)
+    parts = [sweep(df, params[i:i + rows]) for i in range(0, len(params), rows)]
+    result = {'params': [p for part in parts for p in part['params']]}
+    for col in parts[0]:
+        if col != 'params':
+            result[col] = np.vstack([part[col] for part in parts])
+    return result
+
+
+def sweep_ema(df, periods):
+    """
+    EMA_<period> of calculate_indicators for every period.
+
+    Returns:
+        {'params': periods, 'EMA': (periods x bars) matrix}
+    """
+    return _in_chunks(_sweep_ema, df, periods)
+
+
+def _sweep_ema(df, periods):
+    close = df['Close'].to_numpy(dtype=np.float64)
+    periods = [int(p) for p in periods]
+    p = np.array(periods)
+    ema = _ffill_zero_rows(_ewm_grid(close, 2.0 / (p + 1), p))
+    short = len(close) < np.maximum(p, 10)
+    ema[short] = close  # Too few bars: calculate_indicators returns the closes
+    return {'params': periods, 'EMA': ema}
+
+
+def sweep_macd(df, settings):
+    """
+    MACD, MACD_signal and MACD_hist of calculate_indicators for every (fast, slow, signal) setting.
+
+    Returns:
+        {'params': settings, 'MACD', 'MACD_signal', 'MACD_hist': (settings x bars) matrices}
+    """
+    close = df['Close'].to_numpy(dtype=np.float64)
+    settings = [tuple(int(v) for v in s) for s in settings]
+    fast, slow, signal = (np.array(v) for v in zip(*settings))
+    # One scan for the EMAs of every distinct fast/slow period, shared by all settings
+    periods, index = np.unique(np.concatenate((fast, slow)), return_inverse=True)
+    def emas(_, rows):
+        return {'params': rows, 'EWM': _ewm_grid(close, 2.0 / (periods[rows] + 1), periods[rows])}
+
+    ewm = _in_chunks(emas, df, range(len(periods)))['EWM']
+    fast_rows, slow_rows = index[:len(settings)], index[len(settings):]
+    short = len(close) < np.maximum(fast, slow)
+
+    # MACD lines and their signal lines, chunk by chunk of settings
+    def lines(_, rows):
+        macd = ewm[fast_rows[rows]] - ewm[slow_rows[rows]]
+        signal_line = _ewm_grid(macd, 2.0 / (signal[rows] + 1), signal[rows], start=np.maximum(fast, slow)[rows] - 1)
+        result = {'params': rows}
+        for col, values in [('MACD', macd), ('MACD_signal', signal_line), ('MACD_hist', macd - signal_line)]:
+            values = _ffill_zero_rows(_bfill_rows(values))
+            values[short[rows]] = 0.0
+            result[col] = values
+        return result
+
+    result = _in_chunks(lines, df, range(len(settings)))
+    result['params'] = settings
+    return result
+
+
+def sweep_rsi(df, periods):
+    """
+    RSI of calculate_indicators for every period (periods are clamped to 1-50 as in calculate_indicators).
+
+    Returns:
+        {'params': periods, 'RSI': (periods x bars) matrix}
+    """
+    return _in_chunks(_sweep_rsi, df, periods)
+
+
+def _sweep_rsi(df, periods):
+    close = df['Close'].to_numpy(dtype=np.float64)
+    periods = [int(p) for p in periods]
+    p = np.clip(periods, 1, 50)
+    diff = close - _shift(close) if len(close) else close
+    averages = _ewm_grid(np.concatenate((np.broadcast_to(np.where(diff > 0, diff, 0.0), (len(p), len(close))),
+                                         np.broadcast_to(np.where(diff < 0, -diff, 0.0), (len(p), len(close))))),
+                         np.tile(1.0 / p, 2), np.tile(p, 2))
+    ema_up, ema_down = averages[:len(p)], averages[len(p):]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(ema_down == 0, 100.0, 100 - (100 / (1 + ema_up / ema_down)))
+    rsi = _ffill_zero_rows(_bfill_rows(rsi))
+    rsi[len(close) < np.maximum(14, p)] = 50.0
+    return {'params': periods, 'RSI': rsi}
+
+
+def sweep_stochastic(df, periods):
+    """
+    Stoch_K and Stoch_D of calculate_indicators for every period (clamped to 1-50).
+
+    Returns:
+        {'params': periods, 'Stoch_K', 'Stoch_D': (periods x bars) matrices}
+    """
+    return _in_chunks(_sweep_stochastic, df, periods)
+
+
+def _sweep_stochastic(df, periods):
+    close = df['Close'].to_numpy(dtype=np.float64)
+    periods = [int(p) for p in periods]
+    p = np.clip(periods, 1, 50)
+    n = len(close)
+    if n == 0:
+        return {'params': periods, 'Stoch_K': np.zeros((len(p), 0)), 'Stoch_D': np.zeros((len(p), 0))}
+    lowest = _rolling_extremes(df['Low'].to_numpy(dtype=np.float64), p, np.minimum)
+    highest = _rolling_extremes(df['High'].to_numpy(dtype=np.float64), p, np.maximum)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_k = 100 * (close - lowest) / (highest - lowest)
+    stoch_d = np.full_like(stoch_k, np.nan)
+    if n >= 3:
+        stoch_d[:, 2:] = np.lib.stride_tricks.sliding_window_view(stoch_k, 3, axis=1).mean(axis=-1)
+    result = {'params': periods}
+    for col, values in [('Stoch_K', stoch_k), ('Stoch_D', stoch_d)]:
+        values = _ffill_zero_rows(_bfill_rows(values))
+        values[n < np.maximum(14, p)] = 50.0
+        result[col] = values
+    return result
+
+
+def sweep_indicators(df, ema_periods=None, macd_settings=None, rsi_periods=None, stoch_periods=None):
+    """
+    Evaluate grids of indicator settings over one symbol's bars.
+
+    Args:
+        df: Bars DataFrame with OHLC columns
+        ema_periods: EMA periods, e.g. range(5, 51)
+        macd_settings: (fast, slow, signal) triplets
+        rsi_periods: RSI periods
+        stoch_periods: Slow Stochastic periods
+
+    Returns:
+        Dictionary with an entry per requested grid ('ema', 'macd', 'rsi', 'stochastic'),
+        each holding 'params' and (settings x bars) matrices named like the calculate_indicators columns
+    """
+    result = {}
+    if ema_periods:
+        result['ema'] = sweep_ema(df, ema_periods)
+    if macd_settings:
+        result['macd'] = sweep_macd(df, macd_settings)
+    if rsi_periods:
+        result['rsi'] = sweep_rsi(df, rsi_periods)
+    if stoch_periods:
+        result['stochastic'] = sweep_stochastic(df, stoch_periods)
+    return result
+
+
+def sweep_statistics(df, ema_pairs=[(13, 26)], macd_settings=[(12, 26, 9)]):
+    """
+    Impulse System and Value Zone statistics for every (EMA pair, MACD setting) combination.
+
+    The Impulse uses the first EMA of the pair (as the chart does) and the setting's MACD-Histogram;
+    the Value Zone is the band between the pair's EMAs. Statistics cover the bars after the warmup
+    of each setting (the bars calculate_indicators flags as unreliable are left out).
+
+    Args:
+        df: Bars DataFrame with OHLC columns
+        ema_pairs: (fast, slow) EMA periods
+        macd_settings: (fast, slow, signal) triplets
+
+    Returns:
+        DataFrame with one row per combination: the settings, 'bars' (bars counted),
+        'impulse_flips' (Impulse colour changes), 'green_pct' and 'red_pct' (share of
+        green/red bars) and 'value_zone_hit_rate' (share of closes inside the Value Zone)
+    """
+    close = df['Close'].to_numpy(dtype=np.float64)
+    n = len(close)
+    ema_pairs = [tuple(int(p) for p in pair) for pair in ema_pairs]
+    macd_settings = [tuple(int(v) for v in s) for s in macd_settings]
+    periods = sorted({p for pair in ema_pairs for p in pair})
+    emas = sweep_ema(df, periods)['EMA']
+    hist = sweep_macd(df, macd_settings)['MACD_hist']
+    row = {p: i for i, p in enumerate(periods)}
+    fast = emas[[row[pair[0]] for pair in ema_pairs]]
+    slow = emas[[row[pair[1]] for pair in ema_pairs]]
+    cols = np.arange(n)
+
+    # Value Zone hits per EMA pair, counted once both EMAs are past their warmup
+    zone_start = np.array([max(pair) - 1 for pair in ema_pairs])
+    counted = cols >= zone_start[:, None]
+    in_zone = (np.minimum(fast, slow) <= close) & (close <= np.maximum(fast, slow)) & counted
+    zone_bars = counted.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hit_rate = np.where(zone_bars > 0, in_zone.sum(axis=1) / zone_bars, np.nan)
+
+    # Impulse codes per (pair, setting) combination, one EMA pair and a chunk of settings at a time
+    hist_change = np.diff(hist, axis=1, prepend=np.nan)
+    macd_warmup = np.array([max(s[0], s[1]) + s[2] - 2 for s in macd_settings])
+    shape = (len(ema_pairs), len(macd_settings))
+    flips, impulse_bars = np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64)
+    green, red = np.zeros(shape), np.zeros(shape)
+    step = max(1, SWEEP_CHUNK_CELLS // max(n, 1))
+    for i, pair in enumerate(ema_pairs):
+        slope = np.diff(fast[i], prepend=np.nan)
+        for j in range(0, len(macd_settings), step):
+            change = hist_change[j:j + step]
+            impulse = np.where((slope > 0) & (change > 0), 1, np.where((slope < 0) & (change < 0), -1, 0)).astype(np.int8)
+            counted = cols >= (np.maximum(pair[0] - 1, macd_warmup[j:j + step]) + 1)[:, None]  # Slopes need the previous bar
+            flips[i, j:j + step] = ((impulse[:, 1:] != impulse[:, :-1]) & counted[:, 1:]).sum(axis=1)
+            impulse_bars[i, j:j + step] = counted.sum(axis=1)
+            green[i, j:j + step] = ((impulse == 1) & counted).sum(axis=1)
+            red[i, j:j + step] = ((impulse == -1) & counted).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        green = np.where(impulse_bars > 0, green / impulse_bars, np.nan)
+        red = np.where(impulse_bars > 0, red / impulse_bars, np.nan)
+
+    records = []
+    for i, (ema_fast, ema_slow) in enumerate(ema_pairs):
+        for j, (macd_fast, macd_slow, macd_signal) in enumerate(macd_settings):
+            records.append({
+                'ema_fast': ema_fast,
+                'ema_slow': ema_slow,
+                'macd_fast': macd_fast,
+                'macd_slow': macd_slow,
+                'macd_signal': macd_signal,
+                'bars': int(impulse_bars[i, j]),
+                'impulse_flips': int(flips[i, j]),
+                'green_pct': round(float(green[i, j]) * 100, 1),
+                'red_pct': round(float(red[i, j]) * 100, 1),
+                'value_zone_hit_rate': round(float(hit_rate[i]), 4)
+            })
+    return pd.DataFrame(records)
@@ -0,0 +1,135 @@
+"""
+Background Prefetcher for the Stock Market Dashboard
+
+Keeps the chart views of watchlist and open-position symbols warm in the data
+and indicator caches, so switching between watched tickers does not wait for a
+download. Refreshes follow the market calendar: every minute while a watched
+symbol's bars can change, otherwise not again until its next session opens.
+"""
+
+import threading
+import time
+
+from .market_calendar_functions import seconds_until_bars_change
+from .analysis_functions import warm_symbol
+
+# (timeframe, frequency) views kept warm: daily chart, weekly chart (scanner/watchlist
+# clicks open 5Y weekly) and today's intraday chart
+PREFETCH_VIEWS = [
+    ('6mo', '1d'),
+    ('5y', '1wk'),
+    ('1d', '1m')
+]
+OPEN_REFRESH_SECONDS = 60  # Matches the chart cache TTL while the market is open
+MAX_SLEEP_SECONDS = 60 * 60  # Re-read the symbol lists at least hourly
+
+
+class BackgroundPrefetcher:
+    """Daemon thread that periodically warms the caches for a changing set of symbols"""
+
+    def __init__(self, symbols_func, warm_func, views=PREFETCH_VIEWS):
+        """
+        Args:
+            symbols_func: Callable returning the symbols to keep warm (re-read every cycle)
+            warm_func: Callable(symbol, timeframe, frequency) that fetches and calculates a view
+            views: (timeframe, frequency) pairs to warm for every symbol
+        """
+        self.symbols_func = symbols_func
+        self.warm_func = warm_func
+        self.views = views
+        self.runs = 0
+        self.errors = 0
+        self.last_run = None
+        self.next_run = None
+        self.symbols = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the worker thread (no-op if it is already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='prefetcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the worker thread after the current cycle"""
+        self._stop.set()
+        self._wake.set()
+
+    def refresh_now(self):
+        """Wake the worker for an immediate cycle (e.g. after the watchlist changed)"""
+        self._wake.set()
+
+    def run_once(self):
+        """Warm every view of every symbol once"""
+        try:
+            symbols = list(dict.fromkeys(s.strip().upper() for s in self.symbols_func() if s))
+        except Exception as e:
+            print(f"Error reading prefetch symbols: {e}")
+            symbols = self.symbols
+        self.symbols = symbols
+        for symbol in symbols:
+            for timeframe, frequency in self.views:
+                if self._stop.is_set():
+                    return
+                try:
+                    self.warm_func(symbol, timeframe, frequency)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Error prefetching {symbol} ({timeframe}, {frequency}): {e}")
+        self.runs += 1
+        self.last_run = time.time()
+
+    def next_delay(self):
+        """Seconds until the next cycle, based on when the watched symbols' bars can change"""
+        if not self.symbols:
+            return MAX_SLEEP_SECONDS
+        delay = min(seconds_until_bars_change(symbol) for symbol in self.symbols)
+        return min(MAX_SLEEP_SECONDS, max(OPEN_REFRESH_SECONDS, delay))
+
+    def stats(self):
+        """Get prefetch counters"""
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'symbols': len(self.symbols),
+            'views': len(self.views),
+            'runs': self.runs,
+            'errors': self.errors,
+            'last_run': self.last_run,
+            'next_run': self.next_run
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            delay = self.next_delay()
+            self.next_run = time.time() + delay
+            self._wake.wait(delay)
+            self._wake.clear()
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def start_prefetcher(symbols_func, warm_func=warm_symbol):
+    """Start the shared background prefetcher (only the first call creates it)"""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = BackgroundPrefetcher(symbols_func, warm_func)
+        _prefetcher.start()
+        return _prefetcher
+
+
+def get_prefetcher():
+    """Get the shared prefetcher (None if it was never started)"""
+    return _prefetcher
+
+
+def get_prefetch_stats():
+    """Get counters of the shared prefetcher"""
+    return _prefetcher.stats() if _prefetcher is not None else {'running': False}
@@ -0,0 +1,199 @@
+"""
+Market Data Providers for the Stock Market Dashboard
+
+All price and info requests go through the active provider instead of calling
+yfinance directly, so the data source can be swapped without touching the
+analysis code:
+
+- YFinanceProvider: live data from Yahoo Finance (default)
+- ReplayProvider:   records responses of another provider to disk, or replays
+                    them offline with simulated latency (deterministic benchmarks)
+
+The active provider is wrapped in a LimitedProvider, so every request goes
+through the shared rate limiter and concurrency controller.
+
+Providers return frames in the yfinance shape (DatetimeIndex, OHLCV columns;
+download() returns one column group per ticker).
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+
+import pandas as pd
+import yfinance as yf
+
+from .rate_limit_functions import get_request_governor, is_throttling_error, RateLimitError
+
+REPLAY_DIR = 'replay_data'
+
+
+class MarketDataProvider:
+    """Base class for market data providers"""
+
+    name = 'base'
+
+    def history(self, symbol, period=None, interval='1d', start=None, end=None, timeout=None):
+        """Get the bar history for one symbol (DatetimeIndex, OHLCV columns)"""
+        raise NotImplementedError
+
+    def download(self, symbols, period=None, interval='1d', start=None, end=None, timeout=None):
+        """Get bars for several symbols as one frame with a column group per symbol"""
+        frames = {}
+        for symbol in symbols:
+            try:
+                data = self.history(symbol, period=period, interval=interval, start=start, end=end, timeout=timeout)
+                if not data.empty:
+                    frames[symbol] = data
+            except Exception as e:
+                print(f"Error fetching {symbol}: {e}")
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+    def info(self, symbol):
+        """Get company/quote metadata for a symbol"""
+        return {}
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live data from Yahoo Finance"""
+
+    name = 'yfinance'
+
+    def history(self, symbol, period=None, interval='1d', start=None, end=None, timeout=None):
+        kwargs = {'interval': interval, 'start': start, 'end': end, 'timeout': timeout or 10}
+        if start is None:
+            kwargs['period'] = period or '1mo'
+        return yf.Ticker(symbol).history(**kwargs)
+
+    def download(self, symbols, period=None, interval='1d', start=None, end=None, timeout=None):
+        kwargs = {'period': period} if start is None else {'start': start, 'end': end}
+        data = yf.download(
+            tickers=list(symbols), interval=interval, group_by='ticker', auto_adjust=True,
+            actions=True, threads=True, progress=False, timeout=timeout or 10, **kwargs
+        )
+        # yf.download catches every per-ticker error (429s included) and returns empty columns,
+        # so rate limiting is only visible in its error table; raise it for the request governor
+        requested = {str(symbol).upper() for symbol in symbols}
+        errors = dict(getattr(yf.shared, '_ERRORS', None) or {})
+        throttled = sorted(ticker for ticker, error in errors.items()
+                           if ticker in requested and is_throttling_error(error))
+        if throttled:
+            raise RateLimitError(f"Rate limited on {len(throttled)}/{len(requested)} tickers: {', '.join(throttled[:5])}")
+        return data
+
+    def info(self, symbol):
+        return yf.Ticker(symbol).info
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Record/replay provider.
+
+    In 'record' mode every request is forwarded to the wrapped provider and the
+    response is saved under the replay directory. In 'replay' mode the saved
+    responses are served from disk (no network), after sleeping for the
+    configured latency so that benchmarks see realistic request costs.
+    """
+
+    name = 'replay'
+
+    def __init__(self, directory=REPLAY_DIR, mode='replay', provider=None, latency=0.0, jitter=0.0):
+        """
+        Args:
+            directory: Folder holding the recorded responses
+            mode: 'record' or 'replay'
+            provider: Provider to record from (defaults to YFinanceProvider)
+            latency: Simulated seconds per replayed request
+            jitter: Random extra seconds (0..jitter) added to the latency
+        """
+        if mode not in ['record', 'replay']:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.provider = provider or YFinanceProvider()
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0  # Requests served since creation
+        self._lock = threading.Lock()
+
+    def history(self, symbol, period=None, interval='1d', start=None, end=None, timeout=None):
+        request = {'method': 'history', 'symbol': symbol, 'period': period, 'interval': interval,
+                   'start': _request_value(start), 'end': _request_value(end)}
+        return self._serve(request, lambda: self.provider.history(
+            symbol, period=period, interval=interval, start=start, end=end, timeout=timeout))
+
+    def download(self, symbols, period=None, interval='1d', start=None, end=None, timeout=None):
+        request = {'method': 'download', 'symbols': list(symbols), 'period': period, 'interval': interval,
+                   'start': _request_value(start), 'end': _request_value(end)}
+        return self._serve(request, lambda: self.provider.download(
+            symbols, period=period, interval=interval, start=start, end=end, timeout=timeout))
+
+    def info(self, symbol):
+        request = {'method': 'info', 'symbol': symbol}
+        return self._serve(request, lambda: self.provider.info(symbol))
+
+    def _path(self, request):
+        key = hashlib.sha1(json.dumps(request, sort_keys=True).encode()).hexdigest()
+        return os.path.join(self.directory, request['method'], f"{key}.pkl")
+
+    def _serve(self, request, fetch):
+        path = self._path(request)
+        with self._lock:
+            self.requests += 1
+        if self.mode == 'record':
+            response = fetch()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pd.to_pickle({'request': request, 'response': response}, path)
+            return response
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+        if not os.path.exists(path):
+            raise LookupError(f"No recorded response for {request}")
+        return pd.read_pickle(path)['response']
+
+
+class LimitedProvider(MarketDataProvider):
+    """Runs every request of another provider under the shared request governor"""
+
+    def __init__(self, provider, governor=None):
+        self.provider = provider
+        self.governor = governor or get_request_governor()
+        self.name = provider.name
+
+    def history(self, symbol, period=None, interval='1d', start=None, end=None, timeout=None):
+        return self.governor.call(self.provider.history, symbol, period=period, interval=interval,
+                                  start=start, end=end, timeout=timeout)
+
+    def download(self, symbols, period=None, interval='1d', start=None, end=None, timeout=None):
+        return self.governor.call(self.provider.download, symbols, period=period, interval=interval,
+                                  start=start, end=end, timeout=timeout, cost=max(1, len(symbols)))
+
+    def info(self, symbol):
+        return self.governor.call(self.provider.info, symbol)
+
+
+def _request_value(value):
+    """Make a start/end argument JSON-serializable for request keys"""
+    if value is None:
+        return None
+    return pd.Timestamp(value).isoformat()
+
+
+_provider = LimitedProvider(YFinanceProvider())
+
+
+def get_provider():
+    """Get the active market data provider"""
+    return _provider
+
+
+def set_provider(provider, limited=True):
+    """Replace the active market data provider (returns the previous one).
+    With limited=True the provider is governed by the shared request limits."""
+    global _provider
+    previous = _provider
+    _provider = LimitedProvider(provider) if limited and not isinstance(provider, LimitedProvider) else provider
+    return previous
@@ -0,0 +1,173 @@
+"""
+Outbound Request Limiting for the Stock Market Dashboard
+
+Every market data request passes through one shared RequestGovernor:
+
+- TokenBucket: caps the request rate (requests per second, with bursts)
+- AdaptiveConcurrencyLimiter: AIMD control of parallel requests. The limit grows
+  by one slot per window of fast, successful requests and is halved on errors,
+  throttling responses (HTTP 429) or slow responses.
+
+The current limits are available through get_request_limits().
+"""
+
+import time
+import threading
+
+# Defaults for the shared governor
+REQUESTS_PER_SECOND = 10.0
+BURST_SIZE = 20
+INITIAL_CONCURRENCY = 8
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 32
+TARGET_LATENCY_SECONDS = 3.0  # Slower responses are treated as congestion
+THROTTLE_COOLDOWN_SECONDS = 30  # Rate is reduced for this long after a 429
+DECREASE_INTERVAL_SECONDS = 1.0  # Failures of requests sent together count as one back-off
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter"""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, capacity=BURST_SIZE):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting for a refill if needed. Returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def available(self):
+        """Get the number of tokens currently available"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on the number of requests in flight"""
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, min_limit=MIN_CONCURRENCY,
+                 max_limit=MAX_CONCURRENCY, target_latency=TARGET_LATENCY_SECONDS):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self.throttled = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """Wait for a free slot. Returns False on timeout"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.in_flight < int(self.limit), timeout=timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency, ok=True, throttled=False):
+        """Free a slot and adapt the limit to the request outcome"""
+        with self._condition:
+            self.in_flight -= 1
+            if ok and latency <= self.target_latency:
+                # Additive increase: about one extra slot per full window of good requests
+                self.successes += 1
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            else:
+                # Multiplicative decrease on errors, throttling or congestion
+                self.failures += 0 if ok else 1
+                self.throttled += 1 if throttled else 0
+                now = time.monotonic()
+                if now - self._last_decrease >= DECREASE_INTERVAL_SECONDS:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self._last_decrease = now
+            self._condition.notify_all()
+
+
+class RateLimitError(Exception):
+    """Raised by providers that report rate limiting without raising (e.g. per ticker of a batch)"""
+
+
+def is_throttling_error(error):
+    """Check whether an exception (or the repr of one) means the provider is rate limiting us"""
+    text = f"{type(error).__name__} {error}"
+    return 'RateLimit' in text or '429' in text or 'Too Many Requests' in text
+
+
+class RequestGovernor:
+    """Shared rate and concurrency control for outbound data requests"""
+
+    def __init__(self, bucket=None, limiter=None):
+        self.bucket = bucket or TokenBucket()
+        self.limiter = limiter or AdaptiveConcurrencyLimiter()
+        self.base_rate = self.bucket.rate
+        self._throttled_until = 0.0
+
+    def call(self, fn, *args, cost=1, **kwargs):
+        """Run one request under the rate and concurrency limits
+        (cost: number of symbols in the request, latency is judged per symbol)"""
+        if time.monotonic() >= self._throttled_until:
+            self.bucket.rate = self.base_rate
+        self.bucket.acquire()
+        self.limiter.acquire()
+        start = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            throttled = is_throttling_error(e)
+            if throttled:
+                # Halve the request rate for a while on top of the concurrency back-off
+                self.bucket.rate = max(self.base_rate / 4, self.bucket.rate / 2)
+                self._throttled_until = time.monotonic() + THROTTLE_COOLDOWN_SECONDS
+            self.limiter.release((time.monotonic() - start) / cost, ok=False, throttled=throttled)
+            raise
+        self.limiter.release((time.monotonic() - start) / cost)
+        return result
+
+    def limits(self):
+        """Get the current limits and counters"""
+        limiter = self.limiter
+        return {
+            'concurrency_limit': int(limiter.limit),
+            'min_concurrency': limiter.min_limit,
+            'max_concurrency': limiter.max_limit,
+            'in_flight': limiter.in_flight,
+            'requests_per_second': self.bucket.rate,
+            'burst_size': self.bucket.capacity,
+            'successes': limiter.successes,
+            'failures': limiter.failures,
+            'throttled': limiter.throttled
+        }
+
+
+_governor = RequestGovernor()
+
+
+def get_request_governor():
+    """Get the shared request governor"""
+    return _governor
+
+
+def get_request_limits():
+    """Get the current limits of the shared request governor"""
+    return _governor.limits()
@@ -16,13 +16,29 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import pandas as pd
 import numpy as np
-import yfinance as yf
 import ta
 
 # Import technical analysis functions from existing modules
 from .analysis_functions import calculate_indicators
-from functions.irl_trading_functions import calculate_trade_apgar, calculate_indicators_for_apgar
-from functions.analysis_functions import get_stock_data
+from functions.irl_trading_functions import calculate_trade_apgar
+from functions.analysis_functions import get_stock_data, get_stock_data_many, _get_stale_cached_data
+from functions.bar_store_functions import _load_index, _index_key
+from functions.market_calendar_functions import bars_may_have_changed
+from functions.provider_functions import get_provider
+from functions.rate_limit_functions import get_request_limits
+from functions.batch_indicator_functions import align_bars, batch_indicators, batch_frames
+from functions.indicator_graph_functions import evaluate_indicators, MACD_DEFAULTS
+
+# Indicator graph nodes added to the scan context frames (on top of calculate_indicators, whose MACD
+# columns use MACD_DEFAULTS), shared by the scanner fields and both Trade Apgar sides
+SCAN_DAILY_INDICATORS = ['impulse', 'SMA_20', 'Volume_SMA_20']
+SCAN_WEEKLY_INDICATORS = ['impulse']
+
+# Scanner labels of the int8 Impulse codes
+IMPULSE_LABELS = {1: 'Buy', -1: 'Sell', 0: 'Neutral'}
+
+# Serializes the load -> merge -> save of the scanner cache file between concurrent scans
+_scanner_cache_lock = threading.Lock()
 
 
 class StockScanner:
@@ -30,7 +46,8 @@ class StockScanner:
         self.cache_file = cache_file
         self.update_threshold_hours = 4  # Update every 4 hours during market hours
         self.universe = self._get_stock_universe()
-        self.max_workers = 8  # Reasonable thread pool size
+        self.max_workers = None  # None: size the pool from the shared request limits
+        self.batch_mode = True  # Calculate the universe's indicators as symbols x bars matrices
 
     def _get_stock_universe(self):
         """Get comprehensive stock universe for scanning"""
@@ -100,71 +117,129 @@ class StockScanner:
         }
     
     def _load_cache(self):
-        """Load existing scanner data from cache file"""
+        """Load the per-symbol scanner rows from the cache file ({symbol: row})"""
         if os.path.exists(self.cache_file):
             try:
                 with open(self.cache_file, 'r') as f:
                     cache_data = json.load(f)
-                
-                # Convert to DataFrame with proper date handling
-                df = pd.DataFrame(cache_data['data'])
-                df['last_updated'] = pd.to_datetime(df['last_updated'])
-                return df, cache_data.get('last_full_update', None)
+                return {row['symbol']: row for row in cache_data.get('data', [])}
             except Exception as e:
                 print(f"Error loading cache: {e}")
-                return pd.DataFrame(), None
-        return pd.DataFrame(), None
+        return {}
+    
+    def _merge_cache(self, stale_symbols, results):
+        """
+        Replace the rows of the recalculated symbols in the cache file and save it.
+        The file is re-read under the cache lock, so concurrent scans keep each other's rows.
+
+        Returns:
+            The merged rows ({symbol: row})
+        """
+        with _scanner_cache_lock:
+            rows = self._load_cache()
+            for symbol in stale_symbols:
+                rows.pop(symbol, None)
+            rows.update({result['symbol']: result for result in results})
+            self._save_cache(rows)
+        return rows
     
-    def _save_cache(self, df):
-        """Save scanner data to cache file"""
+    def _save_cache(self, rows):
+        """Save the per-symbol scanner rows ({symbol: row}, unfiltered) to the cache file"""
         try:
-            # Convert DataFrame to serializable format
+            # Convert rows to serializable format
             cache_data = {
-                'data': df.to_dict('records'),
+                'data': list(rows.values()),
                 'last_full_update': datetime.now().isoformat(),
-                'total_symbols': len(df),
+                'total_symbols': len(rows),
                 'universe_info': {k: len(v) for k, v in self.universe.items()}
             }
             
-            with open(self.cache_file, 'w') as f:
+            # Write to a temporary file first so a concurrent scan never reads a half-written cache
+            temp_file = f"{self.cache_file}.tmp"
+            with open(temp_file, 'w') as f:
                 json.dump(cache_data, f, indent=2, default=str)
-            print(f"Cache saved with {len(df)} symbols")
+            os.replace(temp_file, self.cache_file)
+            print(f"Cache saved with {len(rows)} symbols")
         except Exception as e:
             print(f"Error saving cache: {e}")
     
-    def _needs_update(self):
-        """Check if cache needs updating based on time threshold"""
-        if not os.path.exists(self.cache_file):
+    def _needs_update(self, symbol, row, force_refresh=False, store_index=None):
+        """Check if a symbol's cached row must be recalculated: it is missing, older than
+        update_threshold_hours, or newer daily bars than the ones it was calculated from are known
+        (in memory or in the bar store index; the check itself never downloads)"""
+        if force_refresh or not row:
             return True
-            
         try:
-            with open(self.cache_file, 'r') as f:
-                cache_data = json.load(f)
-            
-            last_updated_str = cache_data.get('last_full_update', '2000-01-01')
-            last_updated = datetime.fromisoformat(last_updated_str.replace('Z', '+00:00'))
-            hours_since_update = (datetime.now() - last_updated).total_seconds() / 3600
-            
-            return hours_since_update > self.update_threshold_hours
+            last_updated = pd.Timestamp(row['last_updated'])
+            hours_since_update = (pd.Timestamp.now() - last_updated).total_seconds() / 3600
+            if hours_since_update > self.update_threshold_hours:
+                return True
+            last_updated = last_updated.tz_localize(datetime.now().astimezone().tzinfo)
+            # Bars in memory (also past their short TTL) show whether the latest bar's date, close or volume changed
+            cached = _get_stale_cached_data(symbol, '6mo', '1d')
+            if cached is not None and not cached[0].empty:
+                latest = cached[0].iloc[-1]
+                return (row.get('last_bar') != self._last_bar(cached[0]) or
+                        row.get('price') != round(float(latest['Close']), 2) or
+                        row.get('volume') != int(latest['Volume']))
+            # Otherwise the bar store index shows whether bars were stored after the row was calculated
+            entry = (store_index if store_index is not None else _load_index()).get(_index_key(symbol, '1d'))
+            if entry and entry.get('last_refresh'):
+                return (row.get('last_bar') != entry.get('last_bar') or
+                        pd.Timestamp(entry['last_refresh']) > last_updated)
+            # Without stored bars the market calendar tells whether the bar can have changed since
+            return bars_may_have_changed(symbol, last_updated)
         except Exception as e:
-            print(f"Error checking cache age: {e}")
+            print(f"Error checking cache age for {symbol}: {e}")
             return True
     
-    def _calculate_indicators_for_symbol(self, symbol, period='6mo', force_refresh=False):
-        """Calculate all technical indicators for a single symbol."""
+    def _last_bar(self, daily_data):
+        """Date of the latest daily bar as stored in a scanner row"""
+        return pd.Timestamp(daily_data['Date'].iloc[-1]).isoformat()
+    
+    def _build_scan_context(self, symbol, bars=None):
+        """
+        Fetch daily and weekly bars for a symbol once and calculate indicators and
+        Impulse colours once, so every scanner stage (impulse, divergences and both
+        Apgar sides) reads from the same frames.
+
+        Args:
+            symbol: Stock symbol
+            bars: Optional {'daily': result, 'weekly': result} with get_stock_data-shaped
+                results that were already downloaded in a batch
+
+        Returns:
+            Dictionary with 'daily' and 'weekly' DataFrames, or None if daily data is insufficient
+        """
+        # Use get_stock_data for daily data to ensure consistency with Analysis/IRL Trading tabs
+        bars = bars or {}
+        daily_result = bars.get('daily') or get_stock_data(symbol, period='6mo', frequency='1d')
+        daily_data = daily_result[0]
+        if not isinstance(daily_data, pd.DataFrame) or daily_data.empty or len(daily_data) < 20:
+            return None
+        daily_data = evaluate_indicators(calculate_indicators(daily_data), SCAN_DAILY_INDICATORS, macd=MACD_DEFAULTS)
+        # Use 3 years of weekly data for proper indicator warmup and consistency
         try:
-            # Use get_stock_data for daily data to ensure consistency with Analysis/IRL Trading tabs
-            daily_data_tuple = get_stock_data(symbol, period='6mo', frequency='1d')
-            if isinstance(daily_data_tuple, tuple):
-                daily_data = daily_data_tuple[0]
+            weekly_result = bars.get('weekly') or get_stock_data(symbol, period='3y', frequency='1wk')
+            weekly_data = weekly_result[0]
+            if isinstance(weekly_data, pd.DataFrame) and not weekly_data.empty:
+                weekly_data = evaluate_indicators(calculate_indicators(weekly_data), SCAN_WEEKLY_INDICATORS, macd=MACD_DEFAULTS)
             else:
-                daily_data = daily_data_tuple
-            if not isinstance(daily_data, pd.DataFrame) or daily_data.empty or len(daily_data) < 20:
+                weekly_data = pd.DataFrame()
+        except Exception:
+            weekly_data = pd.DataFrame()
+        return {'symbol': symbol, 'daily': daily_data, 'weekly': weekly_data}
+
+    def _calculate_indicators_for_symbol(self, symbol, period='6mo', force_refresh=False, bars=None):
+        """Calculate all technical indicators for a single symbol."""
+        try:
+            context = self._build_scan_context(symbol, bars)
+            if context is None:
                 return None
-            # Calculate indicators using the same pipeline
-            daily_data = calculate_indicators(daily_data)
-            # Use the last row for all calculations
-            latest = daily_data.iloc[-1]
+            daily_data = context['daily']
+            weekly_data = context['weekly']
+            # Use the last row for all calculations (as native Python numbers, the frames may be float32)
+            latest = daily_data.iloc[-1].to_dict()
             # EMAs
             ema_13 = latest.get('EMA_13', np.nan)
             ema_26 = latest.get('EMA_26', np.nan)
@@ -187,7 +262,7 @@ class StockScanner:
                 price_change_pct = 0.0
             # Average volume (20-day)
             if len(daily_data) >= 20:
-                avg_volume_20_value = daily_data['Volume'].rolling(window=20).mean().iloc[-1]
+                avg_volume_20_value = daily_data['Volume_SMA_20'].iloc[-1]
                 if pd.isna(avg_volume_20_value):
                     avg_volume_20_value = float(latest_volume)
             else:
@@ -202,92 +277,10 @@ class StockScanner:
             rsi_extreme = self._detect_rsi_extremes(daily_data['RSI'])
             # MACD signal
             macd_signal = self._get_macd_signal(latest_macd, latest_signal)
-            # Calculate impulse system color for weekly and daily timeframes using the same logic as the chart
-            from functions.impulse_functions import calculate_impulse_system
-            # --- Weekly impulse color ---
-            try:
-                # Use 3 years of weekly data for proper indicator warmup and consistency
-                weekly_data_tuple = get_stock_data(symbol, period='3y', frequency='1wk')
-                if isinstance(weekly_data_tuple, tuple):
-                    weekly_data = weekly_data_tuple[0]
-                else:
-                    weekly_data = weekly_data_tuple
-                if not isinstance(weekly_data, pd.DataFrame) or weekly_data.empty:
-                    impulse_weekly = 'unknown'
-                else:
-                    weekly_data = calculate_indicators(weekly_data)
-                    impulse_weekly_df = calculate_impulse_system(weekly_data, ema_period=13)
-                    if len(impulse_weekly_df) >= 1:
-                        impulse_weekly = impulse_weekly_df['impulse_color'].iloc[-1]
-                    else:
-                        impulse_weekly = 'unknown'
-            except Exception:
-                impulse_weekly = 'unknown'
-            # --- Daily impulse color ---
-            try:
-                impulse_daily_df = calculate_impulse_system(daily_data, ema_period=13)
-                if len(impulse_daily_df) >= 1:
-                    impulse_daily = impulse_daily_df['impulse_color'].iloc[-1]
-                else:
-                    impulse_daily = 'unknown'
-            except Exception:
-                impulse_daily = 'unknown'
-            # --- Weekly MACD/RSI divergence detection ---
-            try:
-                weekly_div_data_tuple = get_stock_data(symbol, period='3y', frequency='1wk')
-                if isinstance(weekly_div_data_tuple, tuple):
-                    weekly_div_data = weekly_div_data_tuple[0]
-                else:
-                    weekly_div_data = weekly_div_data_tuple
-                if not isinstance(weekly_div_data, pd.DataFrame) or weekly_div_data.empty:
-                    weekly_macd_divergence = 'none'
-                    weekly_rsi_divergence = 'none'
-                else:
-                    weekly_div_data = calculate_indicators(weekly_div_data)
-                    weekly_close = weekly_div_data['Close']
-                    weekly_rsi = weekly_div_data['RSI'] if 'RSI' in weekly_div_data else None
-                    weekly_macd_hist = weekly_div_data['MACD_hist'] if 'MACD_hist' in weekly_div_data else None
-                    divergences = self._detect_divergences(weekly_close, weekly_rsi, weekly_macd_hist)
-                    weekly_macd_divergence = divergences['macd_divergence']
-                    weekly_rsi_divergence = divergences['rsi_divergence']
-            except Exception as e:
-                weekly_macd_divergence = 'none'
-                weekly_rsi_divergence = 'none'
-            # Calculate Trade Apgar score for both buy and sell scenarios
-            apgar_buy_result = calculate_trade_apgar(symbol, 'buy')
-            apgar_sell_result = calculate_trade_apgar(symbol, 'sell')
-            apgar_buy_score = apgar_buy_result.get('total_score', 0) if apgar_buy_result else 0
-            apgar_sell_score = apgar_sell_result.get('total_score', 0) if apgar_sell_result else 0
-            apgar_buy_has_zeros = False
-            apgar_sell_has_zeros = False
-            if apgar_buy_result and 'details' in apgar_buy_result:
-                details = apgar_buy_result['details']
-                apgar_buy_has_zeros = any([
-                    details.get('weekly_impulse', {}).get('score', 0) == 0,
-                    details.get('daily_impulse', {}).get('score', 0) == 0,
-                    details.get('daily_price', {}).get('score', 0) == 0,
-                    details.get('false_breakout', {}).get('score', 0) == 0,
-                    details.get('perfection', {}).get('score', 0) == 0
-                ])
-            if apgar_sell_result and 'details' in apgar_sell_result:
-                details = apgar_sell_result['details']
-                apgar_sell_has_zeros = any([
-                    details.get('weekly_impulse', {}).get('score', 0) == 0,
-                    details.get('daily_impulse', {}).get('score', 0) == 0,
-                    details.get('daily_price', {}).get('score', 0) == 0,
-                    details.get('false_breakout', {}).get('score', 0) == 0,
-                    details.get('perfection', {}).get('score', 0) == 0
-                ])
-            # Map impulse colors to display labels
-            def map_impulse_label(color):
-                if color == 'green':
-                    return 'Buy'
-                elif color == 'red':
-                    return 'Sell'
-                elif color == 'blue':
-                    return 'Neutral'
-                else:
-                    return 'Unknown'
+            # Impulse colours were calculated once in the scan context (same logic as the chart)
+            impulse_weekly = int(weekly_data['impulse'].iloc[-1]) if len(weekly_data) >= 1 else None
+            impulse_daily = int(daily_data['impulse'].iloc[-1]) if len(daily_data) >= 1 else None
+            signals = self._scan_signals(symbol, daily_data, weekly_data)
             # Build scanner result
             scanner_data = {
                 'symbol': symbol,
@@ -301,16 +294,17 @@ class StockScanner:
                 'rsi': round(latest_rsi, 2) if not pd.isna(latest_rsi) else None,
                 'rsi_extreme': rsi_extreme,
                 'macd_signal': macd_signal,
-                'macd_divergence': weekly_macd_divergence,
-                'rsi_divergence': weekly_rsi_divergence,
+                'macd_divergence': signals['macd_divergence'],
+                'rsi_divergence': signals['rsi_divergence'],
                 'atr_pct': round((latest_atr / latest_close) * 100, 2) if not pd.isna(latest_atr) and not pd.isna(latest_close) and latest_close != 0 else None,
                 'price_change_pct': round(price_change_pct, 2),
-                'trade_apgar': apgar_buy_score, # Store buy score
-                'trade_apgar_has_zeros': apgar_buy_has_zeros,
-                'trade_apgar_sell': apgar_sell_score, # Store sell score
-                'trade_apgar_sell_has_zeros': apgar_sell_has_zeros,
-                'impulse_weekly': map_impulse_label(impulse_weekly),
-                'impulse_daily': map_impulse_label(impulse_daily),
+                'trade_apgar': signals['trade_apgar'], # Store buy score
+                'trade_apgar_has_zeros': signals['trade_apgar_has_zeros'],
+                'trade_apgar_sell': signals['trade_apgar_sell'], # Store sell score
+                'trade_apgar_sell_has_zeros': signals['trade_apgar_sell_has_zeros'],
+                'impulse_weekly': self._impulse_label(impulse_weekly),
+                'impulse_daily': self._impulse_label(impulse_daily),
+                'last_bar': self._last_bar(daily_data),
                 'last_updated': datetime.now().isoformat()
             }
             return scanner_data
@@ -318,6 +312,149 @@ class StockScanner:
             print(f"Error processing {symbol}: {e}")
             return None
     
+    def _scan_batch(self, symbols, daily_bars, weekly_bars):
+        """
+        Calculate the scanner rows of many symbols at once: indicators for the whole
+        universe come from one symbols x bars matrix pass, and the per-row fields
+        are built as columns. Only divergences and Trade Apgar run per symbol.
+
+        Returns:
+            {symbol: result or None} for the symbols handled; the others (missing,
+            short or irregular bars) are left to _calculate_indicators_for_symbol
+        """
+        daily = align_bars({s: daily_bars[s][0] for s in symbols if daily_bars.get(s)})
+        weekly_frames = {s: weekly_bars[s][0] for s in daily['symbols'] if weekly_bars.get(s)}
+        weekly = align_bars({s: f for s, f in weekly_frames.items() if not f.empty})
+        symbols = [s for s in daily['symbols'] if s not in weekly['skipped']]
+        if not symbols:
+            return {}
+
+        daily_indicators = batch_indicators(daily)
+        weekly_indicators = batch_indicators(weekly)
+        daily_frames = batch_frames(daily, daily_indicators)
+        weekly_frames = batch_frames(weekly, weekly_indicators)
+        fields = self._batch_scan_fields(daily, daily_indicators)
+        weekly_impulse = dict(zip(weekly['symbols'], weekly_indicators['impulse'][:, -1].tolist())) if weekly['symbols'] else {}
+
+        results = {}
+        for symbol in symbols:
+            try:
+                row = fields[symbol]
+                signals = self._scan_signals(symbol, daily_frames[symbol], weekly_frames.get(symbol, pd.DataFrame()))
+                impulse_weekly = weekly_impulse.get(symbol)
+                results[symbol] = {
+                    'symbol': symbol,
+                    'price': row['price'],
+                    'volume': row['volume'],
+                    'volume_vs_avg': row['volume_vs_avg'],
+                    'in_value_zone': row['in_value_zone'],
+                    'above_ema_13': row['above_ema_13'],
+                    'above_ema_26': row['above_ema_26'],
+                    'ema_trend': row['ema_trend'],
+                    'rsi': row['rsi'],
+                    'rsi_extreme': row['rsi_extreme'],
+                    'macd_signal': row['macd_signal'],
+                    'macd_divergence': signals['macd_divergence'],
+                    'rsi_divergence': signals['rsi_divergence'],
+                    'atr_pct': row['atr_pct'],
+                    'price_change_pct': row['price_change_pct'],
+                    'trade_apgar': signals['trade_apgar'], # Store buy score
+                    'trade_apgar_has_zeros': signals['trade_apgar_has_zeros'],
+                    'trade_apgar_sell': signals['trade_apgar_sell'], # Store sell score
+                    'trade_apgar_sell_has_zeros': signals['trade_apgar_sell_has_zeros'],
+                    'impulse_weekly': self._impulse_label(impulse_weekly),
+                    'impulse_daily': row['impulse_daily'],
+                    'last_bar': self._last_bar(daily['frames'][symbol]),
+                    'last_updated': datetime.now().isoformat()
+                }
+            except Exception as e:
+                print(f"Error processing {symbol}: {e}")
+                results[symbol] = None
+        return results
+
+    def _batch_scan_fields(self, daily, indicators):
+        """Latest-bar scanner fields of every aligned symbol, calculated as columns"""
+        close = daily['Close'][:, -1]
+        prev_close = daily['Close'][:, -2]
+        volume = daily['Volume'][:, -1]
+        avg_volume = daily['Volume'][:, -20:].mean(axis=1)
+        ema_13 = indicators['EMA_13'][:, -1]
+        ema_26 = indicators['EMA_26'][:, -1]
+        rsi = indicators['RSI'][:, -1]
+        atr = indicators['ATR'][:, -1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            columns = {
+                'price': [round(v, 2) for v in close.tolist()],
+                'volume': volume.astype(np.int64).tolist(),
+                'volume_vs_avg': [round(v, 2) for v in np.where(avg_volume > 0, volume / avg_volume, 1.0).tolist()],
+                'in_value_zone': ((np.minimum(ema_13, ema_26) <= close) & (close <= np.maximum(ema_13, ema_26))).tolist(),
+                'above_ema_13': (close > ema_13).tolist(),
+                'above_ema_26': (close > ema_26).tolist(),
+                'ema_trend': np.where(ema_13 > ema_26, 'bullish', 'bearish').tolist(),
+                'rsi': [round(v, 2) for v in rsi.tolist()],
+                'rsi_extreme': np.where(rsi >= 70, 'overbought', np.where(rsi <= 30, 'oversold', 'neutral')).tolist(),
+                'macd_signal': np.where(indicators['MACD'][:, -1] > indicators['MACD_signal'][:, -1], 'bullish', 'bearish').tolist(),
+                'atr_pct': [round(v, 2) if c != 0 else None for v, c in zip((atr / close * 100).tolist(), close.tolist())],
+                'price_change_pct': [round(v, 2) for v in np.where(prev_close != 0, (close - prev_close) / prev_close * 100, 0.0).tolist()],
+                'impulse_daily': [self._impulse_label(code) for code in indicators['impulse'][:, -1].tolist()]
+            }
+        return {symbol: {col: values[i] for col, values in columns.items()} for i, symbol in enumerate(daily['symbols'])}
+
+    def _impulse_label(self, code):
+        """Map an Impulse code (1 green, -1 red, 0 blue, None if unknown) to its scanner display label"""
+        return IMPULSE_LABELS.get(code, 'Unknown')
+
+    def _scan_signals(self, symbol, daily_data, weekly_data):
+        """Weekly divergences and both Trade Apgar scores of a symbol from its scan context frames"""
+        # --- Weekly MACD/RSI divergence detection ---
+        try:
+            if weekly_data.empty:
+                weekly_macd_divergence = 'none'
+                weekly_rsi_divergence = 'none'
+            else:
+                weekly_close = weekly_data['Close']
+                weekly_rsi = weekly_data['RSI'] if 'RSI' in weekly_data else None
+                weekly_macd_hist = weekly_data['MACD_hist'] if 'MACD_hist' in weekly_data else None
+                divergences = self._detect_divergences(weekly_close, weekly_rsi, weekly_macd_hist)
+                weekly_macd_divergence = divergences['macd_divergence']
+                weekly_rsi_divergence = divergences['rsi_divergence']
+        except Exception as e:
+            weekly_macd_divergence = 'none'
+            weekly_rsi_divergence = 'none'
+        # Calculate Trade Apgar score for both buy and sell scenarios from the shared frames
+        apgar_buy_result = calculate_trade_apgar(symbol, 'buy', weekly_data=weekly_data, daily_data=daily_data)
+        apgar_sell_result = calculate_trade_apgar(symbol, 'sell', weekly_data=weekly_data, daily_data=daily_data)
+        apgar_buy_score = apgar_buy_result.get('total_score', 0) if apgar_buy_result else 0
+        apgar_sell_score = apgar_sell_result.get('total_score', 0) if apgar_sell_result else 0
+        apgar_buy_has_zeros = False
+        apgar_sell_has_zeros = False
+        if apgar_buy_result and 'details' in apgar_buy_result:
+            details = apgar_buy_result['details']
+            apgar_buy_has_zeros = any([
+                details.get('weekly_impulse', {}).get('score', 0) == 0,
+                details.get('daily_impulse', {}).get('score', 0) == 0,
+                details.get('daily_price', {}).get('score', 0) == 0,
+                details.get('false_breakout', {}).get('score', 0) == 0,
+                details.get('perfection', {}).get('score', 0) == 0
+            ])
+        if apgar_sell_result and 'details' in apgar_sell_result:
+            details = apgar_sell_result['details']
+            apgar_sell_has_zeros = any([
+                details.get('weekly_impulse', {}).get('score', 0) == 0,
+                details.get('daily_impulse', {}).get('score', 0) == 0,
+                details.get('daily_price', {}).get('score', 0) == 0,
+                details.get('false_breakout', {}).get('score', 0) == 0,
+                details.get('perfection', {}).get('score', 0) == 0
+            ])
+        return {
+            'macd_divergence': weekly_macd_divergence,
+            'rsi_divergence': weekly_rsi_divergence,
+            'trade_apgar': apgar_buy_score,
+            'trade_apgar_has_zeros': apgar_buy_has_zeros,
+            'trade_apgar_sell': apgar_sell_score,
+            'trade_apgar_sell_has_zeros': apgar_sell_has_zeros
+        }
+
     def _check_value_zone(self, price, ema_13, ema_26):
         """Check if price is in Value Zone between EMAs"""
         if pd.isna(ema_13) or pd.isna(ema_26) or pd.isna(price):
@@ -602,8 +739,7 @@ class StockScanner:
     def _get_spanish_market_info(self, symbol):
         """Get additional market information for Spanish stocks"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = get_provider().info(symbol)
             
             # Extract relevant Spanish market information
             market_info = {
@@ -656,17 +792,60 @@ class StockScanner:
             symbols_to_scan = random_symbols
             print(f"Random sample mode: scanning {len(symbols_to_scan)} random symbols")
         
+        # The scanner cache holds one row per symbol; rows that are still current are reused
+        # and only the other symbols are downloaded and recalculated
+        rows = self._load_cache()
+        store_index = _load_index()
+        stale_symbols = [symbol for symbol in symbols_to_scan
+                         if self._needs_update(symbol, rows.get(symbol), force_refresh, store_index)]
+        
         # Multi-threaded scanning for performance
         results = []
-        completed = 0
-        spanish_results = 0
         total = len(symbols_to_scan)
+        completed = total - len(stale_symbols)
+        spanish_results = 0
+        if completed:
+            print(f"Using cached rows for {completed}/{total} symbols")
+            if progress_callback is not None:
+                try:
+                    progress_callback(completed, total)
+                except Exception:
+                    pass
+        
+        # Download the stale symbols up front with batched multi-ticker requests,
+        # so the worker threads only calculate indicators
+        daily_bars = get_stock_data_many(stale_symbols, period='6mo', frequency='1d')
+        weekly_bars = get_stock_data_many(stale_symbols, period='3y', frequency='1wk')
+        
+        # Indicators for all stale symbols in one vectorized pass; symbols the batch
+        # cannot take (missing, short or irregular bars) go through the per-symbol workers
+        batch_results = self._scan_batch(stale_symbols, daily_bars, weekly_bars) if self.batch_mode and stale_symbols else {}
+        for symbol, result in batch_results.items():
+            completed += 1
+            if result:
+                results.append(result)
+                if symbol.endswith('.MC'):
+                    spanish_results += 1
+            if progress_callback is not None:
+                try:
+                    progress_callback(completed, total)
+                except Exception:
+                    pass
+        if batch_results:
+            print(f"Batch-calculated {len(batch_results)}/{total} symbols")
+        remaining_symbols = [symbol for symbol in stale_symbols if symbol not in batch_results]
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        # Provider requests made by the workers are throttled by the shared request governor,
+        # so the pool is sized to its maximum and the adaptive limit decides how many fetch at once
+        max_workers = self.max_workers or get_request_limits()['max_concurrency']
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all jobs
             future_to_symbol = {
-                executor.submit(self._calculate_indicators_for_symbol, symbol, '6mo', force_refresh): symbol 
-                for symbol in symbols_to_scan
+                executor.submit(
+                    self._calculate_indicators_for_symbol, symbol, '6mo', force_refresh,
+                    {'daily': daily_bars.get(symbol), 'weekly': weekly_bars.get(symbol)}
+                ): symbol 
+                for symbol in remaining_symbols
             }
             
             # Collect results as they complete
@@ -697,6 +876,12 @@ class StockScanner:
                     print(f"Error with {symbol}: {e}")
                     continue
         
+        # Replace the recalculated rows in the cache (symbols that failed are retried on the next scan)
+        # and save the whole unfiltered table, so later scans can filter it without recalculating
+        if stale_symbols:
+            rows = self._merge_cache(stale_symbols, results)
+        
+        results = [rows[symbol] for symbol in symbols_to_scan if symbol in rows]
         if not results:
             print("No valid results found")
             return pd.DataFrame()
@@ -715,9 +900,6 @@ class StockScanner:
         if max_results and len(df) > max_results:
             df = df.head(max_results)
         
-        # Save to cache
-        self._save_cache(df)
-        
         print(f"Scan complete: {len(df)} results after filtering")
         if spanish_stocks_present:
             spanish_final = len(df[df['symbol'].str.endswith('.MC')])
@@ -0,0 +1,264 @@
+"""
+Streaming Indicators for the Stock Market Dashboard
+
+Live charts refresh every few seconds while only the last bar changes. Instead of
+recalculating the whole extended history on every tick, an IndicatorStream keeps
+the running state of every indicator (EMAs, MACD, Force Index EMA, A/D and OBV
+sums, Wilder TR/DM/ADX, ATR and RSI smoothing, stochastic windows) after the last
+completed bar and advances it in constant time per new bar.
+
+The last bar of a live series is still forming, so it is only previewed: its
+indicator values are calculated from the committed state without changing it,
+and the next tick previews the revised bar again. The state is seeded from the
+NumPy engine, so streamed rows match calculate_indicators on the same bars.
+(One exception: a stochastic window without range, which the batch backfills from
+the following bar, carries the previous value forward here.)
+"""
+
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .indicator_engine_functions import (
+    calculate_indicators_numpy, supports_numpy_engine, INDICATOR_FILL_COLUMNS,
+    _ewm, _shift, _rolling, _directional_smoothing
+)
+
+
+class IndicatorStream:
+    """Indicator state of one bar series (symbol, timeframe and parameter set)"""
+
+    def __init__(self, ema_periods=[13, 26], macd_fast=12, macd_slow=26, macd_signal=9, force_smoothing=2, adx_period=13, stoch_period=5, rsi_period=13, fast_mode=False):
+        """Same parameters as calculate_indicators"""
+        if fast_mode and len(ema_periods) > 2:
+            ema_periods = ema_periods[:2]
+        self.ema_periods = list(ema_periods)
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_signal = macd_signal
+        self.force_smoothing = force_smoothing
+        self.adx_period = max(1, min(adx_period, 50))
+        self.stoch_period = max(1, min(stoch_period, 50))
+        self.rsi_period = max(1, min(rsi_period, 50))
+        self.fast_mode = fast_mode
+        self.state = None  # Running values after the last committed bar
+        self.frame = None  # Indicator rows of the committed bars
+        self.seeds = 0
+        self.commits = 0
+        self.previews = 0
+        self._lock = threading.Lock()
+
+    @property
+    def min_bars(self):
+        """Committed bars needed before every indicator is past its warmup"""
+        return 1 + max(
+            10, max(self.ema_periods, default=10),
+            max(self.macd_fast, self.macd_slow) + self.macd_signal,
+            14 + max(self.force_smoothing, 1),
+            2 * self.adx_period + 1,
+            max(14, self.stoch_period) + 2,
+            max(14, self.rsi_period)
+        )
+
+    def update(self, bars):
+        """
+        Get the indicator frame for a bar series whose last bar may still be forming.
+
+        Bars that completed since the last call are committed; the last bar is
+        previewed. The state is re-seeded whenever the committed bars no longer
+        match (symbol switch, revised history, trimmed sessions).
+
+        Returns:
+            DataFrame like calculate_indicators(bars), or None if the series is
+            too short or not supported (callers then use calculate_indicators)
+        """
+        with self._lock:
+            n = len(bars)
+            if not self._in_sync(bars):
+                if n - 1 < self.min_bars or not supports_numpy_engine(bars, self.adx_period):
+                    self.reset()
+                    return None
+                self.seed(bars.iloc[:n - 1])
+
+            start = self.state['count']
+            if start < n - 1:
+                rows = [self.commit(bars.iloc[i]) for i in range(start, n - 1)]
+                self.frame = pd.concat([self.frame, self._rows_frame(bars.iloc[start:n - 1], rows)], ignore_index=True)
+            last = self._rows_frame(bars.iloc[n - 1:], [self.preview(bars.iloc[n - 1])])
+            return pd.concat([self.frame, last], ignore_index=True)
+
+    def seed(self, bars):
+        """Calculate the committed bars in one batch and take the running state from it"""
+        out = calculate_indicators_numpy(bars, self.ema_periods, self.macd_fast, self.macd_slow, self.macd_signal,
+                                         self.force_smoothing, self.adx_period, self.stoch_period, self.rsi_period,
+                                         self.fast_mode)
+        close = bars['Close'].to_numpy(dtype=np.float64)
+        high = bars['High'].to_numpy(dtype=np.float64)
+        low = bars['Low'].to_numpy(dtype=np.float64)
+        volume = bars['Volume'].to_numpy(dtype=np.float64)
+        last = out.iloc[-1]
+
+        force = _ewm((close - _shift(close)) * volume, 2.0 / 14, 13, start=1)
+        trs, dip, din = _directional_smoothing(high, low, close, self.adx_period)
+        diff = close - _shift(close)
+        k = self.stoch_period
+        tail_low, tail_high, tail_close = low[-(k + 1):], high[-(k + 1):], close[-(k + 1):]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lowest = _rolling(tail_low, k, np.min)[-2:]
+            stoch_k = 100 * (tail_close[-2:] - lowest) / (_rolling(tail_high, k, np.max)[-2:] - lowest)
+
+        self.state = {
+            'count': len(bars),
+            'date': bars['Date'].iloc[-1],
+            'close': close[-1],
+            'high': high[-1],
+            'low': low[-1],
+            'ema': {period: float(last[f'EMA_{period}']) for period in self.ema_periods},
+            'macd_fast': _ewm(close, 2.0 / (self.macd_fast + 1), self.macd_fast)[-1],
+            'macd_slow': _ewm(close, 2.0 / (self.macd_slow + 1), self.macd_slow)[-1],
+            'macd_signal': float(last['MACD_signal']),
+            'force_ema': force[-1],
+            'force_window': tuple(force[len(force) - self.force_smoothing + 1:]) if self.force_smoothing > 1 else (),
+            'ad': float(last['AD']),
+            'obv': float(last['OBV']),
+            'trs': trs[-2],
+            'dip': dip[-2],
+            'din': din[-2],
+            'adx': float(last['ADX']),
+            'atr': float(last['ATR']),
+            'rsi_up': _ewm(np.where(diff > 0, diff, 0.0), 1.0 / self.rsi_period, self.rsi_period)[-1],
+            'rsi_down': _ewm(np.where(diff < 0, -diff, 0.0), 1.0 / self.rsi_period, self.rsi_period)[-1],
+            'lows': tuple(low[len(low) - k + 1:]) if k > 1 else (),
+            'highs': tuple(high[len(high) - k + 1:]) if k > 1 else (),
+            'stoch_k': tuple(stoch_k),
+            'last': {col: float(last[col]) for col in self._fill_columns()}
+        }
+        self.frame = out
+        self.seeds += 1
+
+    def commit(self, bar):
+        """Advance the state by a completed bar and return its indicator row"""
+        self.state, row = self._step(self.state, bar)
+        self.commits += 1
+        return row
+
+    def preview(self, bar):
+        """Indicator row of a forming bar (the committed state is not changed)"""
+        self.previews += 1
+        return self._step(self.state, bar)[1]
+
+    def reset(self):
+        """Drop the state (the next update re-seeds)"""
+        self.state = None
+        self.frame = None
+
+    def stats(self):
+        """Get seed/commit/preview counters"""
+        return {
+            'bars': self.state['count'] if self.state else 0,
+            'seeds': self.seeds,
+            'commits': self.commits,
+            'previews': self.previews
+        }
+
+    def _fill_columns(self):
+        return [f'EMA_{period}' for period in self.ema_periods] + INDICATOR_FILL_COLUMNS
+
+    def _in_sync(self, bars):
+        """Check that the committed bars are still the leading bars of the series"""
+        state = self.state
+        if state is None or len(bars) <= state['count']:
+            return False
+        i = state['count'] - 1
+        return bars['Date'].iloc[i] == state['date'] and float(bars['Close'].iloc[i]) == state['close']
+
+    def _rows_frame(self, bars, rows):
+        """Frame of new rows in the column layout of the committed frame"""
+        data = {col: (bars[col].to_numpy() if col in bars.columns else [row[col] for row in rows])
+                for col in self.frame.columns}
+        return pd.DataFrame(data, columns=self.frame.columns)
+
+    def _step(self, state, bar):
+        """Indicator values of one bar from the state of the previous bar: (new_state, row)"""
+        close, high, low = float(bar['Close']), float(bar['High']), float(bar['Low'])
+        volume = float(bar['Volume'])
+        prev_close, prev_high, prev_low = state['close'], state['high'], state['low']
+        new = dict(state, count=state['count'] + 1, date=bar['Date'], close=close, high=high, low=low)
+        row = {}
+
+        # EMAs and MACD
+        new['ema'] = {period: value + 2.0 / (period + 1) * (close - value) for period, value in state['ema'].items()}
+        for period, value in new['ema'].items():
+            row[f'EMA_{period}'] = value
+        new['macd_fast'] = state['macd_fast'] + 2.0 / (self.macd_fast + 1) * (close - state['macd_fast'])
+        new['macd_slow'] = state['macd_slow'] + 2.0 / (self.macd_slow + 1) * (close - state['macd_slow'])
+        macd = new['macd_fast'] - new['macd_slow']
+        new['macd_signal'] = state['macd_signal'] + 2.0 / (self.macd_signal + 1) * (macd - state['macd_signal'])
+        row['MACD'], row['MACD_signal'], row['MACD_hist'] = macd, new['macd_signal'], macd - new['macd_signal']
+
+        # Force Index (13-period EMA, then the smoothing window)
+        new['force_ema'] = state['force_ema'] + 2.0 / 14 * ((close - prev_close) * volume - state['force_ema'])
+        if self.force_smoothing > 1:
+            window = state['force_window'] + (new['force_ema'],)
+            row['Force_Index'] = sum(window) / len(window)
+            new['force_window'] = window[1:]
+        else:
+            row['Force_Index'] = new['force_ema']
+
+        # A/D Line
+        with np.errstate(divide='ignore', invalid='ignore'):
+            clv = np.float64((close - low) - (high - close)) / np.float64(high - low)
+        new['ad'] = state['ad'] + (0.0 if math.isnan(clv) else float(clv)) * volume
+        row['AD'] = row['AD_Line'] = new['ad']
+
+        # ADX, DI+ and DI- (Wilder smoothing of true range and directional movement)
+        w = self.adx_period
+        up, down = high - prev_high, prev_low - low
+        pos = up if up > down and up > 0 else 0.0
+        neg = down if down > up and down > 0 else 0.0
+        true_range = max(high, prev_close) - min(low, prev_close)
+        new['trs'] = state['trs'] * (1 - 1.0 / w) + true_range
+        new['dip'] = state['dip'] * (1 - 1.0 / w) + pos
+        new['din'] = state['din'] * (1 - 1.0 / w) + neg
+        di_plus = 100 * new['dip'] / new['trs'] if new['trs'] != 0 else 0.0
+        di_minus = 100 * new['din'] / new['trs'] if new['trs'] != 0 else 0.0
+        di_sum = di_plus + di_minus
+        dx = 100 * abs((di_plus - di_minus) / di_sum) if di_sum != 0 else 0.0
+        new['adx'] = (state['adx'] * (w - 1) + dx) / w
+        row['ADX'], row['DI_plus'], row['DI_minus'] = new['adx'], di_plus, di_minus
+
+        # ATR
+        atr_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        new['atr'] = (state['atr'] * 13 + atr_range) / 14
+        row['ATR'] = new['atr']
+
+        # Slow Stochastic
+        lows, highs = state['lows'] + (low,), state['highs'] + (high,)
+        lowest, highest = min(lows), max(highs)
+        stoch_k = 100 * (close - lowest) / (highest - lowest) if highest != lowest else float('nan')
+        k_window = state['stoch_k'] + (stoch_k,)
+        new['lows'], new['highs'] = lows[1:], highs[1:]
+        new['stoch_k'] = k_window[1:]
+        row['Stoch_K'], row['Stoch_D'] = stoch_k, sum(k_window) / 3
+
+        # RSI (Wilder smoothing)
+        diff = close - prev_close
+        alpha = 1.0 / self.rsi_period
+        new['rsi_up'] = state['rsi_up'] + alpha * (max(diff, 0.0) - state['rsi_up'])
+        new['rsi_down'] = state['rsi_down'] + alpha * (max(-diff, 0.0) - state['rsi_down'])
+        row['RSI'] = 100.0 if new['rsi_down'] == 0 else 100 - 100 / (1 + new['rsi_up'] / new['rsi_down'])
+
+        # On Balance Volume
+        new['obv'] = state['obv'] + (-volume if close < prev_close else volume)
+        row['OBV'] = new['obv']
+
+        # Same NaN handling as calculate_indicators: carry the previous value forward
+        row['unreliable_indicators'] = math.isnan(row['Stoch_K']) or math.isnan(row['Stoch_D'])
+        new['last'] = dict(state['last'])
+        for col in new['last']:
+            if math.isnan(row[col]):
+                row[col] = state['last'][col]
+            new['last'][col] = row[col]
+        return new, row